@@ -29,6 +29,8 @@ INSTALLED_APPS = [
 # ⭐ Middleware
 # ===============================
 MIDDLEWARE = [
+    # Opt-in query/latency recording (WORKLOAD_INSTRUMENTATION below); first so it times everything
+    'workload.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -78,6 +80,48 @@ DATABASES = {
 }
 
 
+# ===============================
+# ⭐ Cache (dashboard data, versioned per table)
+#    locmem is per process; with several workers use the file based
+#    backend so every worker sees the same versions:
+#    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+#    'LOCATION': BASE_DIR / '.cache',
+# ===============================
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'workload',
+    }
+}
+
+WORKLOAD_CACHE_ALIAS = 'default'
+WORKLOAD_CACHE_TIMEOUT = 3600
+
+# Rendered timetable PDFs (content addressed, LRU evicted past the cap)
+WORKLOAD_PDF_CACHE_DIR = BASE_DIR / 'pdf_cache'
+WORKLOAD_PDF_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Live dashboard events (/events/). Only turn this on when serving over
+# ASGI: under WSGI (runserver) every open dashboard would hold a worker
+# thread. The in-process broker only reaches clients of the same worker;
+# point this at another broker class with the same interface when running
+# several workers.
+WORKLOAD_LIVE_UPDATES = False
+WORKLOAD_EVENT_BROKER = 'workload.events.InProcessBroker'
+
+# Serve the dashboard and PDF download with their async variants (only
+# worthwhile under an ASGI server); PDFs then render in a process pool.
+WORKLOAD_ASYNC_VIEWS = False
+WORKLOAD_PDF_RENDER_WORKERS = None  # default: min(4, CPU count)
+
+# Per-request query count / SQL time / duplicate query / view time records,
+# kept in a ring buffer of the last N requests and shown to staff at
+# /admin/instrumentation/. Server-Timing adds the figures to each response.
+WORKLOAD_INSTRUMENTATION = False
+WORKLOAD_INSTRUMENTATION_BUFFER = 1000
+WORKLOAD_SERVER_TIMING = False
+
+
 # ===============================
 # ⭐ Password validation
 # ===============================
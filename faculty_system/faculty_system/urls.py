@@ -1,14 +1,16 @@
 from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.urls import path, include
-from workload import views as workload_views
+from workload import urls as workload_urls
+from workload.admin import instrumentation_view
 
 urlpatterns = [
     path('admin/logout/', auth_views.LogoutView.as_view(next_page='/login/'), name='admin_logout'),
+    path('admin/instrumentation/', admin.site.admin_view(instrumentation_view), name='admin_instrumentation'),
     path('admin/', admin.site.urls),
 
     # Root path: enforce authentication via `home` wrapper
-    path('', workload_views.home, name='root'),
+    path('', workload_urls.home_view, name='root'),
 
     # App routes (login, signup, logout, etc.)
     path('', include('workload.urls')),
@@ -1,7 +1,25 @@
-from django.contrib import admin
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404, render
 from django.urls import path, reverse
-from .models import Faculty, Subject, Lecture
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Upper
+from django.utils.functional import cached_property
+from .models import Faculty, Subject, Lecture, Room, TimeSlot, TimetableSnapshot, DAY_CHOICES, DIVISION_CHOICES, STATUS_OVERLOADED
+from .allocation import allocate, apply_allocation
+from .batch_export import collect_pages, write_zip
+from .exports import calendar_token, rotate_calendar_key
+from .bulk_ops import BulkOperationError, copy_lectures, move, swap
+from .importer import COLUMNS, KINDS, import_file
+from .instrumentation import get_buffer, summarize
+from .snapshots import diff, publish, rollback
+from .substitution import recommend
+from django.http import HttpResponse, HttpResponseRedirect
 from django import forms
 
 
@@ -10,8 +28,84 @@ admin.site.site_title = "Timetable Coordinator Panel"
 admin.site.index_title = "Timetable Coordinator Dashboard"
 
 
+# ===============================
+# Estimated changelist counts
+#    An unfiltered changelist of a big table would run COUNT(*) over every
+#    row on each page view. When the database keeps table statistics
+#    (PostgreSQL reltuples, MySQL table_rows) and they put the table above
+#    ESTIMATE_THRESHOLD rows, that figure is shown instead. Smaller tables,
+#    filtered lists and databases without statistics (SQLite) are counted
+#    exactly.
+# ===============================
+ESTIMATE_THRESHOLD = 10000
+
+
+ESTIMATE_SQL = {
+    'postgresql': 'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+    'mysql': 'SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s',
+}
+
+
+def estimated_count(queryset):
+    """The table size from the database statistics, or None when there are none."""
+    connection = connections[queryset.db]
+    sql = ESTIMATE_SQL.get(connection.vendor)
+    if sql is None:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    if row and row[0] and row[0] > 0:
+        return int(row[0])
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if getattr(queryset, 'query', None) is None or queryset.query.where:
+            return super().count
+        estimate = estimated_count(queryset)
+        if estimate is None or estimate < ESTIMATE_THRESHOLD:
+            return super().count
+        return estimate
+
+
+# ===============================
+# Prefix search
+#    `^field` search fields become istartswith, a LIKE that no plain index
+#    can serve (a full scan on SQLite, UPPER(col) LIKE on PostgreSQL). The
+#    searched names carry UPPER() expression indexes instead (see the
+#    models) and are matched with a range on that expression, which both
+#    databases answer with an index range scan; the startswith keeps the
+#    match exact under any collation.
+# ===============================
+def prefix_search(queryset, fields, term):
+    """Rows of `queryset` where any of `fields` starts with `term`, ignoring case."""
+    low = term.upper()
+    aliases = {f'{field}_upper': Upper(field) for field in fields}
+    condition = Q()
+    for alias in aliases:
+        condition |= Q(**{f'{alias}__gte': low, f'{alias}__lt': low + '\U0010ffff', f'{alias}__startswith': low})
+    return queryset.alias(**aliases).filter(condition)
+
+
+class PrefixSearchMixin:
+    """Admin search (and autocomplete) as an indexed prefix search over `search_fields`."""
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        return prefix_search(queryset, self.search_fields, term), False
+
+
 # ===============================
 # Custom Admin for Lecture Form
+#    Faculty, subject, time slot and room use autocomplete widgets (see
+#    LectureAdmin.autocomplete_fields) instead of loading every row into
+#    a <select>.
 # ===============================
 class LectureAdminForm(forms.ModelForm):
     class Meta:
@@ -19,22 +113,255 @@ class LectureAdminForm(forms.ModelForm):
         fields = '__all__'
         widgets = {
             'day': forms.Select,
-            'time_slot': forms.Select,
         }
 
 
+class ImportForm(forms.Form):
+    kind = forms.ChoiceField(choices=[(kind, kind.title()) for kind in KINDS])
+    file = forms.FileField(help_text='.csv or .xlsx with a header row')
+    strict = forms.BooleanField(required=False, help_text='Write nothing if any row is invalid')
+
+
+class MoveForm(forms.Form):
+    day = forms.ChoiceField(choices=[('', 'Keep the day')] + DAY_CHOICES, required=False)
+    time_slot = forms.ModelChoiceField(TimeSlot.objects.all(), required=False, empty_label='Keep the time slot')
+
+    def clean(self):
+        cleaned = super().clean()
+        if not cleaned.get('day') and not cleaned.get('time_slot'):
+            raise forms.ValidationError('Choose a new day, a new time slot or both.')
+        return cleaned
+
+
+class CopyForm(forms.Form):
+    division = forms.ChoiceField(choices=DIVISION_CHOICES, label='Copy to division')
+    replace = forms.BooleanField(required=False, help_text='Delete what the division already has on the copied days')
+
+    def __init__(self, *args, sources=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sources = list(sources)
+        for faculty in self.sources:
+            self.fields[f'faculty_{faculty.pk}'] = forms.ModelChoiceField(
+                Faculty.objects.exclude(pk=faculty.pk),
+                label=f"Copies of {faculty.name}'s lectures taught by",
+                widget=AutocompleteSelect(Lecture._meta.get_field('faculty'), admin.site),
+            )
+
+    def faculty_map(self):
+        return {faculty.pk: self.cleaned_data[f'faculty_{faculty.pk}'] for faculty in self.sources}
+
+
 class LectureAdmin(admin.ModelAdmin):
     form = LectureAdminForm
-    list_display = ('faculty', 'subject', 'division', 'day', 'time_slot')
-    list_filter = ('day', 'time_slot', 'division')
+    list_display = ('faculty', 'subject', 'division', 'day', 'time_slot', 'room')
+    list_filter = ('day', 'time_slot', 'division', 'room__room_type')
+    list_select_related = ('faculty', 'subject', 'time_slot', 'room')
+    autocomplete_fields = ('faculty', 'subject', 'time_slot', 'room')
     search_fields = ('faculty__name', 'subject__subject_name')
     ordering = ('day', 'time_slot__sort_order')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = 'admin/workload/lecture/change_list.html'
+    actions = ['swap_lectures', 'move_lectures', 'copy_lectures']
 
+    # ===============================
+    # ⭐ Bulk timetable changes (see workload.bulk_ops)
+    #    Each action validates the whole selection first and then writes it
+    #    in one transaction, so a swap never trips the unique constraints.
+    # ===============================
+    def _apply_bulk(self, request, operation, *args, **kwargs):
+        try:
+            changed = operation(*args, **kwargs)
+        except BulkOperationError as exc:
+            shown = '; '.join(exc.errors[:10])
+            more = f" (and {len(exc.errors) - 10} more)" if len(exc.errors) > 10 else ''
+            self.message_user(request, f"Nothing was changed: {shown}{more}", messages.ERROR)
+            return False
+        self.message_user(request, f"{changed} lecture(s) changed.", messages.SUCCESS)
+        return True
+
+    def _bulk_form(self, request, queryset, form, action, title):
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': title,
+            'form': form,
+            'lectures': queryset.select_related('faculty', 'subject', 'time_slot'),
+            'action': action,
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+            'back_url': reverse('admin:workload_lecture_changelist'),
+        }
+        return render(request, 'admin/workload/lecture/bulk_action.html', context)
 
-class FacultyAdmin(admin.ModelAdmin):
-    list_display = ('name', 'department', 'max_hours')
+    @admin.action(description='Swap the time of the two selected lectures', permissions=['change'])
+    def swap_lectures(self, request, queryset):
+        lectures = list(queryset.select_related('faculty', 'subject', 'time_slot')[:3])
+        if len(lectures) != 2:
+            self.message_user(request, 'Select exactly two lectures to swap.', messages.ERROR)
+            return None
+        self._apply_bulk(request, swap, *lectures)
+        return None
+
+    @admin.action(description='Move selected lectures to another day or time slot', permissions=['change'])
+    def move_lectures(self, request, queryset):
+        form = MoveForm(request.POST if 'apply' in request.POST else None)
+        if form.is_valid():
+            lectures = queryset.select_related('faculty', 'subject', 'time_slot')
+            if self._apply_bulk(request, move, lectures, form.cleaned_data['day'], form.cleaned_data['time_slot']):
+                return None
+        return self._bulk_form(request, queryset, form, 'move_lectures', 'Move lectures')
+
+    @admin.action(description='Copy selected lectures to another division', permissions=['add'])
+    def copy_lectures(self, request, queryset):
+        sources = Faculty.objects.filter(pk__in=queryset.values('faculty_id')).order_by('name')
+        form = CopyForm(request.POST if 'apply' in request.POST else None, sources=sources)
+        if form.is_valid():
+            data = form.cleaned_data
+            if self._apply_bulk(request, copy_lectures, queryset, data['division'], form.faculty_map(), data['replace']):
+                return None
+        return self._bulk_form(request, queryset, form, 'copy_lectures', 'Copy lectures to another division')
+
+    def get_search_results(self, request, queryset, search_term):
+        """Prefix search on faculty and subject names.
+
+        The names are matched on their own (indexed, small) tables first and
+        lectures are then filtered by the foreign keys, so the search never
+        scans a join over every lecture.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        faculties = prefix_search(Faculty.objects.all(), ['name'], term).values('pk')
+        subjects = prefix_search(Subject.objects.all(), ['subject_name'], term).values('pk')
+        return queryset.filter(Q(faculty__in=faculties) | Q(subject__in=subjects)), False
+
+    def get_urls(self):
+        urls = super().get_urls()
+        opts = self.model._meta
+        custom_urls = [
+            path(
+                'import/',
+                self.admin_site.admin_view(self.import_view),
+                name=f'{opts.app_label}_{opts.model_name}_import',
+            ),
+        ]
+        return custom_urls + urls
+
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        report = None
+        form = ImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                report = import_file(form.cleaned_data['kind'], upload.file, upload.name, strict=form.cleaned_data['strict'])
+            except ImportError as exc:
+                form.add_error('file', str(exc))
+            else:
+                if report.ok:
+                    self.message_user(request, report.summary(), messages.SUCCESS)
+                elif form.cleaned_data['strict']:
+                    self.message_user(request, f"{report.summary()}. Nothing was written.", messages.ERROR)
+                else:
+                    self.message_user(request, report.summary(), messages.WARNING)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import timetable data',
+            'form': form,
+            'columns': COLUMNS,
+            'report': report,
+            'back_url': reverse('admin:workload_lecture_changelist'),
+        }
+        return render(request, 'admin/workload/lecture/import.html', context)
+
+
+class AbsenceForm(forms.Form):
+    start = forms.DateField(widget=forms.DateInput(attrs={'type': 'date'}))
+    end = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}), help_text='Leave blank for a single day')
+
+
+class OverloadFilter(admin.SimpleListFilter):
+    title = 'workload'
+    parameter_name = 'load'
+
+    def lookups(self, request, model_admin):
+        return [('overloaded', 'Overloaded'), ('normal', 'Within max hours')]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'overloaded':
+            return queryset.overloaded()
+        if self.value() == 'normal':
+            return queryset.with_workload().exclude(status=STATUS_OVERLOADED)
+        return queryset
+
+
+class FacultyAdmin(PrefixSearchMixin, admin.ModelAdmin):
+    list_display = ('name', 'department', 'max_hours', 'assigned_hours', 'load')
+    list_filter = (OverloadFilter, 'department')
     search_fields = ('name', 'department')
+    ordering = ('name',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     change_form_template = 'admin/workload/faculty/change_form.html'
+    actions = ['allocate_lectures', 'export_timetables']
+
+    @admin.action(description='Auto-allocate lectures for all divisions using selected faculties', permissions=['add'])
+    def allocate_lectures(self, request, queryset):
+        if not request.user.has_perm('workload.add_lecture'):
+            raise PermissionDenied
+        # a dry run first: nothing is written until the plan is confirmed
+        result = allocate(faculties=queryset.order_by('pk'))
+        if 'apply' not in request.POST:
+            context = {
+                **self.admin_site.each_context(request),
+                'opts': self.model._meta,
+                'title': 'Auto-allocate lectures',
+                'result': result,
+                'lectures': sorted(result.lectures, key=lambda lecture: (lecture.division, lecture.day, lecture.time_slot.sort_order)),
+                'faculties': queryset.order_by('name'),
+                'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+                'back_url': reverse('admin:workload_faculty_changelist'),
+            }
+            return render(request, 'admin/workload/faculty/allocate.html', context)
+
+        apply_allocation(result)
+        if result.complete:
+            self.message_user(request, f"Allocation complete: {result.summary()}.", messages.SUCCESS)
+        else:
+            unplaced = ', '.join(f"{s.subject} ({s.division})" for s in result.unplaced[:10])
+            self.message_user(
+                request,
+                f"Allocation partly done: {result.summary()}. Not placed: {unplaced}",
+                messages.WARNING,
+            )
+        return None
+
+    @admin.action(description='Download timetables of selected faculties and all divisions (ZIP)')
+    def export_timetables(self, request, queryset):
+        pages = collect_pages(faculties=queryset.order_by('name'))
+        response = HttpResponse(content_type='application/zip')
+        response['Content-Disposition'] = 'attachment; filename="timetables.zip"'
+        # rendered in this request's thread: the process-pool fan-out is for the export_timetables command
+        write_zip(pages, response, workers=1)
+        return response
+
+    def get_queryset(self, request):
+        # hours, load % and status come from the FacultyWorkload join, not per-row queries
+        return super().get_queryset(request).with_workload()
+
+    @admin.display(description='Assigned hours', ordering='total_hours')
+    def assigned_hours(self, obj):
+        return obj.total_hours
+
+    @admin.display(description='Load', ordering='load_pct')
+    def load(self, obj):
+        if obj.status == STATUS_OVERLOADED:
+            return f"{obj.load_pct}% (overloaded)"
+        return f"{obj.load_pct}%"
 
     def get_urls(self):
         urls = super().get_urls()
@@ -45,12 +372,39 @@ class FacultyAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.assigned_lectures_view),
                 name=f'{opts.app_label}_{opts.model_name}_assigned_lectures',
             ),
+            path(
+                '<path:object_id>/substitutes/',
+                self.admin_site.admin_view(self.substitutes_view),
+                name=f'{opts.app_label}_{opts.model_name}_substitutes',
+            ),
+            path(
+                '<path:object_id>/rotate-calendar/',
+                self.admin_site.admin_view(self.rotate_calendar_view),
+                name=f'{opts.app_label}_{opts.model_name}_rotate_calendar',
+            ),
         ]
         return custom_urls + urls
 
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        faculty = self.get_object(request, object_id)
+        if faculty is not None:
+            extra_context = {
+                **(extra_context or {}),
+                'calendar_url': request.build_absolute_uri(reverse('faculty_calendar_feed', args=[calendar_token(faculty)])),
+            }
+        return super().change_view(request, object_id, form_url, extra_context)
+
+    def rotate_calendar_view(self, request, object_id):
+        faculty = get_object_or_404(Faculty, pk=object_id)
+        if request.method != 'POST' or not self.has_change_permission(request, faculty):
+            raise PermissionDenied
+        rotate_calendar_key(faculty)
+        self.message_user(request, f"New calendar URL for {faculty.name}; the old one no longer works.", messages.SUCCESS)
+        return HttpResponseRedirect(reverse('admin:workload_faculty_change', args=[faculty.pk]))
+
     def assigned_lectures_view(self, request, object_id):
         faculty = get_object_or_404(Faculty, pk=object_id)
-        lectures = Lecture.objects.filter(faculty=faculty).select_related('subject').order_by('day', 'time_slot', 'division')
+        lectures = Lecture.objects.filter(faculty=faculty).select_related('subject', 'time_slot').order_by('day', 'time_slot', 'division')
 
         lecture_rows = []
         for lecture in lectures:
@@ -70,9 +424,181 @@ class FacultyAdmin(admin.ModelAdmin):
         }
         return render(request, 'admin/workload/faculty/assigned_lectures.html', context)
 
+    def substitutes_view(self, request, object_id):
+        faculty = get_object_or_404(Faculty, pk=object_id)
+        form = AbsenceForm(request.GET or None)
+        substitutions = None
+        if form.is_valid():
+            try:
+                substitutions = recommend(faculty, form.cleaned_data['start'], form.cleaned_data['end'] or form.cleaned_data['start'])
+            except ValueError as exc:
+                form.add_error(None, str(exc))
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'faculty': faculty,
+            'title': f'Substitutes - {faculty.name}',
+            'form': form,
+            'substitutions': substitutions,
+            'back_url': reverse('admin:workload_faculty_change', args=[faculty.pk]),
+        }
+        return render(request, 'admin/workload/faculty/substitutes.html', context)
+
+
+class SubjectAdmin(PrefixSearchMixin, admin.ModelAdmin):
+    list_display = ('subject_name', 'semester', 'credit_hours')
+    list_filter = ('semester',)
+    search_fields = ('subject_name',)
+    ordering = ('subject_name', 'semester')
+
+
+class TimeSlotAdmin(admin.ModelAdmin):
+    list_display = ('display_name', 'slot_key', 'duration_hours', 'sort_order')
+    search_fields = ('display_name', 'slot_key')
+    ordering = ('sort_order',)
+
+
+class RoomAdmin(PrefixSearchMixin, admin.ModelAdmin):
+    list_display = ('name', 'room_type', 'capacity')
+    list_filter = ('room_type',)
+    search_fields = ('name',)
+    ordering = ('name',)
+
+
+# ===============================
+# ⭐ Timetable snapshots (see workload.snapshots)
+#    Read-only history; new snapshots come from the Publish button (or the
+#    publish_timetable command), never from a hand-filled form.
+# ===============================
+class TimetableSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'division', 'label', 'lecture_count', 'short_hash', 'created_at', 'created_by')
+    list_filter = ('division',)
+    list_select_related = ('created_by',)
+    exclude = ('data',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = 'admin/workload/timetablesnapshot/change_list.html'
+    change_form_template = 'admin/workload/timetablesnapshot/change_form.html'
+    actions = ['rollback_snapshot']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_publish_permission(self, request):
+        return request.user.has_perm('workload.add_timetablesnapshot')
+
+    def has_rollback_permission(self, request):
+        return request.user.has_perm('workload.change_lecture') and request.user.has_perm('workload.add_lecture')
+
+    @admin.display(description='Hash')
+    def short_hash(self, obj):
+        return obj.content_hash[:12]
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {**(extra_context or {}), 'has_publish_permission': self.has_publish_permission(request)}
+        return super().changelist_view(request, extra_context)
+
+    def get_urls(self):
+        urls = super().get_urls()
+        opts = self.model._meta
+        custom_urls = [
+            path(
+                'publish/',
+                self.admin_site.admin_view(self.publish_view),
+                name=f'{opts.app_label}_{opts.model_name}_publish',
+            ),
+            path(
+                '<path:object_id>/changes/',
+                self.admin_site.admin_view(self.changes_view),
+                name=f'{opts.app_label}_{opts.model_name}_changes',
+            ),
+        ]
+        return custom_urls + urls
+
+    def publish_view(self, request):
+        if request.method != 'POST' or not self.has_publish_permission(request):
+            raise PermissionDenied
+        result = publish(label=request.POST.get('label', '').strip(), user=request.user)
+        created = [division for division, (_, is_new) in sorted(result.items()) if is_new]
+        if created:
+            self.message_user(request, f"Published divisions {', '.join(created)}.", messages.SUCCESS)
+        else:
+            self.message_user(request, 'No timetable changed since the last snapshots.', messages.INFO)
+        return HttpResponseRedirect(reverse('admin:workload_timetablesnapshot_changelist'))
+
+    def changes_view(self, request, object_id):
+        snapshot = get_object_or_404(TimetableSnapshot, pk=object_id)
+        against = None
+        if request.GET.get('against'):
+            against = get_object_or_404(TimetableSnapshot, pk=request.GET['against'], division=snapshot.division)
+        changes = diff(snapshot, against)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': f'Changes since {snapshot}',
+            'snapshot': snapshot,
+            'against': against,
+            'counts': changes.counts(),
+            'rows': changes.rows() if changes else [],
+            'back_url': reverse('admin:workload_timetablesnapshot_change', args=[snapshot.pk]),
+        }
+        return render(request, 'admin/workload/timetablesnapshot/changes.html', context)
+
+    @admin.action(description='Roll the division back to the selected snapshot', permissions=['rollback'])
+    def rollback_snapshot(self, request, queryset):
+        snapshots = list(queryset[:2])
+        if len(snapshots) != 1:
+            self.message_user(request, 'Select exactly one snapshot to roll back to.', messages.ERROR)
+            return None
+        try:
+            changed = rollback(snapshots[0])
+        except BulkOperationError as exc:
+            self.message_user(request, f"Nothing was changed: {'; '.join(exc.errors[:10])}", messages.ERROR)
+            return None
+        if not changed:
+            self.message_user(request, f"Division {snapshots[0].division} already matches the snapshot.", messages.INFO)
+        else:
+            self.message_user(
+                request, f"Division {snapshots[0].division} restored ({changed} lecture(s) written or deleted).", messages.SUCCESS,
+            )
+        return None
+
 
 admin.site.register(Faculty, FacultyAdmin)
-admin.site.register(Subject)
+admin.site.register(Subject, SubjectAdmin)
+admin.site.register(TimeSlot, TimeSlotAdmin)
+admin.site.register(Room, RoomAdmin)
+admin.site.register(TimetableSnapshot, TimetableSnapshotAdmin)
+
+
+admin.site.register(Lecture, LectureAdmin)
 
 
-admin.site.register(Lecture, LectureAdmin)
\ No newline at end of file
+# ===============================
+# ⭐ Request instrumentation report (staff only)
+#    Wired into the admin site in faculty_system/urls.py; figures come from
+#    InstrumentationMiddleware's ring buffer in this process.
+# ===============================
+def instrumentation_view(request):
+    buffer = get_buffer()
+    if request.method == 'POST' and 'clear' in request.POST:
+        buffer.clear()
+        messages.success(request, 'Instrumentation buffer cleared.')
+        return HttpResponseRedirect(request.path)
+
+    records = buffer.snapshot()
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Request instrumentation',
+        'enabled': getattr(settings, 'WORKLOAD_INSTRUMENTATION', False),
+        'rows': summarize(records),
+        'recent': sorted(records, key=lambda record: record.duplicates, reverse=True)[:20],
+        'record_count': len(records),
+        'capacity': buffer.records.maxlen,
+    }
+    return render(request, 'admin/workload/instrumentation.html', context)
@@ -0,0 +1,282 @@
+import sys
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from .models import Faculty, Subject, Lecture, DIVISION_CHOICES
+from .occupancy import OccupancyIndex
+from .signals import lectures_changed_in_bulk
+from .timetable import DAYS, get_timeslots
+
+
+# ===============================
+# ⭐ Automatic lecture allocation
+#
+#    Every (division, subject) pair needs `Subject.credit_hours` hours a week.
+#    Those hours are split into sessions (1-hour lectures, plus one 2-hour
+#    practical when `use_practicals` is on) and each session is given a
+#    faculty, a day and a time slot such that:
+#      * no faculty or division is booked twice in overlapping slots,
+#      * no faculty goes over `Faculty.max_hours`,
+#      * one faculty teaches all sessions of a subject in a division.
+#    Lectures that already exist are kept and only the missing hours are
+#    placed. A greedy pass runs first; when it leaves sessions over, a
+#    depth-first backtracking search with a node budget takes over, finishing
+#    greedily once the budget runs out. Practicals that still do not fit are
+#    retried as 1-hour lectures, and whatever is left is reported.
+# ===============================
+DEFAULT_MAX_NODES = 20000
+
+
+class Session:
+    def __init__(self, division, subject, duration):
+        self.division = division
+        self.subject = subject
+        self.duration = duration
+
+    def __repr__(self):
+        return f"Session({self.division}, {self.subject}, {self.duration}h)"
+
+
+class AllocationResult:
+    def __init__(self, lectures, unplaced, nodes):
+        self.lectures = lectures
+        self.unplaced = unplaced
+        self.nodes = nodes
+
+    @property
+    def complete(self):
+        return not self.unplaced
+
+    def summary(self):
+        return f"{len(self.lectures)} lecture(s) placed, {len(self.unplaced)} session(s) left unplaced"
+
+
+class Allocator:
+
+    def __init__(self, divisions=None, subjects=None, faculties=None, use_practicals=False,
+                 max_nodes=DEFAULT_MAX_NODES):
+        self.divisions = list(divisions or [code for code, _ in DIVISION_CHOICES])
+        self.subjects = list(subjects if subjects is not None else Subject.objects.order_by('pk'))
+        self.faculties = list(faculties if faculties is not None else Faculty.objects.order_by('pk'))
+        self.use_practicals = use_practicals
+        self.max_nodes = max_nodes
+
+        self.days = list(DAYS)
+        self.timeslots = get_timeslots()
+        self.slot_by_id = {slot.id: slot for slot in self.timeslots}
+        self.faculty_by_id = {faculty.id: faculty for faculty in self.faculties}
+
+        self._load_existing()
+
+    # ===============================
+    # ⭐ State
+    # ===============================
+    def _load_existing(self):
+        self.occupancy = OccupancyIndex(self.timeslots, self.days)
+        self.faculty_hours = Counter()
+        self.scheduled_hours = Counter()
+        self.day_load = Counter()
+        self.subject_days = Counter()
+        self.subject_faculty = {}
+
+        owners = defaultdict(Counter)
+        existing = Lecture.objects.values_list('id', 'faculty_id', 'subject_id', 'division', 'day', 'time_slot_id')
+        for lecture_id, faculty_id, subject_id, division, day, slot_id in existing:
+            duration = self.slot_by_id[slot_id].duration_hours if slot_id in self.slot_by_id else 1
+            self.occupancy.add(lecture_id, faculty_id, division, day, slot_id)
+            self.faculty_hours[faculty_id] += duration
+            self.scheduled_hours[(division, subject_id)] += duration
+            self.day_load[(division, day)] += duration
+            self.subject_days[(division, subject_id, day)] += 1
+            owners[(division, subject_id)][faculty_id] += 1
+
+        for key, counts in owners.items():
+            self.subject_faculty[key] = counts.most_common(1)[0][0]
+
+    def _is_free(self, faculty_id, division, day, slot_id):
+        return (
+            self.occupancy.is_free('division', division, day, slot_id)
+            and self.occupancy.is_free('faculty', faculty_id, day, slot_id)
+        )
+
+    # ===============================
+    # ⭐ Sessions to place
+    # ===============================
+    def _sessions(self):
+        durations = {slot.duration_hours for slot in self.timeslots}
+        practical = max(durations) if self.use_practicals and max(durations) > 1 else None
+
+        sessions = []
+        for division in self.divisions:
+            for subject in self.subjects:
+                remaining = subject.credit_hours - self.scheduled_hours[(division, subject.id)]
+                if remaining <= 0:
+                    continue
+                if practical and remaining >= practical:
+                    sessions.append(Session(division, subject, practical))
+                    remaining -= practical
+                sessions.extend(Session(division, subject, 1) for _ in range(remaining))
+
+        # longest sessions and biggest subjects first: they have the fewest options
+        sessions.sort(key=lambda s: (-s.duration, -s.subject.credit_hours, s.division, s.subject.id))
+        return sessions
+
+    def _candidate_faculties(self, session):
+        owner = self.subject_faculty.get((session.division, session.subject.id))
+        if owner is not None:
+            return [self.faculty_by_id[owner]] if owner in self.faculty_by_id else []
+
+        def headroom(faculty):
+            return faculty.max_hours - self.faculty_hours[faculty.id]
+
+        return sorted(
+            (f for f in self.faculties if headroom(f) >= session.duration),
+            key=lambda f: (-headroom(f), f.id),
+        )
+
+    def _candidates(self, session):
+        division = session.division
+        subject_id = session.subject.id
+        slots = [slot for slot in self.timeslots if slot.duration_hours == session.duration]
+
+        # spread a subject across the week, then fill the emptiest days first
+        days = sorted(
+            self.days,
+            key=lambda day: (self.subject_days[(division, subject_id, day)], self.day_load[(division, day)]),
+        )
+
+        for faculty in self._candidate_faculties(session):
+            if self.faculty_hours[faculty.id] + session.duration > faculty.max_hours:
+                continue
+            for day in days:
+                for slot in slots:
+                    if self._is_free(faculty.id, division, day, slot.id):
+                        yield faculty, day, slot
+
+    def _place(self, session, candidate, step):
+        faculty, day, slot = candidate
+        key = (session.division, session.subject.id)
+        # sessions are not saved yet, so they are indexed under their own identity
+        if step > 0:
+            self.occupancy.add(('session', id(session)), faculty.id, session.division, day, slot.id)
+        else:
+            self.occupancy.remove(('session', id(session)))
+        self.faculty_hours[faculty.id] += step * session.duration
+        self.day_load[(session.division, day)] += step * session.duration
+        self.subject_days[(session.division, session.subject.id, day)] += step
+        self.scheduled_hours[key] += step * session.duration
+
+    # ===============================
+    # ⭐ Search
+    # ===============================
+    def _search(self, index):
+        if index == len(self.sessions):
+            return True
+        self.nodes += 1
+
+        session = self.sessions[index]
+        key = (session.division, session.subject.id)
+        for candidate in self._candidates(session):
+            new_owner = key not in self.subject_faculty
+            if new_owner:
+                self.subject_faculty[key] = candidate[0].id
+            self._place(session, candidate, 1)
+            self.placements.append((session, candidate))
+
+            if self._search(index + 1):
+                return True
+
+            self.placements.pop()
+            self._place(session, candidate, -1)
+            if new_owner:
+                del self.subject_faculty[key]
+            if self.nodes > self.max_nodes:
+                break
+
+        if self.nodes > self.max_nodes:
+            # out of budget: leave this session out and finish greedily
+            self.unplaced.append(session)
+            return self._search(index + 1)
+        return False
+
+    def _solve(self, max_nodes):
+        self.subject_faculty = dict(self._initial_owners)
+        self.nodes = 0
+        self.max_nodes = max_nodes
+        self.placements = []
+        self.unplaced = []
+        if not self._search(0):
+            # the full problem has no solution: place as much as possible
+            self.max_nodes = -1
+            self._search(0)
+        placements, unplaced = self.placements, self.unplaced
+
+        # undo everything so the next pass starts from the stored lectures
+        for session, candidate in reversed(placements):
+            self._place(session, candidate, -1)
+        return placements, unplaced
+
+    def _repair(self, placements, unplaced):
+        """Replay `placements`, then retry unplaced practicals as 1-hour lectures."""
+        for session, candidate in placements:
+            self._place(session, candidate, 1)
+
+        self.sessions = []
+        left = []
+        for session in unplaced:
+            if session.duration > 1:
+                self.sessions.extend(Session(session.division, session.subject, 1) for _ in range(session.duration))
+            else:
+                left.append(session)
+
+        self.placements = list(placements)
+        self.unplaced = left
+        self.max_nodes = -1
+        self._search(0)
+        return self.placements, self.unplaced
+
+    def run(self):
+        self._initial_owners = dict(self.subject_faculty)
+        self.sessions = self._sessions()
+        budget = self.max_nodes
+
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, len(self.sessions) * 4 + 100))
+        try:
+            # a greedy pass settles most timetables; search only when it falls short
+            placements, unplaced = self._solve(-1)
+            nodes = self.nodes
+            if unplaced and budget > 0:
+                searched, searched_unplaced = self._solve(budget)
+                nodes += self.nodes
+                if sum(s.duration for s in searched_unplaced) < sum(s.duration for s in unplaced):
+                    placements, unplaced = searched, searched_unplaced
+
+            self.subject_faculty = dict(self._initial_owners)
+            for session, (faculty, _, _) in placements:
+                self.subject_faculty.setdefault((session.division, session.subject.id), faculty.id)
+            if unplaced:
+                placements, unplaced = self._repair(placements, unplaced)
+        finally:
+            sys.setrecursionlimit(limit)
+            self.max_nodes = budget
+
+        lectures = [
+            Lecture(faculty=faculty, subject=session.subject, division=session.division, day=day, time_slot=slot)
+            for session, (faculty, day, slot) in placements
+        ]
+        return AllocationResult(lectures, list(unplaced), nodes)
+
+
+def allocate(divisions=None, subjects=None, faculties=None, use_practicals=False, max_nodes=DEFAULT_MAX_NODES):
+    """Compute a clash-free allocation without writing anything."""
+    return Allocator(divisions, subjects, faculties, use_practicals, max_nodes).run()
+
+
+def apply_allocation(result):
+    """Write the lectures of an `AllocationResult` in one transaction."""
+    with transaction.atomic():
+        created = Lecture.objects.bulk_create(result.lectures, batch_size=500)
+        lectures_changed_in_bulk({lecture.faculty_id for lecture in created})
+    return created
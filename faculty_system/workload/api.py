@@ -0,0 +1,193 @@
+import hashlib
+from datetime import date
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_GET
+
+from . import cache
+from .models import Faculty, Lecture, DIVISION_CHOICES
+from .occupancy import get_index
+from .substitution import recommend
+
+
+# ===============================
+# ⭐ Read-only JSON API
+#
+#    Every response carries an ETag made from the cache versions of the
+#    tables it reads (bumped by the model signals) and the request URL, so a
+#    poll that comes back with If-None-Match is answered with a 304 before
+#    any query runs. Lists use keyset pagination on the primary key
+#    (`?after=<last id>&limit=`) and read rows with values(), never building
+#    model instances.
+# ===============================
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+DIVISIONS = [code for code, _ in DIVISION_CHOICES]
+
+LECTURE_FIELDS = {
+    'id': 'id',
+    'division': 'division',
+    'day': 'day',
+    'slot': 'time_slot__slot_key',
+    'time': 'time_slot__display_name',
+    'subject': 'subject__subject_name',
+    'semester': 'subject__semester',
+    'faculty_id': 'faculty_id',
+    'faculty': 'faculty__name',
+}
+
+
+def _error(message, status):
+    return JsonResponse({'error': message}, status=status)
+
+
+def api_view(*tables):
+    """Wrap a GET-only JSON view with authentication and table-version ETags."""
+    def decorator(view):
+        @require_GET
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated and not getattr(settings, 'WORKLOAD_API_PUBLIC', False):
+                return _error('Authentication required', 401)
+
+            versions = cache.table_versions(*tables)
+            stamp = ':'.join(f'{table}={versions[table]}' for table in tables)
+            etag = '"%s"' % hashlib.sha1(f'{request.get_full_path()}:{stamp}'.encode()).hexdigest()
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                return not_modified
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                response['ETag'] = etag
+                response['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+def _page_params(request):
+    try:
+        after = int(request.GET.get('after', 0))
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError('after and limit must be integers')
+    return after, max(1, min(limit, MAX_LIMIT))
+
+
+def _paginate(request, queryset, fields):
+    """Return `{'results': [...], 'next': url-or-None}` for a keyset page of `queryset`."""
+    after, limit = _page_params(request)
+    rows = list(queryset.filter(pk__gt=after).order_by('pk').values(*fields.values())[:limit + 1])
+
+    next_url = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        query = request.GET.copy()
+        query['after'] = rows[-1]['id']
+        query['limit'] = limit
+        next_url = f"{request.path}?{query.urlencode()}"
+
+    results = [{name: row[column] for name, column in fields.items()} for row in rows]
+    return {'results': results, 'next': next_url}
+
+
+def _lecture_page(request, lectures):
+    try:
+        return JsonResponse(_paginate(request, lectures, LECTURE_FIELDS))
+    except ValueError as exc:
+        return _error(str(exc), 400)
+
+
+# ===============================
+# ⭐ Endpoints
+# ===============================
+@api_view('lecture', 'faculty', 'subject', 'timeslot')
+def division_timetable(request, division):
+    if division not in DIVISIONS:
+        return _error('Unknown division', 404)
+    return _lecture_page(request, Lecture.objects.filter(division=division))
+
+
+@api_view('lecture', 'faculty', 'subject', 'timeslot')
+def faculty_timetable(request, faculty_id):
+    faculty = get_object_or_404(Faculty.objects.only('id'), pk=faculty_id)
+    return _lecture_page(request, Lecture.objects.filter(faculty=faculty))
+
+
+@api_view('lecture', 'faculty', 'timeslot')
+def free_slots(request):
+    """Cells free for `?division=` and/or `?faculty=` (both: free for both), optionally one `?day=`."""
+    division = request.GET.get('division')
+    faculty_id = request.GET.get('faculty')
+    day = request.GET.get('day') or None
+
+    if not division and not faculty_id:
+        return _error('Pass division and/or faculty', 400)
+    if division and division not in DIVISIONS:
+        return _error('Unknown division', 404)
+    if faculty_id and not faculty_id.isdigit():
+        return _error('faculty must be an id', 400)
+    if faculty_id and not Faculty.objects.filter(pk=faculty_id).exists():
+        return _error('Unknown faculty', 404)
+
+    index = get_index()
+    if day and day not in index.day_pos:
+        return _error('Unknown day', 404)
+
+    mask = 0
+    if division:
+        mask |= index.mask('division', division)
+    if faculty_id:
+        mask |= index.mask('faculty', int(faculty_id))
+    days = [day] if day else index.days
+    cells = [
+        {'day': d, 'slot': slot.slot_key, 'time': slot.display_name}
+        for d in days
+        for slot in index.timeslots
+        if not mask & index.cover(d, slot.id)
+    ]
+    return JsonResponse({'results': cells})
+
+
+@api_view('lecture', 'faculty', 'timeslot')
+def workload_summary(request):
+    """Per-faculty hours and load; `?status=overloaded` and `?department=` filter it."""
+    faculties = Faculty.objects.with_workload()
+    if request.GET.get('status') == 'overloaded':
+        faculties = faculties.overloaded()
+    if request.GET.get('department'):
+        faculties = faculties.filter(department=request.GET['department'])
+
+    fields = {name: name for name in ('id', 'name', 'department', 'max_hours', 'total_hours', 'load_pct', 'status')}
+    try:
+        return JsonResponse(_paginate(request, faculties, fields))
+    except ValueError as exc:
+        return _error(str(exc), 400)
+
+
+@api_view('lecture', 'faculty', 'subject', 'timeslot')
+def faculty_substitutes(request, faculty_id):
+    """Ranked replacements for each lecture of an absent faculty between `?start=` and `?end=` (ISO dates)."""
+    faculty = get_object_or_404(Faculty, pk=faculty_id)
+    try:
+        start = date.fromisoformat(request.GET['start'])
+        end = date.fromisoformat(request.GET.get('end') or request.GET['start'])
+        limit = max(1, min(int(request.GET.get('limit', 5)), 50))
+        substitutions = recommend(faculty, start, end, limit=limit)
+    except KeyError:
+        return _error('start is required (YYYY-MM-DD)', 400)
+    except ValueError as exc:
+        return _error(str(exc), 400)
+
+    return JsonResponse({
+        'faculty': {'id': faculty.pk, 'name': faculty.name},
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'results': [substitution.as_dict() for substitution in substitutions],
+    })
@@ -6,11 +6,15 @@ class WorkloadConfig(AppConfig):
     name = 'workload'
 
     def ready(self):
+        from . import signals  # noqa: F401
+
         # Clear all session records at startup so previously logged-in users
         # are forced to re-authenticate when the project runs.
         try:
             from django.contrib.sessions.models import Session
+            from .models import UserSession
             Session.objects.all().delete()
+            UserSession.objects.all().delete()
         except Exception:
             # Avoid raising errors during migrations/startup
             pass
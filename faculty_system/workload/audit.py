@@ -0,0 +1,110 @@
+import itertools
+import time
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from .clashes import overlapping_pairs
+from .models import Faculty, Lecture, TimeSlot
+from .slots import slot_interval
+
+
+# ===============================
+# ⭐ Whole-timetable audit
+#
+#    Streams every lecture once per resource, ordered by (faculty, day),
+#    (division, day) and (room, day) so the database can walk the unique
+#    indexes, and checks each (resource, day) group as it goes by:
+#      - double bookings: two lectures in the very same slot
+#      - overlaps: lectures in different but overlapping slots (2-4 vs 3-4)
+#      - faculties whose lectures add up to more than max_hours
+#      - FacultyWorkload rows that no longer match the lectures
+#    Memory holds one group plus an hours counter per faculty, and the
+#    query count does not depend on the number of rows.
+# ===============================
+CHUNK_SIZE = 5000
+RESOURCE_FIELDS = {
+    'faculty': 'faculty_id',
+    'division': 'division',
+    'room': 'room_id',
+}
+
+
+class TimetableAudit:
+
+    def __init__(self):
+        self.slots = {slot.id: slot for slot in TimeSlot.objects.all()}
+        self.intervals = {}
+        for slot in self.slots.values():
+            # a slot with no known time range only clashes with itself: its
+            # stand-in interval is negative, so it cannot overlap any other
+            start = -2 * (slot.id + 1)
+            self.intervals[slot.id] = slot_interval(slot) or (start, start + 1)
+        self.hours = defaultdict(int)
+        self.counts = Counter()
+        self.lectures = 0
+        self.started = time.perf_counter()
+
+    def issues(self):
+        """Yield one dict per problem found; `summary()` is complete once exhausted."""
+        for kind in RESOURCE_FIELDS:
+            yield from self._count(self.clashes(kind))
+        yield from self._count(self.workload())
+
+    def _count(self, issues):
+        for issue in issues:
+            self.counts[issue['type']] += 1
+            yield issue
+
+    def clashes(self, kind):
+        field = RESOURCE_FIELDS[kind]
+        lectures = Lecture.objects.all()
+        if kind == 'room':
+            lectures = lectures.filter(room__isnull=False)
+        rows = (
+            lectures.order_by(field, 'day')
+            .values_list(field, 'day', 'id', 'time_slot_id')
+            .iterator(chunk_size=CHUNK_SIZE)
+        )
+        for (key, day), group in itertools.groupby(rows, key=itemgetter(0, 1)):
+            bookings = []
+            slot_of = {}
+            for _, _, lecture_id, slot_id in group:
+                start, end = self.intervals[slot_id]
+                bookings.append((start, end, lecture_id))
+                slot_of[lecture_id] = slot_id
+                if kind == 'faculty':
+                    self.lectures += 1
+                    self.hours[key] += self.slots[slot_id].duration_hours
+            bookings.sort()
+            for first, second in overlapping_pairs(bookings):
+                same_slot = slot_of[first] == slot_of[second]
+                yield {
+                    'type': f"{kind}_{'double_booking' if same_slot else 'overlap'}",
+                    kind: key,
+                    'day': day,
+                    'lectures': [first, second],
+                    'slots': [self.slots[slot_of[first]].slot_key, self.slots[slot_of[second]].slot_key],
+                }
+
+    def workload(self):
+        """Compare the hours counted by the faculty sweep with max_hours and FacultyWorkload."""
+        rows = (
+            Faculty.objects.order_by('pk')
+            .values_list('id', 'name', 'max_hours', 'workload__total_hours')
+            .iterator(chunk_size=CHUNK_SIZE)
+        )
+        for faculty_id, name, max_hours, stored in rows:
+            hours = self.hours.get(faculty_id, 0)
+            if hours > max_hours:
+                yield {'type': 'overloaded', 'faculty': faculty_id, 'name': name, 'hours': hours, 'max_hours': max_hours}
+            if (stored or 0) != hours:
+                yield {'type': 'stale_workload', 'faculty': faculty_id, 'name': name, 'hours': hours, 'stored_hours': stored}
+
+    def summary(self):
+        return {
+            'type': 'summary',
+            'lectures': self.lectures,
+            'issues': sum(self.counts.values()),
+            'by_type': dict(sorted(self.counts.items())),
+            'seconds': round(time.perf_counter() - self.started, 3),
+        }
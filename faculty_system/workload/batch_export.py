@@ -0,0 +1,78 @@
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.text import slugify
+
+from .models import Lecture, DIVISION_CHOICES
+from .timetable import TimetableGrid, build_grids, get_timeslots
+
+
+# ===============================
+# ⭐ Batch timetable export
+#
+#    Loads every lecture needed with one query, builds one page spec per
+#    division and per faculty, then either renders them all into a single
+#    multi-page PDF or renders each page in a process pool into a ZIP.
+#    `workload.pdf` (ReportLab) is imported on first use only.
+# ===============================
+def collect_pages(divisions=None, faculties=()):
+    """Return `[(filename, spec), ...]` for the given divisions and faculties."""
+    from . import pdf
+
+    divisions = [code for code, _ in DIVISION_CHOICES] if divisions is None else list(divisions)
+    faculties = list(faculties)
+    timeslots = get_timeslots()
+
+    lectures = list(
+        Lecture.objects.filter(Q(division__in=divisions) | Q(faculty__in=faculties))
+        .select_related('faculty', 'subject', 'time_slot')
+        .order_by('pk')
+    )
+    by_division = build_grids(lectures, lambda lecture: lecture.division, timeslots)
+    by_faculty = build_grids(lectures, lambda lecture: lecture.faculty_id, timeslots)
+    empty = TimetableGrid([], timeslots)
+
+    pages = []
+    for division in divisions:
+        grid = by_division.get(division, empty)
+        pages.append((
+            f"division_{division}.pdf",
+            pdf.grid_spec(grid, f"Weekly Timetable — Division {division}"),
+        ))
+    for faculty in faculties:
+        grid = by_faculty.get(faculty.pk, empty)
+        pages.append((
+            f"faculty_{faculty.pk}_{slugify(faculty.name) or 'faculty'}.pdf",
+            pdf.grid_spec(grid, f"Weekly Timetable — {faculty.name}", cell_text=pdf.faculty_cell),
+        ))
+    return pages
+
+
+def write_pdf(pages, out):
+    """Render every page into one PDF document (styles are shared across pages)."""
+    from . import pdf
+
+    pdf.render([spec for _, spec in pages], out)
+
+
+def write_zip(pages, out, workers=None):
+    """Render one PDF per page, spread over `workers` processes, into a ZIP."""
+    from . import pdf
+
+    if workers is None:
+        workers = getattr(settings, 'WORKLOAD_EXPORT_WORKERS', None) or os.cpu_count() or 1
+    specs = [spec for _, spec in pages]
+
+    if workers > 1 and len(specs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(specs))) as executor:
+            chunksize = max(1, len(specs) // (workers * 4))
+            documents = list(executor.map(pdf.render_bytes, specs, chunksize=chunksize))
+    else:
+        documents = [pdf.render_bytes(spec) for spec in specs]
+
+    with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for (filename, _), document in zip(pages, documents):
+            archive.writestr(filename, document)
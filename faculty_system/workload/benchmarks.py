@@ -0,0 +1,105 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+from .instrumentation import percentile
+
+
+# ===============================
+# ⭐ Benchmark helpers
+#
+#    Shared by the benchmark_workload and load_test commands: timing with
+#    query counts and peak memory, percentiles, the JSON result file and the
+#    comparison against an earlier run.
+# ===============================
+def measure(fn, repeat=5, setup=None):
+    """Run `fn` once for queries and peak memory, then `repeat` times for wall time.
+
+    `setup` runs (untimed) before every call, for benchmarks that consume
+    their own fixtures.
+    """
+    if setup:
+        setup()
+    # requests clear the query log when they start; begin from an empty log
+    # so the captured slice is not cut off
+    reset_queries()
+    with CaptureQueriesContext(connection) as queries:
+        fn()
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        'queries': len(queries),
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def environment():
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+    }
+
+
+def write_results(path, payload):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
+
+
+def compare(previous, current, tolerance=0.2):
+    """Yield `(name, metric, before, after, regressed)` for every shared benchmark.
+
+    Wall time regresses when it grows by more than `tolerance` (a fraction);
+    query counts regress on any increase.
+    """
+    for name, after in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+        if 'queries' in before and 'queries' in after:
+            yield name, 'queries', before['queries'], after['queries'], after['queries'] > before['queries']
+        for metric in ('median_ms', 'p95_ms'):
+            if metric in before and metric in after:
+                regressed = after[metric] > before[metric] * (1 + tolerance)
+                yield name, metric, before[metric], after[metric], regressed
@@ -0,0 +1,206 @@
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Lecture
+from .occupancy import OccupancyIndex
+from .signals import lectures_changed_in_bulk
+from .timetable import get_timeslots
+
+
+# ===============================
+# ⭐ Bulk timetable operations
+#
+#    Swapping two cells, moving a faculty's day or copying a division means
+#    changing many lectures at once, and saving them one by one either
+#    fails on the unique constraints halfway (a swap) or leaves a half-done
+#    timetable behind. A ChangeSet collects every move, copy and delete,
+#    checks the whole set against an occupancy snapshot of just the
+#    faculties, divisions and rooms it touches (one query), and then writes
+#    it in one transaction with bulk_update/bulk_create.
+#
+#    Moved rows are first parked on a day value of their own, so no
+#    intermediate state (lecture A already in B's cell while B is still
+#    there) can hit a unique constraint.
+# ===============================
+BATCH_SIZE = 500
+MOVE_FIELDS = ['faculty', 'division', 'day', 'time_slot', 'room']
+
+
+class BulkOperationError(Exception):
+    """The change set would clash; nothing was written."""
+
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+
+class ChangeSet:
+
+    def __init__(self):
+        self.moves = {}
+        self.creates = []
+        self.deletes = {}
+
+    def move(self, lecture, **values):
+        """Give `lecture` new values for any of MOVE_FIELDS (as `<field>_id` or objects)."""
+        for name, value in values.items():
+            setattr(lecture, name, value)
+        self.moves[lecture.pk] = lecture
+
+    def create(self, lecture):
+        self.creates.append(lecture)
+
+    def delete(self, lecture):
+        self.deletes[lecture.pk] = lecture
+
+    def __len__(self):
+        return len(self.moves) + len(self.creates) + len(self.deletes)
+
+    def placements(self):
+        return [*self.moves.values(), *self.creates]
+
+    # ===============================
+    # ⭐ Validation
+    # ===============================
+    def snapshot(self):
+        """An occupancy index of the stored lectures the change set could clash with."""
+        placements = self.placements()
+        touched = Q(faculty_id__in={lecture.faculty_id for lecture in placements})
+        touched |= Q(division__in={lecture.division for lecture in placements})
+        rooms = {lecture.room_id for lecture in placements if lecture.room_id}
+        if rooms:
+            touched |= Q(room_id__in=rooms)
+
+        index = OccupancyIndex(get_timeslots())
+        rows = (
+            Lecture.objects.filter(touched, day__in={lecture.day for lecture in placements})
+            .exclude(pk__in=[*self.moves, *self.deletes])
+            .values_list('id', 'faculty_id', 'division', 'day', 'time_slot_id', 'room_id')
+        )
+        for lecture_id, faculty_id, division, day, slot_id, room_id in rows.iterator(chunk_size=2000):
+            index.add(lecture_id, faculty_id, division, day, slot_id, room_id)
+        return index
+
+    def validate(self):
+        """Return one message per placement that clashes with the rest of the timetable."""
+        placements = self.placements()
+        if not placements:
+            return []
+        index = self.snapshot()
+        errors = []
+        for position, lecture in enumerate(placements):
+            if not index.knows(lecture.day, lecture.time_slot_id):
+                errors.append(f"{lecture}: unknown day or time slot")
+                continue
+            clashes = index.clashes(
+                lecture.faculty_id, lecture.division, lecture.day, lecture.time_slot_id, room_id=lecture.room_id,
+            )
+            if clashes:
+                errors.append(
+                    f"{lecture} on {lecture.day} at {lecture.time_slot.display_name}: "
+                    f"{' and '.join(clashes)} already booked"
+                )
+            # later placements of the same set are checked against this one
+            key = lecture.pk if lecture.pk else ('new', position)
+            index.add(key, lecture.faculty_id, lecture.division, lecture.day, lecture.time_slot_id, lecture.room_id)
+        return errors
+
+    # ===============================
+    # ⭐ Apply
+    # ===============================
+    def apply(self):
+        """Validate and write everything in one transaction, or raise BulkOperationError."""
+        with transaction.atomic():
+            errors = self.validate()
+            if errors:
+                raise BulkOperationError(errors)
+
+            faculty_ids = {lecture.faculty_id for lecture in self.deletes.values()}
+            faculty_ids.update(lecture.faculty_id for lecture in self.placements())
+            if self.moves:
+                stored = dict(
+                    Lecture.objects.filter(pk__in=list(self.moves)).values_list('pk', 'faculty_id')
+                )
+                faculty_ids.update(stored.values())
+
+            if self.deletes:
+                Lecture.objects.filter(pk__in=list(self.deletes)).delete()
+            if self.moves:
+                moved = list(self.moves.values())
+                days = {lecture.pk: lecture.day for lecture in moved}
+                for lecture in moved:
+                    lecture.day = f"~{lecture.pk}"
+                Lecture.objects.bulk_update(moved, ['day'], batch_size=BATCH_SIZE)
+                for lecture in moved:
+                    lecture.day = days[lecture.pk]
+                Lecture.objects.bulk_update(moved, MOVE_FIELDS, batch_size=BATCH_SIZE)
+            if self.creates:
+                Lecture.objects.bulk_create(self.creates, batch_size=BATCH_SIZE)
+
+            lectures_changed_in_bulk(faculty_ids)
+        return len(self)
+
+
+# ===============================
+# ⭐ Operations
+# ===============================
+def swap(first, second):
+    """Swap the day and time slot of two lectures."""
+    if first.pk == second.pk:
+        raise BulkOperationError(['Choose two different lectures to swap'])
+    changes = ChangeSet()
+    first_cell = (first.day, first.time_slot)
+    changes.move(first, day=second.day, time_slot=second.time_slot)
+    changes.move(second, day=first_cell[0], time_slot=first_cell[1])
+    return changes.apply()
+
+
+def move(lectures, day=None, time_slot=None):
+    """Move `lectures` to another day and/or time slot, keeping everything else."""
+    changes = ChangeSet()
+    for lecture in lectures:
+        changes.move(lecture, day=day or lecture.day, time_slot=time_slot or lecture.time_slot)
+    return changes.apply()
+
+
+def shift_day(faculty, from_day, to_day):
+    """Move every lecture of `faculty` on `from_day` to the same slots on `to_day`."""
+    return move(Lecture.objects.filter(faculty=faculty, day=from_day).select_related('time_slot'), day=to_day)
+
+
+def copy_lectures(lectures, target, faculties, replace=False):
+    """Copy `lectures` (a queryset) to division `target`.
+
+    Copies keep their subject, day and slot but no room. As the originals
+    stay where they are, a copy can never be taught by the same faculty:
+    `faculties` maps each source faculty id to the faculty who teaches its
+    copies, and a source faculty missing from it is rejected before
+    anything else is checked. With `replace`, the lectures `target` already
+    has on the copied days are deleted in the same transaction.
+    """
+    lectures = list(lectures.select_related('faculty', 'subject', 'time_slot'))
+    unmapped = sorted({lecture.faculty.name for lecture in lectures if lecture.faculty_id not in faculties})
+    if unmapped:
+        raise BulkOperationError([f"Choose who teaches the copies of {name}'s lectures" for name in unmapped])
+
+    changes = ChangeSet()
+    if replace:
+        existing = Lecture.objects.filter(division=target, day__in={lecture.day for lecture in lectures})
+        for lecture in existing:
+            changes.delete(lecture)
+    for lecture in lectures:
+        changes.create(Lecture(
+            faculty=faculties[lecture.faculty_id],
+            subject=lecture.subject,
+            division=target,
+            day=lecture.day,
+            time_slot=lecture.time_slot,
+        ))
+    return changes.apply()
+
+
+def copy_division(source, target, faculties, replace=False):
+    """Copy the whole timetable of division `source` to `target` (see `copy_lectures`)."""
+    if source == target:
+        raise BulkOperationError(['Choose a different division to copy to'])
+    return copy_lectures(Lecture.objects.filter(division=source), target, faculties, replace=replace)
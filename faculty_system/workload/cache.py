@@ -0,0 +1,87 @@
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+
+# ===============================
+# ⭐ Versioned cache for derived data
+#
+#    Every table the app reads has a version number stored in the cache.
+#    Cached values are keyed by the versions of the tables they were built
+#    from, so bumping a version (done by the model signals) makes every
+#    dependent entry unreachable at once; nothing stale is ever served and
+#    nothing has to be deleted. Old entries simply age out.
+#
+#    Versions start from the clock rather than 1, so a version key that was
+#    evicted or lost on restart never comes back with a value that was
+#    already used. Works with any backend, including locmem and file based
+#    caches (use the file based one when several worker processes must see
+#    each other's bumps).
+# ===============================
+TABLES = ('lecture', 'faculty', 'subject', 'timeslot')
+
+
+def get_cache():
+    return caches[getattr(settings, 'WORKLOAD_CACHE_ALIAS', 'default')]
+
+
+def _version_key(table):
+    return f'workload:version:{table}'
+
+
+def table_versions(*tables):
+    """Return `{table: version}`, creating missing versions on the way."""
+    cache = get_cache()
+    keys = {_version_key(table): table for table in tables}
+    found = cache.get_many(list(keys))
+
+    versions = {}
+    for key, table in keys.items():
+        version = found.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        versions[table] = version
+    return versions
+
+
+def bump(*tables):
+    cache = get_cache()
+    for table in tables:
+        key = _version_key(table)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def versioned_key(name, tables, *parts):
+    versions = table_versions(*tables)
+    stamp = ':'.join(f'{table}={versions[table]}' for table in tables)
+    raw = ':'.join([name, *map(str, parts), stamp])
+    return f'workload:{name}:' + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def get_or_build(name, tables, builder, *parts):
+    """Return the cached value for `name`/`parts`, building it on a miss."""
+    cache = get_cache()
+    key = versioned_key(name, tables, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, getattr(settings, 'WORKLOAD_CACHE_TIMEOUT', 3600))
+    return value
+
+
+async def aget_or_build(name, tables, builder, *parts):
+    """Async `get_or_build`; `builder` is a coroutine function."""
+    cache = get_cache()
+    key = await sync_to_async(versioned_key)(name, tables, *parts)
+    value = await cache.aget(key)
+    if value is None:
+        value = await builder()
+        await cache.aset(key, value, getattr(settings, 'WORKLOAD_CACHE_TIMEOUT', 3600))
+    return value
@@ -0,0 +1,168 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from django.db.models import Q, Subquery
+
+from .models import Lecture, TimeSlot
+from .slots import slot_interval
+
+
+# ===============================
+# ⭐ Clash engine
+#
+#    Every lecture is a time interval (the start and end minutes of its
+#    slot) on one day, booked against up to three resources: its faculty,
+#    its division and, when set, its room. For each (resource, day) lane the
+#    engine keeps the bookings sorted by start time, so what overlaps a new
+#    interval is found with a binary search plus a scan back bounded by the
+#    longest booking of the lane, and a whole week is checked with one sweep
+#    per lane. A slot whose time range cannot be parsed gets a lane of its
+#    own and only clashes with itself.
+# ===============================
+RESOURCES = ('faculty', 'division', 'room')
+
+LABELS = {
+    'faculty': 'Faculty',
+    'division': 'Division',
+    'room': 'Room',
+}
+
+
+class Clash:
+    """Two lectures that overlap on the same faculty, division or room."""
+
+    def __init__(self, kind, key, day, first, second):
+        self.kind = kind
+        self.key = key
+        self.day = day
+        self.first = first
+        self.second = second
+
+    def __repr__(self):
+        return f"<Clash {self.kind}={self.key} {self.day}: {self.first} x {self.second}>"
+
+
+def resources(faculty_id, division, room_id=None):
+    keys = [('faculty', faculty_id), ('division', division)]
+    if room_id is not None:
+        keys.append(('room', room_id))
+    return keys
+
+
+class IntervalIndex:
+
+    def __init__(self, timeslots):
+        self.intervals = {slot.id: slot_interval(slot) for slot in timeslots}
+        # lane -> sorted start minutes, and the (start, end, lecture_id) bookings in the same order
+        self.starts = defaultdict(list)
+        self.bookings = defaultdict(list)
+        self.longest = defaultdict(int)
+
+    def _lane(self, kind, key, day, slot_id):
+        interval = self.intervals.get(slot_id)
+        if interval is None:
+            return (kind, key, day, slot_id), (0, 1)
+        return (kind, key, day), interval
+
+    def add(self, lecture_id, faculty_id, division, day, slot_id, room_id=None):
+        for kind, key in resources(faculty_id, division, room_id):
+            lane, (start, end) = self._lane(kind, key, day, slot_id)
+            position = bisect_right(self.starts[lane], start)
+            self.starts[lane].insert(position, start)
+            self.bookings[lane].insert(position, (start, end, lecture_id))
+            self.longest[lane] = max(self.longest[lane], end - start)
+
+    def overlapping(self, kind, key, day, slot_id, exclude=None):
+        """Ids of the lectures booked on `key` that overlap `(day, slot_id)`."""
+        lane, (start, end) = self._lane(kind, key, day, slot_id)
+        starts = self.starts.get(lane)
+        if not starts:
+            return []
+        # nothing starting at or before start - longest can still be running at start
+        low = bisect_right(starts, start - self.longest[lane])
+        high = bisect_left(starts, end)
+        return [
+            lecture_id for _, other_end, lecture_id in self.bookings[lane][low:high]
+            if other_end > start and lecture_id != exclude
+        ]
+
+    def conflicts(self, faculty_id, division, day, slot_id, room_id=None, exclude=None):
+        """Map each booked resource kind to the lectures it clashes with."""
+        found = {}
+        for kind, key in resources(faculty_id, division, room_id):
+            lecture_ids = self.overlapping(kind, key, day, slot_id, exclude)
+            if lecture_ids:
+                found[kind] = lecture_ids
+        return found
+
+    def sweep(self):
+        """Yield a `Clash` for every overlapping pair of bookings, lane by lane."""
+        for lane, bookings in self.bookings.items():
+            kind, key, day = lane[:3]
+            for first, second in overlapping_pairs(bookings):
+                yield Clash(kind, key, day, first, second)
+
+
+def overlapping_pairs(bookings):
+    """Yield `(earlier, later)` ids of overlapping `(start, end, id)` bookings sorted by start."""
+    running = []
+    for start, end, booking_id in bookings:
+        running = [(other_end, other) for other_end, other in running if other_end > start]
+        for _, other in running:
+            yield other, booking_id
+        running.append((end, booking_id))
+
+
+LECTURE_FIELDS = ('id', 'faculty_id', 'division', 'day', 'time_slot_id', 'room_id')
+
+
+def build_index(lectures=None, timeslots=None):
+    """An `IntervalIndex` of `lectures` (a Lecture queryset, default all) in one query."""
+    index = IntervalIndex(timeslots if timeslots is not None else TimeSlot.objects.all())
+    rows = (lectures if lectures is not None else Lecture.objects.all()).values_list(*LECTURE_FIELDS)
+    for lecture_id, faculty_id, division, day, slot_id, room_id in rows.iterator(chunk_size=2000):
+        index.add(lecture_id, faculty_id, division, day, slot_id, room_id)
+    return index
+
+
+def find_clashes(lectures=None):
+    """Every faculty, division and room clash among `lectures` (default: the whole week)."""
+    return list(build_index(lectures).sweep())
+
+
+def lecture_clashes(lecture):
+    """Messages for the stored lectures that overlap `lecture` in a different slot.
+
+    The slot's start and end minutes are read in the same query as the
+    overlapping lectures, never from the per-process overlap matrix, so a
+    slot another worker has just created or retimed is checked as it is
+    stored. Same-slot bookings are left to the unique constraints on
+    `Lecture`; a slot without parsed minutes overlaps nothing.
+    """
+    slot = TimeSlot.objects.filter(pk=lecture.time_slot_id)
+    booked = Q(faculty_id=lecture.faculty_id) | Q(division=lecture.division)
+    if lecture.room_id:
+        booked |= Q(room_id=lecture.room_id)
+    others = (
+        Lecture.objects.filter(
+            booked, day=lecture.day,
+            time_slot__start_minute__lt=Subquery(slot.values('end_minute')),
+            time_slot__end_minute__gt=Subquery(slot.values('start_minute')),
+        )
+        .exclude(time_slot_id=lecture.time_slot_id)
+        .exclude(pk=lecture.pk)
+        .select_related('time_slot')
+        .order_by('time_slot__sort_order')
+    )
+
+    found = {}
+    for other in others:
+        keys = resources(other.faculty_id, other.division, other.room_id)
+        for kind, key in resources(lecture.faculty_id, lecture.division, lecture.room_id):
+            if (kind, key) in keys:
+                found.setdefault(kind, other)
+    return [
+        f"❌ Lecture Clash! {LABELS[kind]} already has a lecture at "
+        f"{other.time_slot.display_name}, which overlaps {lecture.time_slot.display_name}."
+        for kind, other in found.items()
+    ]
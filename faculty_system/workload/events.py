@@ -0,0 +1,125 @@
+import asyncio
+import itertools
+import json
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+# ===============================
+# ⭐ Live timetable events
+#
+#    Model signals publish small events (a lecture was added, moved or
+#    removed; a faculty's workload changed) after commit, and the SSE view
+#    streams them to open dashboards. The broker is chosen with the
+#    WORKLOAD_EVENT_BROKER setting; the default keeps subscribers in this
+#    process, which is enough for a single ASGI worker. Anything with the
+#    same publish()/subscribe()/listening() interface (e.g. one backed by a
+#    local Redis) can replace it when several workers serve the site.
+# ===============================
+DEFAULT_BROKER = 'workload.events.InProcessBroker'
+
+
+class Subscription:
+    """One listener's queue. Use as a context manager so it is always dropped."""
+
+    def __init__(self, broker, maxsize):
+        self.broker = broker
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.broker.unsubscribe(self)
+
+    def put(self, event):
+        # runs on the subscriber's loop
+        if self.queue.full():
+            # a slow client missed events; tell it to reload instead of piling up
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'type': 'resync'})
+            return
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        """Next event, or None when nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessBroker:
+    """Fan events out to the subscribers of this process.
+
+    publish() may be called from any thread (sync views run in a thread pool
+    under ASGI); each event is handed to the subscriber's own event loop.
+    """
+
+    def __init__(self, maxsize=100):
+        self.maxsize = maxsize
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+
+    def publish(self, event):
+        event = {**event, 'id': next(self.ids)}
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # loop already closed; the subscription is gone
+                self.unsubscribe(subscription)
+
+    def listening(self):
+        return bool(self.subscribers)
+
+    def subscribe(self):
+        subscription = Subscription(self, self.maxsize)
+        with self.lock:
+            self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscribers.discard(subscription)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(getattr(settings, 'WORKLOAD_EVENT_BROKER', DEFAULT_BROKER))()
+    return _broker
+
+
+def publish(event):
+    get_broker().publish(event)
+
+
+def format_sse(event):
+    """Encode an event as one server-sent-events message."""
+    lines = [f"event: {event['type']}"]
+    if 'id' in event:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"data: {json.dumps(event, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def concerns(event, division):
+    """Whether a dashboard showing `division` needs this event."""
+    divisions = event.get('divisions')
+    return division is None or divisions is None or division in divisions
@@ -0,0 +1,232 @@
+import csv
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Case, IntegerField, Value, When
+
+from .models import Faculty, Lecture, DAY_CHOICES, new_calendar_key
+from .slots import parse_time_range
+
+
+# ===============================
+# ⭐ Streaming exports (CSV and iCalendar)
+#
+#    Every export is a generator over a `.iterator()` queryset projected with
+#    values_list(), so rows are fetched in chunks and written out as they
+#    come; memory stays flat however many lectures there are.
+# ===============================
+CHUNK_SIZE = 2000
+
+TIMETABLE_HEADER = ['Division', 'Day', 'Time Slot', 'Subject', 'Semester', 'Faculty', 'Department']
+WORKLOAD_HEADER = ['Faculty', 'Department', 'Max Hours', 'Assigned Hours', 'Load %', 'Status']
+
+DAY_ORDER = Case(
+    *[When(day=day, then=Value(position)) for position, (day, _) in enumerate(DAY_CHOICES)],
+    output_field=IntegerField(),
+)
+ICAL_DAYS = dict(zip([day for day, _ in DAY_CHOICES], ['MO', 'TU', 'WE', 'TH', 'FR', 'SA']))
+
+
+class Echo:
+    """File-like object whose write() just hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def timetable_csv(lectures=None):
+    """Yield CSV lines for `lectures` (default: the whole institution)."""
+    if lectures is None:
+        lectures = Lecture.objects.all()
+    rows = (
+        lectures.annotate(day_order=DAY_ORDER)
+        .order_by('division', 'day_order', 'time_slot__sort_order', 'faculty__name')
+        .values_list(
+            'division', 'day', 'time_slot__display_name', 'subject__subject_name',
+            'subject__semester', 'faculty__name', 'faculty__department',
+        )
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    return _csv_lines(TIMETABLE_HEADER, rows)
+
+
+def workload_csv(faculties=None):
+    """Yield CSV lines with every faculty's assigned hours and load."""
+    if faculties is None:
+        faculties = Faculty.objects.all()
+    rows = (
+        faculties.with_workload()
+        .order_by('department', 'name')
+        .values_list('name', 'department', 'max_hours', 'total_hours', 'load_pct', 'status')
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    return _csv_lines(WORKLOAD_HEADER, rows)
+
+
+# ===============================
+# ⭐ iCalendar (one weekly recurring event per lecture)
+# ===============================
+def _calendar_signer():
+    # not timestamped: a feed URL stays the same until the key is rotated
+    return signing.Signer(salt='workload.calendar')
+
+
+def calendar_token(faculty):
+    """Signed token that lets a calendar client fetch `faculty`'s feed without a session.
+
+    The faculty's calendar_key is signed in with the id, so rotating the key
+    (rotate_calendar_key) revokes every URL handed out before.
+    """
+    return _calendar_signer().sign_object([faculty.pk, faculty.calendar_key])
+
+
+def faculty_from_token(token):
+    try:
+        faculty_id, key = _calendar_signer().unsign_object(token)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    return Faculty.objects.filter(pk=faculty_id, calendar_key=key).first()
+
+
+def rotate_calendar_key(faculty):
+    faculty.calendar_key = new_calendar_key()
+    faculty.save(update_fields=['calendar_key'])
+    return calendar_token(faculty)
+
+
+def term_start():
+    """First day of the recurring events: WORKLOAD_TERM_START or this week's Monday."""
+    start = getattr(settings, 'WORKLOAD_TERM_START', None)
+    if start:
+        return date.fromisoformat(str(start))
+    today = date.today()
+    return today - timedelta(days=today.weekday())
+
+
+def _escape(text):
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;')
+        .replace(',', '\\,').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    # RFC 5545: content lines longer than 75 octets continue on a line starting with a space
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1  # do not split a UTF-8 sequence
+        parts.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _offset(delta):
+    minutes = int(delta.total_seconds()) // 60
+    sign = '-' if minutes < 0 else '+'
+    return f"{sign}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}"
+
+
+def _transitions(zone, start, end):
+    """Yield `(utc instant, offset before, offset after)` for each UTC offset change in [start, end]."""
+    hour = timedelta(hours=1)
+    moment = datetime.combine(start, time(), timezone.utc)
+    last = datetime.combine(end, time(), timezone.utc) + timedelta(days=1)
+    offset = moment.astimezone(zone).utcoffset()
+    while moment < last:
+        following = moment + timedelta(days=1)
+        if following.astimezone(zone).utcoffset() != offset:
+            # find the hour of the change within this day
+            while (moment + hour).astimezone(zone).utcoffset() == offset:
+                moment += hour
+            moment += hour
+            new_offset = moment.astimezone(zone).utcoffset()
+            yield moment, offset, new_offset
+            offset = new_offset
+        else:
+            moment = following
+
+
+def vtimezone(tzid, start, end):
+    """Yield the lines of a VTIMEZONE for `tzid` covering the dates `start` to `end`.
+
+    RFC 5545 requires one for every TZID an event refers to; X-WR-TIMEZONE
+    is only a hint that strict clients ignore. The first observance holds
+    the offset in force at `start`, then one follows per offset change.
+    """
+    zone = ZoneInfo(tzid)
+    first = datetime.combine(start, time(), timezone.utc).astimezone(zone)
+    observances = [(datetime(1970, 1, 1), first.utcoffset(), first.utcoffset(), first.dst(), first.tzname())]
+    for moment, before, after in _transitions(zone, start, end):
+        local = moment.astimezone(zone)
+        observances.append(((moment + before).replace(tzinfo=None), before, after, local.dst(), local.tzname()))
+
+    yield _fold('BEGIN:VTIMEZONE')
+    yield _fold(f'TZID:{tzid}')
+    for begins, before, after, dst, name in observances:
+        kind = 'DAYLIGHT' if dst else 'STANDARD'
+        yield _fold(f'BEGIN:{kind}')
+        yield _fold(f"DTSTART:{begins.strftime('%Y%m%dT%H%M%S')}")
+        yield _fold(f'TZOFFSETFROM:{_offset(before)}')
+        yield _fold(f'TZOFFSETTO:{_offset(after)}')
+        if name:
+            yield _fold(f'TZNAME:{_escape(name)}')
+        yield _fold(f'END:{kind}')
+    yield _fold('END:VTIMEZONE')
+
+
+def faculty_calendar(faculty, host='timetable'):
+    """Yield the lines of a VCALENDAR with `faculty`'s weekly lectures."""
+    tzid = settings.TIME_ZONE
+    start = term_start()
+    end = getattr(settings, 'WORKLOAD_TERM_END', None)
+    until = f";UNTIL={date.fromisoformat(str(end)).strftime('%Y%m%d')}T235959Z" if end else ''
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    yield _fold('BEGIN:VCALENDAR')
+    yield _fold('VERSION:2.0')
+    yield _fold('PRODID:-//Timetable Coordinator//Faculty Timetable//EN')
+    yield _fold('CALSCALE:GREGORIAN')
+    yield _fold(f'X-WR-CALNAME:{_escape(faculty.name)} — Timetable')
+    yield _fold(f'X-WR-TIMEZONE:{tzid}')
+    yield from vtimezone(tzid, start, date.fromisoformat(str(end)) if end else start + timedelta(days=366))
+
+    lectures = (
+        Lecture.objects.filter(faculty=faculty)
+        .order_by('pk')
+        .values_list('pk', 'day', 'division', 'subject__subject_name', 'time_slot__display_name', 'time_slot__slot_key')
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for pk, day, division, subject, display_name, slot_key in lectures:
+        interval = parse_time_range(display_name) or parse_time_range(slot_key)
+        if interval is None or day not in ICAL_DAYS:
+            continue
+        first = start + timedelta(days=(list(ICAL_DAYS).index(day) - start.weekday()) % 7)
+        begins = datetime.combine(first, datetime.min.time()) + timedelta(minutes=interval[0])
+        ends = datetime.combine(first, datetime.min.time()) + timedelta(minutes=interval[1])
+
+        yield _fold('BEGIN:VEVENT')
+        yield _fold(f'UID:lecture-{pk}@{host}')
+        yield _fold(f'DTSTAMP:{stamp}')
+        yield _fold(f"DTSTART;TZID={tzid}:{begins.strftime('%Y%m%dT%H%M%S')}")
+        yield _fold(f"DTEND;TZID={tzid}:{ends.strftime('%Y%m%dT%H%M%S')}")
+        yield _fold(f'RRULE:FREQ=WEEKLY;BYDAY={ICAL_DAYS[day]}{until}')
+        yield _fold(f'SUMMARY:{_escape(subject)} (Division {_escape(division)})')
+        yield _fold(f'DESCRIPTION:{_escape(display_name)}')
+        yield _fold('END:VEVENT')
+
+    yield _fold('END:VCALENDAR')
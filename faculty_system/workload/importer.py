@@ -0,0 +1,281 @@
+import csv
+import io
+import math
+from collections import defaultdict
+
+from django.db import transaction
+
+from .models import Faculty, Subject, Lecture, Room, DAY_CHOICES, DIVISION_CHOICES
+from .occupancy import OccupancyIndex
+from .signals import faculties_changed_in_bulk, lectures_changed_in_bulk, subjects_changed_in_bulk
+from .timetable import get_timeslots
+
+
+# ===============================
+# ⭐ Bulk import of faculties, subjects and lectures
+#
+#    Rows are streamed from CSV or XLSX and checked in memory against maps
+#    preloaded with a handful of queries (names -> ids, slot keys, an
+#    occupancy snapshot for clashes), instead of calling Lecture.clean() per
+#    row. Valid rows are written with bulk_create in chunks inside a single
+#    transaction; every invalid row is reported with its line number.
+# ===============================
+KINDS = ('faculties', 'subjects', 'lectures')
+BATCH_SIZE = 1000
+MAX_INTEGER = 2 ** 31 - 1  # IntegerField range on every supported database
+
+COLUMNS = {
+    'faculties': ('name', 'department', 'max_hours'),
+    'subjects': ('subject_name', 'semester', 'credit_hours'),
+    'lectures': ('faculty', 'subject', 'division', 'day', 'time_slot', 'room'),
+}
+
+
+class ImportAborted(Exception):
+    """Raised inside the import transaction to roll back a strict import."""
+
+
+class ImportReport:
+    def __init__(self, kind):
+        self.kind = kind
+        self.rows = 0
+        self.created = 0
+        self.errors = []
+
+    def error(self, line, message):
+        self.errors.append((line, message))
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def summary(self):
+        return f"{self.rows} row(s) read, {self.created} {self.kind} created, {len(self.errors)} error(s)"
+
+
+# ===============================
+# ⭐ Readers (streaming)
+# ===============================
+def _normalise_header(header):
+    return [str(name or '').strip().lower().replace(' ', '_') for name in header]
+
+
+def iter_csv(handle):
+    if isinstance(handle.read(0), bytes):
+        handle = io.TextIOWrapper(handle, encoding='utf-8-sig', newline='')
+    reader = csv.reader(handle)
+    header = _normalise_header(next(reader, []))
+    for values in reader:
+        yield dict(zip(header, values))
+
+
+def iter_xlsx(handle, sheet=None):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError('Reading .xlsx files needs openpyxl: pip install openpyxl')
+
+    workbook = load_workbook(handle, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        header = _normalise_header(next(rows, ()))
+        for values in rows:
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_rows(handle, filename, sheet=None):
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        return iter_xlsx(handle, sheet)
+    return iter_csv(handle)
+
+
+def _text(row, column):
+    value = row.get(column)
+    return '' if value is None else str(value).strip()
+
+
+def _integer(row, column):
+    value = _text(row, column)
+    try:
+        number = float(value)
+    except ValueError:
+        number = None
+    # 'inf', 'nan' and 1e30 parse as floats but are no whole number a column can hold
+    if number is None or not math.isfinite(number) or not number.is_integer():
+        raise ValueError(f"{column} must be a whole number, got '{value}'")
+    if number < 0:
+        raise ValueError(f"{column} cannot be negative")
+    if number > MAX_INTEGER:
+        raise ValueError(f"{column} must be at most {MAX_INTEGER}")
+    return int(number)
+
+
+# ===============================
+# ⭐ Row validators
+# ===============================
+class FacultyRows:
+    model = Faculty
+
+    def __init__(self):
+        self.seen = set(Faculty.objects.values_list('name', flat=True))
+
+    def build(self, row):
+        name = _text(row, 'name')
+        if not name:
+            raise ValueError('name is required')
+        if name in self.seen:
+            raise ValueError(f"faculty '{name}' already exists")
+        faculty = Faculty(name=name, department=_text(row, 'department'), max_hours=_integer(row, 'max_hours'))
+        self.seen.add(name)
+        return faculty
+
+    def written(self, objects):
+        faculties_changed_in_bulk([faculty.pk for faculty in objects])
+
+
+class SubjectRows:
+    model = Subject
+
+    def __init__(self):
+        self.seen = set(Subject.objects.values_list('subject_name', 'semester'))
+
+    def build(self, row):
+        name = _text(row, 'subject_name')
+        if not name:
+            raise ValueError('subject_name is required')
+        semester = _integer(row, 'semester')
+        if (name, semester) in self.seen:
+            raise ValueError(f"subject '{name}' already exists for semester {semester}")
+        subject = Subject(subject_name=name, semester=semester, credit_hours=_integer(row, 'credit_hours'))
+        self.seen.add((name, semester))
+        return subject
+
+    def written(self, objects):
+        subjects_changed_in_bulk()
+
+
+class LectureRows:
+    model = Lecture
+
+    def __init__(self):
+        self.faculties = self._name_map(Faculty.objects.values_list('id', 'name'))
+        self.subjects = self._name_map(Subject.objects.values_list('id', 'subject_name'))
+        self.rooms = self._name_map(Room.objects.values_list('id', 'name'))
+        self.timeslots = get_timeslots()
+        self.slots = {}
+        for slot in self.timeslots:
+            self.slots[slot.slot_key.lower()] = slot
+            self.slots.setdefault(slot.display_name.lower(), slot)
+        self.days = {day.lower(): day for day, _ in DAY_CHOICES}
+        self.divisions = {code.lower(): code for code, _ in DIVISION_CHOICES}
+        self.occupancy = OccupancyIndex.from_db()
+        self.next_id = 0
+
+    @staticmethod
+    def _name_map(pairs):
+        by_name = defaultdict(list)
+        by_id = {}
+        for pk, name in pairs:
+            by_name[name.lower()].append(pk)
+            by_id[str(pk)] = pk
+        return by_name, by_id
+
+    @staticmethod
+    def _resolve(maps, value, label):
+        by_name, by_id = maps
+        if not value:
+            raise ValueError(f"{label} is required")
+        ids = by_name.get(value.lower())
+        if ids and len(ids) > 1:
+            raise ValueError(f"{label} '{value}' is ambiguous; use its id")
+        if ids:
+            return ids[0]
+        if value in by_id:
+            return by_id[value]
+        raise ValueError(f"unknown {label} '{value}'")
+
+    def build(self, row):
+        faculty_id = self._resolve(self.faculties, _text(row, 'faculty'), 'faculty')
+        subject_id = self._resolve(self.subjects, _text(row, 'subject'), 'subject')
+
+        division = self.divisions.get(_text(row, 'division').lower())
+        if division is None:
+            raise ValueError(f"unknown division '{_text(row, 'division')}'")
+        day = self.days.get(_text(row, 'day').lower())
+        if day is None:
+            raise ValueError(f"unknown day '{_text(row, 'day')}'")
+        slot = self.slots.get(_text(row, 'time_slot').lower())
+        if slot is None:
+            raise ValueError(f"unknown time slot '{_text(row, 'time_slot')}'")
+
+        room_id = self._resolve(self.rooms, _text(row, 'room'), 'room') if _text(row, 'room') else None
+
+        clashes = self.occupancy.clashes(faculty_id, division, day, slot.id, room_id=room_id)
+        if clashes:
+            raise ValueError(f"{' and '.join(clashes)} already booked on {day} at {slot.display_name}")
+
+        # later rows of the same file are checked against this one
+        self.next_id -= 1
+        self.occupancy.add(self.next_id, faculty_id, division, day, slot.id, room_id)
+        return Lecture(
+            faculty_id=faculty_id, subject_id=subject_id, division=division, day=day, time_slot=slot, room_id=room_id,
+        )
+
+    def written(self, objects):
+        lectures_changed_in_bulk({lecture.faculty_id for lecture in objects})
+
+
+VALIDATORS = {
+    'faculties': FacultyRows,
+    'subjects': SubjectRows,
+    'lectures': LectureRows,
+}
+
+
+def import_rows(kind, rows, strict=False):
+    """Validate and write `rows` (an iterable of dicts) of the given kind.
+
+    With `strict`, nothing is written when any row is invalid.
+    """
+    if kind not in VALIDATORS:
+        raise ValueError(f"Unknown import kind '{kind}'; expected one of {', '.join(KINDS)}")
+
+    report = ImportReport(kind)
+    validator = VALIDATORS[kind]()
+    written = []
+    pending = []
+
+    try:
+        with transaction.atomic():
+            for line, row in enumerate(rows, start=2):
+                if not any(_text(row, column) for column in row):
+                    continue
+                report.rows += 1
+                try:
+                    pending.append(validator.build(row))
+                except ValueError as exc:
+                    report.error(line, str(exc))
+                    continue
+
+                if len(pending) >= BATCH_SIZE:
+                    written.extend(validator.model.objects.bulk_create(pending))
+                    pending = []
+
+            if pending:
+                written.extend(validator.model.objects.bulk_create(pending))
+            if strict and report.errors:
+                raise ImportAborted
+            if written:
+                validator.written(written)
+    except ImportAborted:
+        written = []
+
+    report.created = len(written)
+    return report
+
+
+def import_file(kind, handle, filename, strict=False, sheet=None):
+    return import_rows(kind, iter_rows(handle, filename, sheet), strict=strict)
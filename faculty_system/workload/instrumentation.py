@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+from django.conf import settings
+
+
+# ===============================
+# ⭐ Request instrumentation (opt-in)
+#
+#    With WORKLOAD_INSTRUMENTATION = True, InstrumentationMiddleware (in
+#    workload.middleware) wraps every database call of a request to count
+#    queries, add up SQL time and spot the same SQL statement running again
+#    and again (the N+1 pattern), and times the view. One record per request goes into a bounded in-memory ring buffer
+#    that the staff-only admin page summarises as p50/p95/p99 per URL name.
+#    WORKLOAD_SERVER_TIMING = True also returns the figures in a
+#    Server-Timing header for the browser's network panel.
+# ===============================
+DEFAULT_BUFFER_SIZE = 1000
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class RequestRecord:
+    __slots__ = (
+        'url_name', 'path', 'method', 'status', 'total_ms', 'view_ms',
+        'sql_ms', 'queries', 'duplicates', 'top_duplicate', 'timestamp',
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+
+class RingBuffer:
+    """The last `maxsize` request records; the oldest fall off the end."""
+
+    def __init__(self, maxsize=DEFAULT_BUFFER_SIZE):
+        self.records = deque(maxlen=maxsize)
+        self.lock = threading.Lock()
+
+    def append(self, record):
+        with self.lock:
+            self.records.append(record)
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.records)
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = RingBuffer(getattr(settings, 'WORKLOAD_INSTRUMENTATION_BUFFER', DEFAULT_BUFFER_SIZE))
+    return _buffer
+
+
+class QueryRecorder:
+    """`connection.execute_wrapper` hook counting queries, SQL time and repeats."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def duplicates(self):
+        """Extra executions of statements that already ran, and the most repeated one."""
+        repeated = [(count, sql) for sql, count in self.statements.items() if count > 1]
+        if not repeated:
+            return 0, None
+        count, sql = max(repeated)
+        return sum(count - 1 for count, _ in repeated), f"{count}x {sql[:200]}"
+
+
+def server_timing_header(record):
+    parts = [f'db;dur={record.sql_ms:.1f};desc="{record.queries} queries"']
+    if record.duplicates:
+        parts.append(f'dup;desc="{record.duplicates} duplicate queries"')
+    if record.view_ms is not None:
+        parts.append(f'view;dur={record.view_ms:.1f}')
+    parts.append(f'total;dur={record.total_ms:.1f}')
+    return ', '.join(parts)
+
+
+def summarize(records):
+    """Per URL name: request count, latency and SQL percentiles, queries and duplicates."""
+    groups = defaultdict(list)
+    for record in records:
+        groups[record.url_name].append(record)
+
+    rows = []
+    for url_name, group in groups.items():
+        totals = [record.total_ms for record in group]
+        sql = [record.sql_ms for record in group]
+        worst = max(group, key=lambda record: record.duplicates)
+        rows.append({
+            'url_name': url_name,
+            'requests': len(group),
+            'p50_ms': percentile(totals, 50),
+            'p95_ms': percentile(totals, 95),
+            'p99_ms': percentile(totals, 99),
+            'sql_p95_ms': percentile(sql, 95),
+            'avg_queries': sum(record.queries for record in group) / len(group),
+            'max_queries': max(record.queries for record in group),
+            'max_duplicates': worst.duplicates,
+            'top_duplicate': worst.top_duplicate,
+        })
+    rows.sort(key=lambda row: row['p95_ms'], reverse=True)
+    return rows
@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from workload.allocation import DEFAULT_MAX_NODES, allocate, apply_allocation
+from workload.models import Faculty, Subject, DIVISION_CHOICES
+
+
+class Command(BaseCommand):
+    help = "Automatically allocate lectures for whole divisions without clashes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--division', action='append', dest='divisions',
+            choices=[code for code, _ in DIVISION_CHOICES],
+            help='Division to allocate (repeatable). Defaults to every division.',
+        )
+        parser.add_argument('--department', help='Only use faculties from this department.')
+        parser.add_argument('--semester', type=int, help='Only allocate subjects of this semester.')
+        parser.add_argument('--practicals', action='store_true', help='Place one 2-hour practical per subject where possible.')
+        parser.add_argument('--max-nodes', type=int, default=DEFAULT_MAX_NODES, help='Search budget for the backtracking pass.')
+        parser.add_argument('--dry-run', action='store_true', help='Show the allocation without saving it.')
+
+    def handle(self, *args, **options):
+        faculties = Faculty.objects.order_by('pk')
+        if options['department']:
+            faculties = faculties.filter(department=options['department'])
+        subjects = Subject.objects.order_by('pk')
+        if options['semester'] is not None:
+            subjects = subjects.filter(semester=options['semester'])
+
+        if not faculties.exists():
+            raise CommandError('No faculties match the given filters.')
+
+        started = time.perf_counter()
+        result = allocate(
+            divisions=options['divisions'],
+            subjects=subjects,
+            faculties=faculties,
+            use_practicals=options['practicals'],
+            max_nodes=options['max_nodes'],
+        )
+        elapsed = time.perf_counter() - started
+
+        for lecture in result.lectures:
+            self.stdout.write(f"{lecture.division}  {lecture.day:<9}  {lecture.time_slot.slot_key:<12}  {lecture.subject}  ->  {lecture.faculty}")
+        for session in result.unplaced:
+            self.stderr.write(f"Unplaced: division {session.division}, {session.subject} ({session.duration}h)")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"Dry run: {result.summary()} in {elapsed:.2f}s. Nothing saved."))
+            return
+
+        apply_allocation(result)
+        self.stdout.write(self.style.SUCCESS(f"{result.summary()} in {elapsed:.2f}s."))
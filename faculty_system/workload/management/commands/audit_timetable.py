@@ -0,0 +1,43 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from workload.audit import TimetableAudit
+
+
+class Command(BaseCommand):
+    help = (
+        "Check every stored lecture for faculty, division and room double bookings, overlapping slots, "
+        "max_hours breaches and stale workload rows. Writes one JSON object per problem (JSON Lines), "
+        "followed by a summary object."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Write the report to this file instead of stdout.')
+        parser.add_argument('--fail-on-issues', action='store_true', help='Exit with status 1 when anything is found.')
+
+    def handle(self, *args, **options):
+        audit = TimetableAudit()
+        handle = None
+        if options['output']:
+            try:
+                handle = open(options['output'], 'w', encoding='utf-8')
+            except OSError as exc:
+                raise CommandError(str(exc))
+            write = lambda line: handle.write(line + '\n')
+        else:
+            write = self.stdout.write
+
+        try:
+            for issue in audit.issues():
+                write(json.dumps(issue))
+            summary = audit.summary()
+            write(json.dumps(summary))
+        finally:
+            if handle is not None:
+                handle.close()
+
+        message = f"{summary['lectures']} lectures audited in {summary['seconds']:.2f}s, {summary['issues']} issue(s)"
+        if summary['issues'] and options['fail_on_issues']:
+            raise CommandError(message)
+        self.stderr.write(self.style.WARNING(message) if summary['issues'] else self.style.SUCCESS(message))
@@ -0,0 +1,112 @@
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, override_settings
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import path
+
+from workload import views
+from workload.instrumentation import percentile
+from workload.models import DIVISION_CHOICES
+from workload.synthetic import generate
+
+
+# Both variants side by side, served through Django's ASGI handler by AsyncClient.
+urlpatterns = [
+    path('sync/', views.dashboard),
+    path('sync/pdf/', views.download_timetable_pdf),
+    path('async/', views.dashboard_async),
+    path('async/pdf/', views.download_timetable_pdf_async),
+    path('login/', views.faculty_login),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync and async dashboard/PDF views under concurrent mixed load, "
+        "through the ASGI handler, on a synthetic dataset in a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per variant.')
+        parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight at once.')
+        parser.add_argument('--pdf-ratio', type=float, default=0.25, help='Share of requests that download a PDF.')
+        parser.add_argument('--warm', action='store_true', help='Keep the dashboard and PDF caches on (default: every request is cold).')
+        parser.add_argument('--faculties', type=int, default=200)
+        parser.add_argument('--subjects', type=int, default=60)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        divisions = [code for code, _ in DIVISION_CHOICES]
+        plan = [
+            ('pdf/' if rng.random() < options['pdf_ratio'] else '', rng.choice(divisions))
+            for _ in range(options['requests'])
+        ]
+
+        overrides = {'ROOT_URLCONF': __name__}
+        if not options['warm']:
+            overrides.update(
+                CACHES={
+                    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                    'workload-bench': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+                },
+                WORKLOAD_CACHE_ALIAS='workload-bench',
+            )
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            generate(faculties=options['faculties'], subjects=options['subjects'], seed=options['seed'])
+            user = get_user_model().objects.create_user(username='benchmark')
+            with ExitStack() as stack:
+                if not options['warm']:
+                    overrides['WORKLOAD_PDF_CACHE_DIR'] = stack.enter_context(tempfile.TemporaryDirectory(prefix='workload-bench-'))
+                    # every PDF request renders, as on the first download after a change
+                    stack.enter_context(mock.patch('workload.pdf_cache.lookup', return_value=None))
+                stack.enter_context(override_settings(**overrides))
+                for variant in ('sync', 'async'):
+                    elapsed, latencies, errors = asyncio.run(self.run(variant, plan, user, options['concurrency']))
+                    self.report(variant, elapsed, latencies, errors)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    async def run(self, variant, plan, user, concurrency):
+        client = AsyncClient()
+        await client.aforce_login(user)
+        # one untimed request per kind so imports and pools are warm
+        await client.get(f'/{variant}/')
+        await client.get(f'/{variant}/pdf/')
+
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        errors = 0
+
+        async def one(kind, division):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(f'/{variant}/{kind}', {'division': division})
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(kind, division) for kind, division in plan))
+        return time.perf_counter() - started, latencies, errors
+
+    def report(self, variant, elapsed, latencies, errors):
+        p95 = percentile(latencies, 95)
+        self.stdout.write(
+            f"{variant:>5}: {len(latencies) / elapsed:7.1f} req/s  "
+            f"p50 {statistics.median(latencies):7.1f} ms  p95 {p95:7.1f} ms  "
+            f"errors {errors}  ({elapsed:.2f}s total)"
+        )
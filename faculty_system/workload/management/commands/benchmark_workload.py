@@ -0,0 +1,142 @@
+import json
+from contextlib import ExitStack
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from workload.benchmarks import compare, environment, measure, write_results
+from workload.models import Lecture, UserSession, DIVISION_CHOICES
+from workload.synthetic import generate
+from workload.views import expire_other_sessions
+
+
+COLD_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'workload-bench': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the dashboard, PDF download, API, exports, Lecture.full_clean and "
+        "expire_other_sessions on a synthetic dataset in a throwaway test database. "
+        "Writes query counts, wall times and peak memory to a JSON file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='benchmark_results.json', help='Where to write the JSON results.')
+        parser.add_argument('--compare', help='Earlier results file; regressions make the command fail.')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed wall-time growth when comparing (fraction).')
+        parser.add_argument('--faculties', type=int, default=200)
+        parser.add_argument('--subjects', type=int, default=60)
+        parser.add_argument(
+            '--division', action='append', dest='divisions',
+            choices=[code for code, _ in DIVISION_CHOICES],
+            help='Division to fill (repeatable). Defaults to every division.',
+        )
+        parser.add_argument('--timeslots', help="Comma separated custom slot set, e.g. '9-10,10-11,11-12,2-4'.")
+        parser.add_argument('--fill', type=float, default=0.8)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark.')
+        parser.add_argument('--sessions', type=int, default=200, help='Stale sessions expire_other_sessions has to revoke.')
+        parser.add_argument('--warm', action='store_true', help='Keep the dashboard and PDF caches on.')
+
+    def handle(self, *args, **options):
+        previous = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as handle:
+                    previous = json.load(handle)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {options['compare']}: {exc}")
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            payload = self.run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        write_results(options['output'], payload)
+        for name, result in payload['results'].items():
+            self.stdout.write(
+                f"{name:<28} {result['median_ms']:9.2f} ms  {result['queries']:4d} queries  {result['peak_kib']:9.1f} KiB"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if previous:
+            self.report_comparison(previous, payload, options['tolerance'])
+
+    def run(self, options):
+        timeslots = [spec.strip() for spec in options['timeslots'].split(',')] if options['timeslots'] else None
+        dataset = generate(
+            faculties=options['faculties'], subjects=options['subjects'], divisions=options['divisions'],
+            timeslots=timeslots, fill=options['fill'], seed=options['seed'],
+        )
+
+        user = get_user_model().objects.create_user('benchmark', password='benchmark')
+        client = Client()
+        client.force_login(user)
+        division = (options['divisions'] or [DIVISION_CHOICES[0][0]])[0]
+
+        def get(url):
+            def fetch():
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise CommandError(f"{url} returned {response.status_code}")
+                if response.streaming:
+                    for _ in response.streaming_content:
+                        pass
+            return fetch
+
+        lectures = list(Lecture.objects.select_related('faculty', 'subject', 'time_slot')[:100])
+
+        def full_clean():
+            for lecture in lectures:
+                lecture.full_clean()
+
+        def stale_sessions():
+            UserSession.objects.filter(user=user).delete()
+            for _ in range(options['sessions']):
+                store = SessionStore()
+                store.create()
+                UserSession.objects.create(user=user, session_key=store.session_key)
+
+        benchmarks = {
+            'dashboard': (get(f'/?division={division}'), None),
+            'download_timetable_pdf': (get(f'/download-pdf/?division={division}'), None),
+            'api_division_timetable': (get(f'/api/divisions/{division}/timetable/'), None),
+            'api_workload': (get('/api/workload/?limit=1000'), None),
+            'export_timetable_csv': (get('/export/timetable.csv'), None),
+            'lecture_full_clean_x100': (full_clean, None),
+            'expire_other_sessions': (lambda: expire_other_sessions(user, None), stale_sessions),
+        }
+
+        results = {}
+        with ExitStack() as stack:
+            if not options['warm']:
+                stack.enter_context(override_settings(CACHES=COLD_CACHES, WORKLOAD_CACHE_ALIAS='workload-bench'))
+                stack.enter_context(mock.patch('workload.pdf_cache.lookup', return_value=None))
+            for name, (fn, setup) in benchmarks.items():
+                results[name] = measure(fn, repeat=options['repeat'], setup=setup)
+
+        params = {key: options[key] for key in ('faculties', 'subjects', 'divisions', 'timeslots', 'fill', 'seed', 'repeat', 'sessions', 'warm')}
+        return {**environment(), 'params': params, 'dataset': dataset, 'results': results}
+
+    def report_comparison(self, previous, payload, tolerance):
+        self.stdout.write(f"Compared with {previous.get('commit') or 'previous run'}:")
+        regressions = 0
+        for name, metric, before, after, regressed in compare(previous.get('results', {}), payload['results'], tolerance):
+            line = f"  {name:<28} {metric:<10} {before:>10} -> {after:<10}"
+            if regressed:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(line + ' REGRESSION'))
+            else:
+                self.stdout.write(line)
+        if regressions:
+            raise CommandError(f"{regressions} regression(s) against {previous.get('commit') or 'the previous run'}")
@@ -0,0 +1,46 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from workload.models import TimetableSnapshot
+from workload.snapshots import diff
+
+
+class Command(BaseCommand):
+    help = "Show what changed between two timetable snapshots, or between a snapshot and the live timetable."
+
+    def add_arguments(self, parser):
+        parser.add_argument('old', type=int, help='Id of the older snapshot.')
+        parser.add_argument('new', type=int, nargs='?', help='Id of the newer snapshot (default: the live timetable).')
+        parser.add_argument('--json', action='store_true', help='Print the changes as JSON.')
+
+    def handle(self, *args, **options):
+        snapshots = TimetableSnapshot.objects.in_bulk([options['old'], options['new']] if options['new'] else [options['old']])
+        try:
+            old = snapshots[options['old']]
+            new = snapshots[options['new']] if options['new'] else None
+        except KeyError as exc:
+            raise CommandError(f"Snapshot #{exc.args[0]} does not exist")
+        try:
+            changes = diff(old, new)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        rows = changes.rows() if changes else []
+        if options['json']:
+            self.stdout.write(json.dumps({'division': old.division, 'counts': changes.counts(), 'changes': rows}, indent=2))
+            return
+
+        against = f"snapshot #{new.pk}" if new else 'the live timetable'
+        if not changes:
+            self.stdout.write(self.style.SUCCESS(f"Division {old.division}: no changes between snapshot #{old.pk} and {against}."))
+            return
+        for row in rows:
+            before = f"{row['before']['subject']} ({row['before']['faculty']})" if row['before'] else '-'
+            after = f"{row['after']['subject']} ({row['after']['faculty']})" if row['after'] else '-'
+            self.stdout.write(f"{row['change']:<8} {row['day']:<10} {row['slot']:<22} {before} -> {after}")
+        counts = changes.counts()
+        self.stdout.write(
+            f"Division {old.division}, snapshot #{old.pk} -> {against}: "
+            f"{counts['added']} added, {counts['removed']} removed, {counts['changed']} changed."
+        )
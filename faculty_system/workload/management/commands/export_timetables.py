@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from workload.batch_export import collect_pages, write_pdf, write_zip
+from workload.models import Faculty, DIVISION_CHOICES
+
+
+class Command(BaseCommand):
+    help = "Export every division's timetable and each faculty's personal timetable in one job."
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Target file: .pdf for one multi-page PDF, .zip for one PDF per timetable.')
+        parser.add_argument(
+            '--division', action='append', dest='divisions',
+            choices=[code for code, _ in DIVISION_CHOICES],
+            help='Division to export (repeatable). Defaults to every division.',
+        )
+        parser.add_argument('--faculty', type=int, action='append', dest='faculty_ids', help='Faculty id to export (repeatable). Defaults to every faculty.')
+        parser.add_argument('--department', help='Only export faculties from this department.')
+        parser.add_argument('--no-divisions', action='store_true', help='Skip division timetables.')
+        parser.add_argument('--no-faculties', action='store_true', help='Skip faculty timetables.')
+        parser.add_argument('--workers', type=int, help='Worker processes for ZIP export (default: CPU count).')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        if not output.lower().endswith(('.pdf', '.zip')):
+            raise CommandError('Output file must end in .pdf or .zip')
+
+        divisions = [] if options['no_divisions'] else options['divisions']
+        faculties = Faculty.objects.none()
+        if not options['no_faculties']:
+            faculties = Faculty.objects.order_by('name')
+            if options['faculty_ids']:
+                faculties = faculties.filter(pk__in=options['faculty_ids'])
+            if options['department']:
+                faculties = faculties.filter(department=options['department'])
+
+        started = time.perf_counter()
+        pages = collect_pages(divisions, faculties)
+        if not pages:
+            raise CommandError('Nothing to export.')
+
+        with open(output, 'wb') as out:
+            if output.lower().endswith('.zip'):
+                write_zip(pages, out, workers=options['workers'])
+            else:
+                write_pdf(pages, out)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Exported {len(pages)} timetable(s) to {output} in {elapsed:.2f}s."))
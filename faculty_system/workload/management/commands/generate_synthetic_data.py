@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from workload.models import DIVISION_CHOICES
+from workload.synthetic import flush, generate
+
+
+class Command(BaseCommand):
+    help = "Fill the database with synthetic faculties, subjects and a clash-free timetable (for benchmarks and demos)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--faculties', type=int, default=50)
+        parser.add_argument('--subjects', type=int, default=30)
+        parser.add_argument(
+            '--division', action='append', dest='divisions',
+            choices=[code for code, _ in DIVISION_CHOICES],
+            help='Division to fill (repeatable). Defaults to every division.',
+        )
+        parser.add_argument('--timeslots', help="Comma separated custom slot set, e.g. '9-10,10-11,11-12,2-4'.")
+        parser.add_argument('--fill', type=float, default=0.8, help='Share of timetable cells to occupy (0-1).')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--flush', action='store_true', help='Delete all lectures, faculties and subjects first.')
+
+    def handle(self, *args, **options):
+        if options['flush']:
+            flush()
+        timeslots = [spec.strip() for spec in options['timeslots'].split(',')] if options['timeslots'] else None
+        try:
+            counts = generate(
+                faculties=options['faculties'], subjects=options['subjects'], divisions=options['divisions'],
+                timeslots=timeslots, fill=options['fill'], seed=options['seed'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(', '.join(f"{count} {name}" for name, count in counts.items())))
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from workload.importer import COLUMNS, KINDS, import_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Import faculties, subjects or lectures from a .csv or .xlsx file. "
+        "Every row is validated first; all errors are reported together and valid rows are written in one transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=KINDS)
+        parser.add_argument(
+            'file',
+            help='CSV or XLSX file with a header row. Columns: '
+            + '; '.join(f"{kind}: {', '.join(columns)}" for kind, columns in COLUMNS.items()),
+        )
+        parser.add_argument('--sheet', help='Worksheet to read from an .xlsx file (default: the active sheet).')
+        parser.add_argument('--strict', action='store_true', help='Write nothing if any row is invalid.')
+        parser.add_argument('--max-errors', type=int, default=50, help='How many row errors to print.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options['file'], 'rb') as handle:
+                report = import_file(options['kind'], handle, options['file'], strict=options['strict'], sheet=options['sheet'])
+        except (OSError, ImportError) as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+
+        for line, message in report.errors[:options['max_errors']]:
+            self.stderr.write(f"Row {line}: {message}")
+        if len(report.errors) > options['max_errors']:
+            self.stderr.write(f"... and {len(report.errors) - options['max_errors']} more error(s)")
+
+        summary = f"{report.summary()} in {elapsed:.2f}s."
+        if report.ok:
+            self.stdout.write(self.style.SUCCESS(summary))
+        elif options['strict']:
+            raise CommandError(f"{summary} Nothing was written (--strict).")
+        else:
+            self.stdout.write(self.style.WARNING(summary))
@@ -0,0 +1,104 @@
+import http.cookiejar
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from workload.benchmarks import environment, percentile, write_results
+
+
+DEFAULT_PATHS = ['/?division=A', '/download-pdf/?division=A', '/api/workload/', '/export/timetable.csv']
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test a running server (runserver, gunicorn, uvicorn): log in once, then hit the given "
+        "paths from concurrent workers and report throughput and latency percentiles per path."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the running server.')
+        parser.add_argument('--username', required=True)
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--path', action='append', dest='paths', help=f"Path to request (repeatable). Default: {', '.join(DEFAULT_PATHS)}")
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=30.0, help='Seconds to keep the load on.')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds.')
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+
+    def handle(self, *args, **options):
+        base = options['url'].rstrip('/')
+        paths = options['paths'] or DEFAULT_PATHS
+        cookies = self.login(base, options['username'], options['password'])
+
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['duration']
+
+        def worker(offset):
+            # every worker shares the one session: logging in again would revoke it
+            opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookies))
+            i = offset
+            while time.monotonic() < deadline:
+                path = paths[i % len(paths)]
+                i += 1
+                started = time.perf_counter()
+                try:
+                    with opener.open(base + path, timeout=options['timeout']) as response:
+                        response.read()
+                        ok = response.status == 200
+                except (urllib.error.URLError, OSError):
+                    ok = False
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies[path].append(elapsed)
+                    if not ok:
+                        errors[path] += 1
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            list(executor.map(worker, range(options['concurrency'])))
+        elapsed = time.monotonic() - started
+
+        results = {}
+        for path in paths:
+            samples = latencies[path]
+            results[path] = {
+                'requests': len(samples),
+                'errors': errors[path],
+                'rps': round(len(samples) / elapsed, 2),
+                'p50_ms': round(percentile(samples, 50) or 0, 2),
+                'p95_ms': round(percentile(samples, 95) or 0, 2),
+                'p99_ms': round(percentile(samples, 99) or 0, 2),
+            }
+            self.stdout.write(
+                f"{path:<32} {results[path]['rps']:8.1f} req/s  p50 {results[path]['p50_ms']:8.1f}  "
+                f"p95 {results[path]['p95_ms']:8.1f}  p99 {results[path]['p99_ms']:8.1f} ms  errors {errors[path]}"
+            )
+        total = sum(result['requests'] for result in results.values())
+        self.stdout.write(self.style.SUCCESS(f"{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)"))
+
+        if options['output']:
+            params = {key: options[key] for key in ('url', 'concurrency', 'duration')}
+            write_results(options['output'], {**environment(), 'params': {**params, 'paths': paths}, 'results': results})
+
+    def login(self, base, username, password):
+        cookies = http.cookiejar.CookieJar()
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookies))
+        try:
+            opener.open(f"{base}/login/", timeout=10).read()
+            csrf = next((cookie.value for cookie in cookies if cookie.name == 'csrftoken'), '')
+            data = urllib.parse.urlencode({'username': username, 'password': password, 'csrfmiddlewaretoken': csrf}).encode()
+            request = urllib.request.Request(f"{base}/login/", data=data, headers={'Referer': f"{base}/login/"})
+            opener.open(request, timeout=10).read()
+        except (urllib.error.URLError, OSError) as exc:
+            raise CommandError(f"Cannot log in at {base}: {exc}")
+        if not any(cookie.name == 'sessionid' for cookie in cookies):
+            raise CommandError('Login failed: check --username/--password')
+        return cookies
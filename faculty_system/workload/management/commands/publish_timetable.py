@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from workload.models import DIVISION_CHOICES
+from workload.snapshots import publish
+
+
+class Command(BaseCommand):
+    help = (
+        "Snapshot the current timetable of every division (or the given ones). "
+        "Divisions unchanged since their last snapshot are not stored again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--division', action='append', dest='divisions', choices=[code for code, _ in DIVISION_CHOICES],
+            help='Only snapshot this division (repeatable).',
+        )
+        parser.add_argument('--label', default='', help='Label stored with the new snapshots, e.g. "Week 3 printout".')
+
+    def handle(self, *args, **options):
+        result = publish(options['divisions'], label=options['label'])
+        for division, (snapshot, created) in sorted(result.items()):
+            status = 'new' if created else 'unchanged'
+            self.stdout.write(
+                f"Division {division}: snapshot #{snapshot.pk} {snapshot.content_hash[:12]} "
+                f"({snapshot.lecture_count} lectures, {status})"
+            )
+        created = sum(1 for _, created in result.values() if created)
+        self.stdout.write(self.style.SUCCESS(f"{created} new snapshot(s)."))
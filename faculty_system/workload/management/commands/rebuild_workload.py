@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from workload.materialized import rebuild_workload
+
+
+class Command(BaseCommand):
+    help = "Rebuild the FacultyWorkload table from scratch from the stored lectures."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--faculty', type=int, action='append', dest='faculty_ids', help='Only rebuild this faculty id (repeatable).')
+
+    def handle(self, *args, **options):
+        count = rebuild_workload(options['faculty_ids'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt workload for {count} faculty member(s)."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from workload.bulk_ops import BulkOperationError
+from workload.models import TimetableSnapshot
+from workload.snapshots import diff, rollback
+
+
+class Command(BaseCommand):
+    help = (
+        "Restore a division's timetable to a snapshot. Only the cells that differ are rewritten, "
+        "in one transaction; nothing changes if the result would clash with another division."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('snapshot', type=int, help='Id of the snapshot to restore.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many cells would change.')
+
+    def handle(self, *args, **options):
+        snapshot = TimetableSnapshot.objects.filter(pk=options['snapshot']).first()
+        if snapshot is None:
+            raise CommandError(f"Snapshot #{options['snapshot']} does not exist")
+
+        if options['dry_run']:
+            counts = diff(snapshot).counts()
+            self.stdout.write(
+                f"Division {snapshot.division}: {counts['added']} lecture(s) would be removed, "
+                f"{counts['removed']} restored and {counts['changed']} replaced."
+            )
+            return
+
+        try:
+            changed = rollback(snapshot)
+        except BulkOperationError as exc:
+            raise CommandError('Nothing was changed:\n' + '\n'.join(exc.errors))
+        if not changed:
+            self.stdout.write(f"Division {snapshot.division} already matches snapshot #{snapshot.pk}.")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Division {snapshot.division} restored to snapshot #{snapshot.pk} ({changed} lecture(s) written or deleted)."
+        ))
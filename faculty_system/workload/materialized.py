@@ -0,0 +1,106 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Sum, When
+
+from .models import Faculty, FacultyWorkload, Lecture
+
+
+# ===============================
+# ⭐ Materialized faculty workload
+#
+#    `FacultyWorkload` holds one row per faculty with total hours, hours per
+#    day, hours per division and the overload flag (total > max_hours).
+#    Lecture saves/deletes apply their delta to the affected rows inside the
+#    same transaction; anything that bypasses model signals (bulk_create,
+#    queryset.update) rebuilds the affected faculties instead.
+# ===============================
+def _add(counts, key, hours):
+    value = counts.get(key, 0) + hours
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+def apply_delta(faculty_id, division, day, hours):
+    """Add `hours` (negative to remove) for one lecture placement."""
+    if not faculty_id or not hours:
+        return
+
+    with transaction.atomic():
+        row = (
+            FacultyWorkload.objects.select_for_update()
+            .select_related('faculty')
+            .filter(faculty_id=faculty_id)
+            .first()
+        )
+        if row is None:
+            if hours < 0 or not Faculty.objects.filter(pk=faculty_id).exists():
+                # the faculty itself is being deleted: nothing left to track
+                return
+            row = FacultyWorkload.objects.create(faculty_id=faculty_id)
+
+        row.total_hours += hours
+        _add(row.hours_by_day, day, hours)
+        _add(row.hours_by_division, division, hours)
+        row.is_overloaded = row.total_hours > row.faculty.max_hours
+        row.save()
+
+
+def lecture_placement(lecture_id):
+    """Return the stored `(faculty_id, division, day, hours)` of a lecture, or None."""
+    return (
+        Lecture.objects.filter(pk=lecture_id)
+        .values_list('faculty_id', 'division', 'day', 'time_slot__duration_hours')
+        .first()
+    )
+
+
+def refresh_overload(faculty):
+    FacultyWorkload.objects.filter(faculty=faculty).update(
+        is_overloaded=Case(When(total_hours__gt=faculty.max_hours, then=True), default=False),
+    )
+
+
+def rebuild_workload(faculty_ids=None):
+    """Recompute workload rows from scratch (all faculties, or only `faculty_ids`)."""
+    faculties = Faculty.objects.all()
+    lectures = Lecture.objects.all()
+    if faculty_ids is not None:
+        faculty_ids = list(faculty_ids)
+        faculties = faculties.filter(pk__in=faculty_ids)
+        lectures = lectures.filter(faculty_id__in=faculty_ids)
+
+    by_day = defaultdict(dict)
+    by_division = defaultdict(dict)
+    totals = defaultdict(int)
+    grouped = (
+        lectures.values_list('faculty_id', 'division', 'day')
+        .annotate(hours=Sum('time_slot__duration_hours'))
+        .order_by()
+    )
+    for faculty_id, division, day, hours in grouped:
+        hours = int(hours or 0)
+        totals[faculty_id] += hours
+        _add(by_day[faculty_id], day, hours)
+        _add(by_division[faculty_id], division, hours)
+
+    rows = [
+        FacultyWorkload(
+            faculty_id=faculty_id,
+            total_hours=totals[faculty_id],
+            hours_by_day=by_day[faculty_id],
+            hours_by_division=by_division[faculty_id],
+            is_overloaded=totals[faculty_id] > max_hours,
+        )
+        for faculty_id, max_hours in faculties.values_list('id', 'max_hours')
+    ]
+
+    with transaction.atomic():
+        existing = FacultyWorkload.objects.all()
+        if faculty_ids is not None:
+            existing = existing.filter(faculty_id__in=faculty_ids)
+        existing.delete()
+        FacultyWorkload.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
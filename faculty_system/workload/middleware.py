@@ -1,5 +1,14 @@
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
 from django.shortcuts import redirect
 from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .instrumentation import QueryRecorder, RequestRecord, get_buffer, server_timing_header
 
 
 class EnforceRootLoginMiddleware:
@@ -10,12 +19,104 @@ class EnforceRootLoginMiddleware:
     proceed normally.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
         # Only enforce for the root path
         if request.path == '/' and not request.user.is_authenticated:
             return redirect(f"{settings.LOGIN_URL}?next=/")
 
         return self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.path == '/' and not (await request.auser()).is_authenticated:
+            return redirect(f"{settings.LOGIN_URL}?next=/")
+
+        return await self.get_response(request)
+
+
+class InstrumentationMiddleware:
+    """Record per-request query count, SQL time, duplicate queries and view time.
+
+    Place it first in MIDDLEWARE so `total` covers every other middleware;
+    `view` runs from process_view until the response comes back. For
+    streaming responses the time spent sending the body is not included.
+    Sync and async capable, so under ASGI it does not force the async
+    views through a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'WORKLOAD_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'WORKLOAD_SERVER_TIMING', False)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            self.record_queries(stack, recorder)
+            response = self.get_response(request)
+        return self.finish(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        # the ORM runs in the request's sync_to_async thread, whose connections
+        # are not the event loop thread's: hook them there
+        stack = ExitStack()
+        await sync_to_async(self.record_queries)(stack, recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, recorder, started)
+
+    def record_queries(self, stack, recorder):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+
+    def finish(self, request, response, recorder, started):
+        finished = time.perf_counter()
+        view_started = getattr(request, '_instrumentation_view_started', None)
+        duplicates, top_duplicate = recorder.duplicates()
+        match = request.resolver_match
+        record = RequestRecord(
+            url_name=(match.view_name if match else None) or request.path,
+            path=request.path,
+            method=request.method,
+            status=response.status_code,
+            total_ms=(finished - started) * 1000,
+            view_ms=(finished - view_started) * 1000 if view_started else None,
+            sql_ms=recorder.sql_seconds * 1000,
+            queries=recorder.queries,
+            duplicates=duplicates,
+            top_duplicate=top_duplicate,
+            timestamp=time.time(),
+        )
+        get_buffer().append(record)
+
+        if self.server_timing:
+            response['Server-Timing'] = server_timing_header(record)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._instrumentation_view_started = time.perf_counter()
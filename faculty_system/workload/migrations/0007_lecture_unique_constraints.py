@@ -0,0 +1,75 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_existing_clashes(apps, schema_editor):
+    """Stop with a readable report instead of an IntegrityError from the DB."""
+    Lecture = apps.get_model('workload', 'Lecture')
+
+    problems = []
+    missing_slot = list(Lecture.objects.filter(time_slot__isnull=True).values_list('id', flat=True))
+    if missing_slot:
+        problems.append(f"lectures without a time slot: ids {missing_slot}")
+
+    for fields in (('faculty_id', 'day', 'time_slot_id'), ('division', 'day', 'time_slot_id')):
+        duplicates = (
+            Lecture.objects.filter(time_slot__isnull=False)
+            .values(*fields)
+            .annotate(n=Count('id'))
+            .filter(n__gt=1)
+        )
+        for row in duplicates:
+            ids = list(Lecture.objects.filter(**{f: row[f] for f in fields}).values_list('id', flat=True))
+            problems.append(f"{fields[0].replace('_id', '')} clash on {row['day']}: lecture ids {ids}")
+
+    if problems:
+        raise RuntimeError(
+            "Fix these lectures in the admin before migrating:\n  " + "\n  ".join(problems)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workload', '0006_time_slot_duration'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_existing_clashes, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='lecture',
+            name='time_slot',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='workload.timeslot'),
+        ),
+        migrations.AlterField(
+            model_name='timeslot',
+            name='display_name',
+            field=models.CharField(help_text='Choose the displayed time range, for example: 2:00 pm to 4:00 pm.', max_length=50, verbose_name='Time range'),
+        ),
+        migrations.AlterField(
+            model_name='timeslot',
+            name='duration_hours',
+            field=models.IntegerField(default=1, help_text='How many lecture hours this slot represents. Use 2 for a 2-hour practical.', verbose_name='Duration (hours)'),
+        ),
+        migrations.AlterField(
+            model_name='timeslot',
+            name='slot_key',
+            field=models.CharField(blank=True, help_text='Optional system code; leave blank to auto-generate from the time range.', max_length=20, unique=True, verbose_name='Internal code'),
+        ),
+        migrations.AlterField(
+            model_name='timeslot',
+            name='sort_order',
+            field=models.IntegerField(default=0, help_text='Lower numbers appear earlier in the timetable.', verbose_name='Display order'),
+        ),
+        migrations.AddConstraint(
+            model_name='lecture',
+            constraint=models.UniqueConstraint(fields=('faculty', 'day', 'time_slot'), name='unique_faculty_day_time_slot', violation_error_message='❌ Lecture Clash! Faculty already has lecture at this time.'),
+        ),
+        migrations.AddConstraint(
+            model_name='lecture',
+            constraint=models.UniqueConstraint(fields=('division', 'day', 'time_slot'), name='unique_division_day_time_slot', violation_error_message='❌ Lecture Clash! Division already has lecture at this time.'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:15
+
+import django.db.models.deletion
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def fill_workload(apps, schema_editor):
+    Faculty = apps.get_model('workload', 'Faculty')
+    Lecture = apps.get_model('workload', 'Lecture')
+    FacultyWorkload = apps.get_model('workload', 'FacultyWorkload')
+
+    by_day = defaultdict(dict)
+    by_division = defaultdict(dict)
+    totals = defaultdict(int)
+    grouped = (
+        Lecture.objects.values_list('faculty_id', 'division', 'day')
+        .annotate(hours=Sum('time_slot__duration_hours'))
+        .order_by()
+    )
+    for faculty_id, division, day, hours in grouped:
+        hours = int(hours or 0)
+        totals[faculty_id] += hours
+        by_day[faculty_id][day] = by_day[faculty_id].get(day, 0) + hours
+        by_division[faculty_id][division] = by_division[faculty_id].get(division, 0) + hours
+
+    FacultyWorkload.objects.bulk_create([
+        FacultyWorkload(
+            faculty_id=faculty_id,
+            total_hours=totals[faculty_id],
+            hours_by_day=by_day[faculty_id],
+            hours_by_division=by_division[faculty_id],
+            is_overloaded=totals[faculty_id] > max_hours,
+        )
+        for faculty_id, max_hours in Faculty.objects.values_list('id', 'max_hours')
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workload', '0008_user_session'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacultyWorkload',
+            fields=[
+                ('faculty', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='workload', serialize=False, to='workload.faculty')),
+                ('total_hours', models.IntegerField(default=0)),
+                ('hours_by_day', models.JSONField(default=dict)),
+                ('hours_by_division', models.JSONField(default=dict)),
+                ('is_overloaded', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-total_hours', 'faculty'],
+                'indexes': [models.Index(fields=['-total_hours', 'faculty'], name='facultyworkload_hours_idx')],
+            },
+        ),
+        migrations.RunPython(fill_workload, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workload', '0009_faculty_workload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='faculty',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='subject',
+            name='subject_name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workload', '0010_name_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Room',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('room_type', models.CharField(choices=[('classroom', 'Classroom'), ('lab', 'Laboratory'), ('seminar', 'Seminar hall')], default='classroom', max_length=20)),
+                ('capacity', models.PositiveIntegerField(help_text='Number of students the room seats.')),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='lecture',
+            name='room',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='lectures', to='workload.room'),
+        ),
+        migrations.AddConstraint(
+            model_name='lecture',
+            constraint=models.UniqueConstraint(condition=models.Q(('room__isnull', False)), fields=('room', 'day', 'time_slot'), name='unique_room_day_time_slot', violation_error_message='❌ Lecture Clash! Room is already booked at this time.'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations, models
+
+
+# start and end minutes of the default slots (see DEFAULT_TIME_SLOTS)
+DEFAULT_SLOT_MINUTES = {
+    '9-10': (540, 600),
+    '10-11': (600, 660),
+    '11:15-12:15': (675, 735),
+    '12:15-1:15': (735, 795),
+    '2-3': (840, 900),
+    '2-4': (840, 960),
+    '3-4': (900, 960),
+}
+
+
+def backfill_minutes(apps, schema_editor):
+    from workload.slots import parse_time_range
+
+    TimeSlot = apps.get_model('workload', 'TimeSlot')
+    for slot in TimeSlot.objects.all():
+        interval = (
+            parse_time_range(slot.display_name)
+            or DEFAULT_SLOT_MINUTES.get(slot.slot_key)
+            or parse_time_range(slot.slot_key)
+        )
+        if interval:
+            slot.start_minute, slot.end_minute = interval
+            slot.save(update_fields=['start_minute', 'end_minute'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workload', '0011_room'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeslot',
+            name='start_minute',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='timeslot',
+            name='end_minute',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_minutes, reverse_code=migrations.RunPython.noop),
+    ]
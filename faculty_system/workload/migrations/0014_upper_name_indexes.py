@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:54
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workload', '0013_timetable_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='faculty_name_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(django.db.models.functions.text.Upper('department'), name='faculty_department_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='room_name_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subject',
+            index=models.Index(django.db.models.functions.text.Upper('subject_name'), name='subject_name_upper_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:17
+
+import workload.models
+from django.db import migrations, models
+
+
+def fill_calendar_keys(apps, schema_editor):
+    # AddField evaluates the default once, so existing rows would share a key
+    Faculty = apps.get_model('workload', 'Faculty')
+    for faculty in Faculty.objects.only('pk'):
+        Faculty.objects.filter(pk=faculty.pk).update(calendar_key=workload.models.new_calendar_key())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workload', '0014_upper_name_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='faculty',
+            name='calendar_key',
+            field=models.CharField(default=workload.models.new_calendar_key, editable=False, max_length=32),
+        ),
+        migrations.RunPython(fill_calendar_keys, reverse_code=migrations.RunPython.noop),
+    ]
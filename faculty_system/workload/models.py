@@ -1,7 +1,14 @@
+import secrets
+
+from django.conf import settings
 from django.db import models
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Cast, Coalesce, NullIf, Round, Upper
 from django.core.exceptions import ValidationError
 from django.utils.text import slugify
 
+from .slots import parse_time_range
+
 
 # ===============================
 #  TIME SLOT DEFINITIONS
@@ -68,6 +75,9 @@ class TimeSlot(models.Model):
         verbose_name='Display order',
         help_text='Lower numbers appear earlier in the timetable.',
     )
+    # parsed from display_name on save; minutes from midnight
+    start_minute = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    end_minute = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ['sort_order']
@@ -75,7 +85,23 @@ class TimeSlot(models.Model):
     def __str__(self):
         return self.display_name
 
+    @property
+    def interval(self):
+        """`(start, end)` minutes from midnight, or None when the range is unknown."""
+        if self.start_minute is None or self.end_minute is None:
+            return None
+        return self.start_minute, self.end_minute
+
+    def clean(self):
+        if self.display_name and parse_time_range(self.display_name) is None:
+            raise ValidationError({'display_name': 'Use a time range such as "2:00 pm to 4:00 pm".'})
+
     def save(self, *args, **kwargs):
+        interval = parse_time_range(self.display_name) or parse_time_range(self.slot_key)
+        self.start_minute, self.end_minute = interval or (None, None)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'display_name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'start_minute', 'end_minute'}
         if not self.slot_key and self.display_name:
             base_slug = slugify(self.display_name)
             candidate = base_slug
@@ -90,10 +116,65 @@ class TimeSlot(models.Model):
 # ===============================
 #  Faculty Table
 # ===============================
+STATUS_NORMAL = 'Normal'
+STATUS_OVERLOADED = 'Overloaded'
+
+
+class FacultyQuerySet(models.QuerySet):
+
+    def with_workload(self):
+        """Annotate `total_hours`, `load_pct` (of the faculty's own max_hours) and `status`.
+
+        Everything is computed in SQL from the FacultyWorkload table, so the
+        result can be filtered, ordered and sliced in the database.
+        """
+        if 'load_pct' in self.query.annotations:
+            return self
+        hours = Coalesce(F('workload__total_hours'), 0)
+        return self.annotate(
+            total_hours=hours,
+            load_pct=Coalesce(
+                Cast(Round(hours * 100.0 / NullIf(F('max_hours'), 0)), models.IntegerField()),
+                0,
+            ),
+            status=Case(
+                When(total_hours__gt=F('max_hours'), then=Value(STATUS_OVERLOADED)),
+                default=Value(STATUS_NORMAL),
+                output_field=models.CharField(),
+            ),
+        )
+
+    def overloaded(self):
+        return self.with_workload().filter(total_hours__gt=F('max_hours'))
+
+    def by_load(self):
+        """Most loaded first, relative to each faculty's own max_hours."""
+        return self.with_workload().order_by('-load_pct', '-total_hours', 'name')
+
+    def most_overloaded(self, limit=20):
+        return self.overloaded().by_load()[:limit]
+
+
+def new_calendar_key():
+    return secrets.token_hex(16)
+
+
 class Faculty(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)
     department = models.CharField(max_length=100)
     max_hours = models.IntegerField()
+    # part of every calendar feed token (see workload.exports); a new key revokes old feed URLs
+    calendar_key = models.CharField(max_length=32, default=new_calendar_key, editable=False)
+
+    objects = FacultyQuerySet.as_manager()
+
+    class Meta:
+        # UPPER() expression indexes serve the admin's case-insensitive
+        # prefix search and autocomplete (see workload.admin.prefix_search)
+        indexes = [
+            models.Index(Upper('name'), name='faculty_name_upper_idx'),
+            models.Index(Upper('department'), name='faculty_department_upper_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -103,14 +184,48 @@ class Faculty(models.Model):
 #  Subject Table
 # ===============================
 class Subject(models.Model):
-    subject_name = models.CharField(max_length=100)
+    subject_name = models.CharField(max_length=100, db_index=True)
     semester = models.IntegerField()
     credit_hours = models.IntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(Upper('subject_name'), name='subject_name_upper_idx'),
+        ]
+
     def __str__(self):
         return self.subject_name
 
 
+# ===============================
+#  Room Table
+# ===============================
+ROOM_CLASSROOM = 'classroom'
+ROOM_LAB = 'lab'
+ROOM_SEMINAR = 'seminar'
+
+ROOM_TYPE_CHOICES = [
+    (ROOM_CLASSROOM, 'Classroom'),
+    (ROOM_LAB, 'Laboratory'),
+    (ROOM_SEMINAR, 'Seminar hall'),
+]
+
+
+class Room(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    room_type = models.CharField(max_length=20, choices=ROOM_TYPE_CHOICES, default=ROOM_CLASSROOM)
+    capacity = models.PositiveIntegerField(help_text='Number of students the room seats.')
+
+    class Meta:
+        ordering = ['name']
+        indexes = [
+            models.Index(Upper('name'), name='room_name_upper_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
 # ===============================
 #  Lecture Allocation Table
 # ===============================
@@ -122,6 +237,31 @@ class Lecture(models.Model):
 
     day = models.CharField(max_length=20, choices=DAY_CHOICES)
     time_slot = models.ForeignKey(TimeSlot, on_delete=models.PROTECT)
+    room = models.ForeignKey(Room, on_delete=models.SET_NULL, null=True, blank=True, related_name='lectures')
+
+    class Meta:
+        # The unique indexes behind these constraints also serve the
+        # (faculty, day) and (division, day, time_slot) lookups of the
+        # dashboard, the PDF export and the faculty admin, so no separate
+        # composite indexes are declared.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['faculty', 'day', 'time_slot'],
+                name='unique_faculty_day_time_slot',
+                violation_error_message="❌ Lecture Clash! Faculty already has lecture at this time.",
+            ),
+            models.UniqueConstraint(
+                fields=['division', 'day', 'time_slot'],
+                name='unique_division_day_time_slot',
+                violation_error_message="❌ Lecture Clash! Division already has lecture at this time.",
+            ),
+            models.UniqueConstraint(
+                fields=['room', 'day', 'time_slot'],
+                condition=models.Q(room__isnull=False),
+                name='unique_room_day_time_slot',
+                violation_error_message="❌ Lecture Clash! Room is already booked at this time.",
+            ),
+        ]
 
     # ===============================
     #  🔥 CLASH VALIDATION (NEW CODE)
@@ -142,16 +282,76 @@ class Lecture(models.Model):
         if errors:
             raise ValidationError(errors)
 
-        clash = Lecture.objects.filter(
-            faculty=self.faculty,
-            day=self.day,
-            time_slot=self.time_slot
-        ).exclude(id=self.id)
+        # Bookings of the very same slot are enforced by the unique
+        # constraints in Meta; full_clean() reports them through
+        # validate_constraints(). Overlapping slots (a 2-4 practical against
+        # 2-3 or 3-4) are caught here.
+        from .clashes import lecture_clashes
+
+        messages = lecture_clashes(self)
+        if messages:
+            raise ValidationError(messages)
+
+    def __str__(self):
+        return f"{self.faculty} - {self.subject} ({self.division})"
+
+
+# ===============================
+#  Login Session Table
+#  (user -> session key, so other sessions can be revoked with one DELETE)
+# ===============================
+class UserSession(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='login_sessions')
+    session_key = models.CharField(max_length=40, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user} ({self.session_key[:8]}…)"
 
-        if clash.exists():
-            raise ValidationError(
-                {'__all__': "❌ Lecture Clash! Faculty already has lecture at this time."}
-            )
+
+# ===============================
+#  Faculty Workload Table
+#  (kept current from Lecture changes by workload.materialized)
+# ===============================
+class FacultyWorkload(models.Model):
+    faculty = models.OneToOneField(Faculty, on_delete=models.CASCADE, primary_key=True, related_name='workload')
+    total_hours = models.IntegerField(default=0)
+    hours_by_day = models.JSONField(default=dict)
+    hours_by_division = models.JSONField(default=dict)
+    is_overloaded = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-total_hours', 'faculty']
+        indexes = [
+            models.Index(fields=['-total_hours', 'faculty'], name='facultyworkload_hours_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.faculty} ({self.total_hours}h)"
+
+
+# ===============================
+#  Timetable Snapshot Table
+#  (one published division week, packed by workload.snapshots)
+# ===============================
+class TimetableSnapshot(models.Model):
+    division = models.CharField(max_length=2, choices=DIVISION_CHOICES)
+    label = models.CharField(max_length=100, blank=True)
+    content_hash = models.CharField(max_length=64)
+    data = models.BinaryField()
+    lecture_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+    )
+
+    class Meta:
+        ordering = ['-pk']
+        indexes = [
+            models.Index(fields=['division', '-id'], name='timetablesnapshot_div_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.faculty} - {self.subject} ({self.division})"
\ No newline at end of file
+        label = f" {self.label}" if self.label else ''
+        return f"Division {self.division}{label} ({self.created_at:%Y-%m-%d %H:%M}, {self.content_hash[:8]})"
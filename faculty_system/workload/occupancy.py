@@ -0,0 +1,196 @@
+import threading
+from collections import defaultdict
+
+from . import cache
+from .models import Faculty, Lecture, Room
+from .slots import overlap_map
+from .timetable import DAYS, get_timeslots
+
+
+# ===============================
+# ⭐ In-memory occupancy index
+#
+#    Each faculty, division and room gets one integer bitmask for the week:
+#    bit (day_index * number_of_slots + slot_index) is set when a lecture
+#    sits in that cell. A clash check is then a single AND against the
+#    "cover" mask of the cell, which also holds every overlapping slot of the
+#    same day (a 2-4 practical covers 2-3 and 3-4).
+#
+#    The shared index returned by `get_index()` is built from the database in
+#    one pass and tagged with the cache versions of the tables it reads
+#    (`workload.cache`). Those versions are bumped on commit by every worker,
+#    so a change made anywhere makes the next `get_index()` rebuild it. The
+#    database stays the authority for a single save; the index is for bulk
+#    checks and read-only lookups.
+# ===============================
+KINDS = ('faculty', 'division', 'room')
+INDEX_TABLES = ('lecture', 'faculty', 'timeslot', 'room')
+
+
+class OccupancyIndex:
+
+    def __init__(self, timeslots, days=None):
+        self.days = list(days or DAYS)
+        self.timeslots = list(timeslots)
+        self.width = len(self.timeslots)
+        self.day_pos = {day: i for i, day in enumerate(self.days)}
+        self.slot_pos = {slot.id: i for i, slot in enumerate(self.timeslots)}
+
+        # slot id -> mask (within one day) of every slot it overlaps
+        overlaps = overlap_map(self.timeslots)
+        self.slot_cover = {
+            slot_id: sum(1 << self.slot_pos[other] for other in others)
+            for slot_id, others in overlaps.items()
+        }
+
+        self.masks = {kind: defaultdict(int) for kind in KINDS}
+        self.members = {kind: defaultdict(set) for kind in KINDS}
+        self.placements = {}
+        self.faculty_ids = set()
+        # room id -> (room_type, capacity), for free_rooms()
+        self.rooms = {}
+        # cache versions of INDEX_TABLES the shared index was built from
+        self.versions = None
+        self.lock = threading.RLock()
+
+    @classmethod
+    def from_db(cls, versions=None):
+        """Build an index from every stored lecture in a single pass."""
+        index = cls(get_timeslots())
+        index.versions = versions
+        index.faculty_ids.update(Faculty.objects.values_list('id', flat=True))
+        index.rooms.update(
+            (room_id, (room_type, capacity))
+            for room_id, room_type, capacity in Room.objects.values_list('id', 'room_type', 'capacity')
+        )
+        rows = Lecture.objects.values_list('id', 'faculty_id', 'division', 'day', 'time_slot_id', 'room_id')
+        for lecture_id, faculty_id, division, day, slot_id, room_id in rows.iterator(chunk_size=2000):
+            index.add(lecture_id, faculty_id, division, day, slot_id, room_id)
+        return index
+
+    # ===============================
+    # ⭐ Bit helpers
+    # ===============================
+    def bit(self, day, slot_id):
+        return 1 << (self.day_pos[day] * self.width + self.slot_pos[slot_id])
+
+    def cover(self, day, slot_id):
+        """Mask of the cell and every overlapping cell on the same day."""
+        return self.slot_cover[slot_id] << (self.day_pos[day] * self.width)
+
+    def knows(self, day, slot_id):
+        return day in self.day_pos and slot_id in self.slot_pos
+
+    # ===============================
+    # ⭐ Updates
+    # ===============================
+    @staticmethod
+    def _keys(faculty_id, division, room_id):
+        keys = [('faculty', faculty_id), ('division', division)]
+        if room_id is not None:
+            keys.append(('room', room_id))
+        return keys
+
+    def add(self, lecture_id, faculty_id, division, day, slot_id, room_id=None):
+        if not self.knows(day, slot_id):
+            return
+        with self.lock:
+            if lecture_id in self.placements:
+                self.remove(lecture_id)
+            bit = self.bit(day, slot_id)
+            self.placements[lecture_id] = (faculty_id, division, day, slot_id, room_id)
+            for kind, key in self._keys(faculty_id, division, room_id):
+                self.masks[kind][key] |= bit
+                self.members[kind][key].add(lecture_id)
+            self.faculty_ids.add(faculty_id)
+
+    def remove(self, lecture_id):
+        with self.lock:
+            placement = self.placements.pop(lecture_id, None)
+            if placement is None:
+                return
+            faculty_id, division, _, _, room_id = placement
+            for kind, key in self._keys(faculty_id, division, room_id):
+                self.members[kind][key].discard(lecture_id)
+                # rebuild rather than clear the bit: clashing legacy rows may share it
+                self.masks[kind][key] = self._mask_of(self.members[kind][key])
+
+    def _mask_of(self, lecture_ids, exclude=None):
+        mask = 0
+        for lecture_id in lecture_ids:
+            if lecture_id != exclude:
+                _, _, day, slot_id, _ = self.placements[lecture_id]
+                mask |= self.bit(day, slot_id)
+        return mask
+
+    def mask(self, kind, key, exclude=None):
+        if exclude is not None and exclude in self.members[kind].get(key, ()):
+            return self._mask_of(self.members[kind][key], exclude=exclude)
+        return self.masks[kind].get(key, 0)
+
+    # ===============================
+    # ⭐ Queries
+    # ===============================
+    def is_free(self, kind, key, day, slot_id, exclude=None):
+        return not self.mask(kind, key, exclude) & self.cover(day, slot_id)
+
+    def clashes(self, faculty_id, division, day, slot_id, exclude=None, room_id=None):
+        """Return the kinds ('faculty', 'division', 'room') that are already booked."""
+        return [
+            kind for kind, key in self._keys(faculty_id, division, room_id)
+            if not self.is_free(kind, key, day, slot_id, exclude)
+        ]
+
+    def free_cells(self, kind, key, day=None):
+        """List the `(day, slot)` cells where `key` has nothing overlapping."""
+        mask = self.mask(kind, key)
+        days = [day] if day else self.days
+        return [
+            (d, slot)
+            for d in days
+            for slot in self.timeslots
+            if not mask & self.cover(d, slot.id)
+        ]
+
+    def free_faculty(self, day, slot_id):
+        """Ids of faculties with nothing overlapping `(day, slot_id)`."""
+        cover = self.cover(day, slot_id)
+        masks = self.masks['faculty']
+        return [faculty_id for faculty_id in self.faculty_ids if not masks.get(faculty_id, 0) & cover]
+
+    def free_rooms(self, day, slot_id, room_type=None, min_capacity=0):
+        """Ids of rooms of `room_type` seating `min_capacity` with nothing overlapping."""
+        cover = self.cover(day, slot_id)
+        masks = self.masks['room']
+        return [
+            room_id for room_id, (kind, capacity) in self.rooms.items()
+            if (room_type is None or kind == room_type) and capacity >= min_capacity
+            and not masks.get(room_id, 0) & cover
+        ]
+
+
+# ===============================
+# ⭐ Shared per-process index
+# ===============================
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """The shared index, rebuilt when any table it reads has changed since it was built."""
+    global _index
+    # read before the rows, so a change committed during the build only causes another rebuild
+    versions = cache.table_versions(*INDEX_TABLES)
+    index = _index
+    if index is None or index.versions != versions:
+        with _index_lock:
+            if _index is None or _index.versions != versions:
+                _index = OccupancyIndex.from_db(versions)
+            index = _index
+    return index
+
+
+def invalidate_index():
+    global _index
+    with _index_lock:
+        _index = None
@@ -0,0 +1,209 @@
+import io
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, PageBreak
+
+
+# ===============================
+# ⭐ Timetable PDF rendering
+#
+#    Pages are rendered from a plain "spec" dict (title, days, rows of cell
+#    text) rather than from model instances, so the same spec can be sent
+#    to a worker process and rendered there without touching the database.
+# ===============================
+PAGE_SIZE = landscape(letter)
+MARGIN = 0.4 * inch
+FIRST_COL_WIDTH = 1.45 * inch
+
+
+@lru_cache(maxsize=None)
+def get_styles():
+    """Paragraph styles shared by every page; built once per process."""
+    styles = getSampleStyleSheet()
+    return {
+        # Simple title style
+        'title': ParagraphStyle(
+            'Title',
+            parent=styles['Normal'],
+            fontSize=16,
+            textColor=colors.HexColor('#1e3a8a'),
+            spaceAfter=12,
+            alignment=1,
+            fontName='Helvetica-Bold',
+        ),
+        # Styles aligned with dashboard timetable content hierarchy
+        'header': ParagraphStyle(
+            'HeaderCell',
+            parent=styles['Normal'],
+            fontSize=10,
+            leading=12,
+            alignment=1,
+            fontName='Helvetica-Bold',
+            textColor=colors.HexColor('#111827'),
+        ),
+        'time': ParagraphStyle(
+            'TimeCell',
+            parent=styles['Normal'],
+            fontSize=9.5,
+            leading=11,
+            alignment=0,
+            fontName='Helvetica-Bold',
+            textColor=colors.HexColor('#111827'),
+        ),
+        'lecture': ParagraphStyle(
+            'LectureCell',
+            parent=styles['Normal'],
+            fontSize=9,
+            leading=11,
+            alignment=1,
+            fontName='Helvetica',
+            textColor=colors.HexColor('#111827'),
+            wordWrap='CJK',
+        ),
+        'break': ParagraphStyle(
+            'BreakCell',
+            parent=styles['Normal'],
+            fontSize=11,
+            leading=13,
+            alignment=1,
+            fontName='Helvetica-Bold',
+            textColor=colors.HexColor('#111827'),
+        ),
+    }
+
+
+BASE_TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#cfd6df')),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+    ('GRID', (0, 0), (-1, -1), 0.8, colors.HexColor('#1f2937')),
+    ('LEFTPADDING', (0, 0), (-1, -1), 6),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+]
+
+
+# ===============================
+# ⭐ Grid -> spec
+# ===============================
+def division_cell(lecture):
+    return (
+        lecture.subject.subject_name if lecture.subject else '-',
+        lecture.faculty.name if lecture.faculty else '-',
+    )
+
+
+def faculty_cell(lecture):
+    return (
+        lecture.subject.subject_name if lecture.subject else '-',
+        f"Division {lecture.division}",
+    )
+
+
+def covered_cell(lecture):
+    """An empty cell taken by a lecture in an overlapping slot (a 2-4 practical)."""
+    return (
+        lecture.subject.subject_name if lecture.subject else '-',
+        f"({lecture.time_slot.display_name})",
+    )
+
+
+def grid_spec(grid, title, cell_text=division_cell):
+    """Turn a `TimetableGrid` into a picklable page spec."""
+    rows = []
+    for row in grid.rows:
+        if row['type'] == 'lecture':
+            rows.append({
+                'type': 'lecture',
+                'label': row['label'],
+                'cells': [
+                    cell_text(lecture) if lecture else covered_cell(covered) if covered else None
+                    for lecture, covered in row['entries']
+                ],
+            })
+        else:
+            rows.append({'type': row['type'], 'label': row['label'], 'title': row['title']})
+    return {'title': title, 'days': list(grid.days), 'rows': rows}
+
+
+# ===============================
+# ⭐ Spec -> flowables / PDF
+# ===============================
+def build_story(spec):
+    styles = get_styles()
+    days = spec['days']
+
+    story = [Paragraph(escape(spec['title']), styles['title'])]
+
+    grid_data = [[Paragraph('DAY / TIME', styles['header'])] + [Paragraph(day.upper(), styles['header']) for day in days]]
+    break_row_indices = []
+
+    for row in spec['rows']:
+        if row['type'] == 'lecture':
+            table_row = [Paragraph(escape(row['label']), styles['time'])]
+            for cell in row['cells']:
+                if cell:
+                    main, sub = cell
+                    cell_text = f"<b>{escape(main)}</b><br/><font size='8' color='#6b7280'>{escape(sub)}</font>"
+                else:
+                    cell_text = "-"
+                table_row.append(Paragraph(cell_text, styles['lecture']))
+            grid_data.append(table_row)
+        else:
+            break_row_indices.append(len(grid_data))
+            grid_data.append([
+                Paragraph(escape(row['label']), styles['time']),
+                Paragraph(escape(row['title']), styles['break']),
+            ] + [''] * (len(days) - 1))
+
+    # Set column widths to keep all text inside cells like dashboard
+    day_col_width = ((PAGE_SIZE[0] - (MARGIN * 2)) - FIRST_COL_WIDTH) / len(days)
+    grid_table = Table(grid_data, colWidths=[FIRST_COL_WIDTH] + [day_col_width] * len(days))
+
+    table_style = list(BASE_TABLE_STYLE)
+    for row_index in break_row_indices:
+        table_style.extend([
+            ('SPAN', (1, row_index), (-1, row_index)),
+            ('ALIGN', (1, row_index), (-1, row_index), 'CENTER'),
+        ])
+
+    grid_table.setStyle(TableStyle(table_style))
+    grid_table.repeatRows = 1
+
+    story.append(grid_table)
+    return story
+
+
+def render(specs, out):
+    """Render one or more specs into `out` (a file-like object), one page each."""
+    doc = SimpleDocTemplate(
+        out,
+        pagesize=PAGE_SIZE,
+        rightMargin=MARGIN,
+        leftMargin=MARGIN,
+        topMargin=MARGIN,
+        bottomMargin=MARGIN,
+    )
+
+    story = []
+    for spec in specs:
+        if story:
+            story.append(PageBreak())
+        story.extend(build_story(spec))
+    doc.build(story)
+
+
+def render_bytes(spec):
+    """Render a single spec to PDF bytes (picklable entry point for worker pools)."""
+    buffer = io.BytesIO()
+    render([spec], buffer)
+    return buffer.getvalue()
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+
+# ===============================
+# ⭐ Content-addressed PDF cache
+#
+#    A rendered timetable is stored on disk under a hash of its page spec,
+#    i.e. of exactly the lecture data and slot layout that went into it.
+#    The hash doubles as the ETag. Files are named '<scope>-<hash>.pdf' so
+#    every entry of one division can be dropped when its lectures change.
+#    The file's mtime is when it was rendered (served as Last-Modified) and
+#    its atime is bumped on every hit; the least recently used files are
+#    evicted once the directory grows past the size cap.
+# ===============================
+RENDER_VERSION = 1
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def cache_dir():
+    path = Path(getattr(settings, 'WORKLOAD_PDF_CACHE_DIR', Path(tempfile.gettempdir()) / 'workload_pdf_cache'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def spec_digest(spec):
+    payload = json.dumps([RENDER_VERSION, spec], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _path(scope, digest):
+    return cache_dir() / f"{scope}-{digest}.pdf"
+
+
+def lookup(scope, digest):
+    """Return the cached file path (marking it as recently used) or None."""
+    path = _path(scope, digest)
+    try:
+        stat = path.stat()
+        os.utime(path, (time.time(), stat.st_mtime))
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def store(scope, digest, content):
+    path = _path(scope, digest)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as handle:
+        handle.write(content)
+    os.replace(tmp, path)
+    evict()
+    return path
+
+
+def get_or_render(scope, spec, render):
+    """Return `(path, digest)`, calling `render(spec) -> bytes` only on a miss."""
+    digest = spec_digest(spec)
+    path = lookup(scope, digest)
+    if path is None:
+        path = store(scope, digest, render(spec))
+    return path, digest
+
+
+def last_modified(scope, digest):
+    try:
+        return _path(scope, digest).stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def evict(max_bytes=None):
+    """Delete least recently used files until the cache fits in `max_bytes`."""
+    if max_bytes is None:
+        max_bytes = getattr(settings, 'WORKLOAD_PDF_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+
+    entries = []
+    total = 0
+    for path in cache_dir().glob('*.pdf'):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_atime, stat.st_size, path))
+        total += stat.st_size
+
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def invalidate(scope=None):
+    """Drop every cached file of `scope` (or the whole cache)."""
+    pattern = f"{scope}-*.pdf" if scope else '*.pdf'
+    for path in cache_dir().glob(pattern):
+        path.unlink(missing_ok=True)
+
+
+def division_scope(division):
+    return f"division-{division}"
@@ -0,0 +1,231 @@
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import cache, events, pdf_cache
+from .materialized import apply_delta, lecture_placement, rebuild_workload, refresh_overload
+from .models import Faculty, FacultyWorkload, Subject, Lecture, Room, TimeSlot, UserSession
+
+
+# ===============================
+# ⭐ Any change -> bump that table's cache version
+#    This is also what tells every worker's occupancy index to rebuild.
+# ===============================
+def bump_table_version(sender, raw=False, **kwargs):
+    if raw:
+        return
+    table = sender._meta.model_name
+    transaction.on_commit(lambda: cache.bump(table))
+
+
+for model in (Lecture, Faculty, Subject, TimeSlot, Room):
+    post_save.connect(bump_table_version, sender=model, dispatch_uid=f'workload_bump_{model._meta.model_name}_saved')
+    post_delete.connect(bump_table_version, sender=model, dispatch_uid=f'workload_bump_{model._meta.model_name}_deleted')
+
+
+# ===============================
+# ⭐ Lecture / TimeSlot / Faculty changes -> FacultyWorkload
+#    Applied right away so the workload commits (or rolls back) together
+#    with the change that caused it.
+# ===============================
+@receiver(pre_save, sender=Lecture)
+def lecture_before_save(sender, instance, raw=False, **kwargs):
+    instance._workload_before = None if raw or not instance.pk else lecture_placement(instance.pk)
+
+
+@receiver(post_save, sender=Lecture)
+def lecture_workload_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, '_workload_before', None)
+    after = (instance.faculty_id, instance.division, instance.day, instance.time_slot.duration_hours)
+    if before == after:
+        return
+    if before:
+        faculty_id, division, day, hours = before
+        apply_delta(faculty_id, division, day, -(hours or 0))
+    apply_delta(*after)
+
+
+@receiver(post_delete, sender=Lecture)
+def lecture_workload_deleted(sender, instance, **kwargs):
+    apply_delta(instance.faculty_id, instance.division, instance.day, -instance.time_slot.duration_hours)
+
+
+@receiver(pre_save, sender=TimeSlot)
+def timeslot_before_save(sender, instance, raw=False, **kwargs):
+    instance._duration_before = None
+    if not raw and instance.pk:
+        instance._duration_before = (
+            TimeSlot.objects.filter(pk=instance.pk).values_list('duration_hours', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=TimeSlot)
+def timeslot_workload_saved(sender, instance, raw=False, **kwargs):
+    before = getattr(instance, '_duration_before', None)
+    if raw or before is None or before == instance.duration_hours:
+        return
+    faculty_ids = Lecture.objects.filter(time_slot=instance).values_list('faculty_id', flat=True).distinct()
+    rebuild_workload(faculty_ids)
+
+
+@receiver(post_save, sender=Faculty)
+def faculty_workload_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        FacultyWorkload.objects.get_or_create(faculty=instance)
+    else:
+        refresh_overload(instance)
+
+
+# ===============================
+# ⭐ Login -> remember the session mapping
+#    Every login (faculty pages, /admin/login/ or any other login() call)
+#    is recorded, so expire_other_sessions can revoke it later. The user's
+#    rows for sessions that have since expired are dropped on the way.
+# ===============================
+@receiver(user_logged_in)
+def user_logged_in_handler(sender, request, user, **kwargs):
+    session = getattr(request, 'session', None)
+    if session is None:
+        return
+    if session.session_key is None:
+        session.save()
+
+    live = Session.objects.filter(expire_date__gt=timezone.now()).values('session_key')
+    UserSession.objects.filter(user=user).exclude(session_key__in=live).delete()
+    UserSession.objects.update_or_create(session_key=session.session_key, defaults={'user': user})
+
+
+# ===============================
+# ⭐ Logout -> forget the session mapping
+# ===============================
+@receiver(user_logged_out)
+def user_logged_out_handler(sender, request, user, **kwargs):
+    session_key = getattr(getattr(request, 'session', None), 'session_key', None)
+    if session_key:
+        UserSession.objects.filter(session_key=session_key).delete()
+
+
+# ===============================
+# ⭐ Lecture / TimeSlot changes -> cached timetable PDFs
+# ===============================
+@receiver(post_save, sender=Lecture)
+def lecture_pdf_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    divisions = {instance.division}
+    before = getattr(instance, '_workload_before', None)
+    if before:
+        divisions.add(before[1])
+    for division in divisions:
+        scope = pdf_cache.division_scope(division)
+        transaction.on_commit(lambda scope=scope: pdf_cache.invalidate(scope))
+
+
+@receiver(post_delete, sender=Lecture)
+def lecture_pdf_deleted(sender, instance, **kwargs):
+    scope = pdf_cache.division_scope(instance.division)
+    transaction.on_commit(lambda: pdf_cache.invalidate(scope))
+
+
+@receiver([post_save, post_delete], sender=TimeSlot)
+def timeslot_pdf_changed(sender, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(pdf_cache.invalidate)
+
+
+# ===============================
+# ⭐ Lecture changes -> live dashboard events
+#    Published on commit; the payload is built only when someone listens.
+# ===============================
+def _publish_workload(faculty_ids):
+    rows = (
+        Faculty.objects.with_workload().filter(pk__in=faculty_ids)
+        .values('id', 'total_hours', 'load_pct', 'status')
+    )
+    for row in rows:
+        events.publish({'type': 'workload', 'faculty_id': row.pop('id'), **row})
+
+
+@receiver(post_save, sender=Lecture)
+def lecture_event_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, '_workload_before', None)
+
+    def publish():
+        if not events.get_broker().listening():
+            return
+        divisions = [instance.division]
+        if before and before[1] != instance.division:
+            divisions.append(before[1])
+        events.publish({
+            'type': 'lecture',
+            'action': 'added' if created or not before else 'changed',
+            'divisions': divisions,
+            'lecture': {
+                'id': instance.pk,
+                'division': instance.division,
+                'day': instance.day,
+                'slot': instance.time_slot.slot_key,
+                'subject': instance.subject.subject_name,
+                'faculty_id': instance.faculty_id,
+                'faculty': instance.faculty.name,
+            },
+        })
+        _publish_workload({instance.faculty_id, before[0]} if before else {instance.faculty_id})
+
+    transaction.on_commit(publish)
+
+
+@receiver(post_delete, sender=Lecture)
+def lecture_event_deleted(sender, instance, **kwargs):
+    lecture_id, division, faculty_id = instance.pk, instance.division, instance.faculty_id
+
+    def publish():
+        if not events.get_broker().listening():
+            return
+        events.publish({
+            'type': 'lecture',
+            'action': 'removed',
+            'divisions': [division],
+            'lecture': {'id': lecture_id, 'division': division},
+        })
+        _publish_workload({faculty_id})
+
+    transaction.on_commit(publish)
+
+
+def lectures_changed_in_bulk(faculty_ids=None):
+    """Call after bulk_create/bulk_update/queryset.update on `Lecture`.
+
+    Bulk paths do not send model signals, so everything derived from the
+    lecture table is refreshed here instead. Pass the ids of the faculties
+    whose lectures changed to limit the workload rebuild to them.
+    """
+    rebuild_workload(faculty_ids)
+    transaction.on_commit(lambda: cache.bump('lecture'))
+    # too many changes to describe one by one: open dashboards reload
+    transaction.on_commit(lambda: events.publish({'type': 'resync'}))
+
+
+def faculties_changed_in_bulk(faculty_ids=None):
+    """Call after bulk writes on `Faculty` (see `lectures_changed_in_bulk`)."""
+    rebuild_workload(faculty_ids)
+    transaction.on_commit(lambda: cache.bump('faculty'))
+
+
+def subjects_changed_in_bulk():
+    """Call after bulk writes on `Subject`."""
+    transaction.on_commit(lambda: cache.bump('subject'))
+
+
+def timeslots_changed_in_bulk():
+    """Call after bulk writes on `TimeSlot`."""
+    transaction.on_commit(lambda: cache.bump('timeslot'))
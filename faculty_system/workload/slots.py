@@ -0,0 +1,78 @@
+import re
+
+
+# ===============================
+# ⭐ Time range parsing
+#    '2:00 pm to 4:00 pm' -> (840, 960) minutes from midnight
+# ===============================
+_TIME_RE = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*([ap]\.?m\.?)?', re.IGNORECASE)
+
+
+def _to_minutes(hour, minute, meridiem):
+    hour = int(hour)
+    minute = int(minute or 0)
+    if meridiem:
+        meridiem = meridiem.lower().replace('.', '')
+        if meridiem == 'pm' and hour != 12:
+            hour += 12
+        elif meridiem == 'am' and hour == 12:
+            hour = 0
+    elif hour < 8:
+        # college day: '2-4' means 2 pm to 4 pm
+        hour += 12
+    return hour * 60 + minute
+
+
+def parse_time_range(text):
+    """Parse '2:00 pm to 4:00 pm' or '2-4' into `(start, end)` minutes, or None."""
+    if not text:
+        return None
+    parts = re.split(r'\s*(?:to|-|–)\s*', text.strip(), maxsplit=1)
+    if len(parts) != 2:
+        return None
+
+    start_match = _TIME_RE.fullmatch(parts[0].strip())
+    end_match = _TIME_RE.fullmatch(parts[1].strip())
+    if not start_match or not end_match:
+        return None
+
+    start_meridiem = start_match.group(3) or end_match.group(3)
+    start = _to_minutes(start_match.group(1), start_match.group(2), start_meridiem)
+    end = _to_minutes(*end_match.groups())
+    if start >= end and not start_match.group(3) and end_match.group(3):
+        # '11-12 pm' style: the start is still in the morning
+        start = _to_minutes(start_match.group(1), start_match.group(2), 'am')
+    if start >= end:
+        return None
+    return start, end
+
+
+def slot_interval(slot):
+    """Return the `(start, end)` minutes of a `TimeSlot`, or None when unknown.
+
+    Saved slots carry the minutes in `start_minute`/`end_minute`; the time
+    range is only parsed for unsaved or unparsed ones.
+    """
+    return getattr(slot, 'interval', None) or parse_time_range(slot.display_name) or parse_time_range(slot.slot_key)
+
+
+def overlap_map(timeslots):
+    """Map each slot id to the ids of every slot it overlaps (itself included).
+
+    The slots are swept in start order, so only slots that really overlap
+    are compared. Slots whose time range is unknown only overlap themselves.
+    """
+    overlaps = {slot.id: {slot.id} for slot in timeslots}
+    ordered = sorted(
+        (interval, slot.id)
+        for slot in timeslots
+        if (interval := slot_interval(slot)) is not None
+    )
+    running = []
+    for (start, end), slot_id in ordered:
+        running = [(other_end, other) for other_end, other in running if other_end > start]
+        for _, other in running:
+            overlaps[slot_id].add(other)
+            overlaps[other].add(slot_id)
+        running.append((end, slot_id))
+    return overlaps
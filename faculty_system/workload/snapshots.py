@@ -0,0 +1,245 @@
+import hashlib
+import sys
+from array import array
+from collections import defaultdict
+
+from django.db.models import Max
+
+from .bulk_ops import BulkOperationError, ChangeSet
+from .models import Faculty, Lecture, Room, Subject, TimeSlot, TimetableSnapshot, DIVISION_CHOICES
+from .timetable import DAYS
+
+
+# ===============================
+# ⭐ Timetable snapshots
+#
+#    A snapshot is one division's week packed into a flat array of unsigned
+#    32-bit integers, five per lecture:
+#        day index, time slot id, faculty id, subject id, room id (0 = none)
+#    sorted by (day, slot), stored little-endian with the SHA-256 of those
+#    bytes. Publishing reads every division with one query and only stores
+#    divisions whose hash differs from their latest snapshot; comparing two
+#    snapshots with the same hash costs nothing, and a real diff compares
+#    two small arrays cell by cell. Names are only looked up for the cells
+#    that changed.
+# ===============================
+FIELDS = 5
+DAY_INDEX = {day: position for position, day in enumerate(DAYS)}
+
+
+def pack(rows):
+    """Pack `(day_index, slot_id, faculty_id, subject_id, room_id)` rows into bytes."""
+    values = array('I')
+    for row in sorted(rows):
+        values.extend(row)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def unpack(data):
+    """Return `{(day_index, slot_id): (faculty_id, subject_id, room_id)}` from packed bytes."""
+    values = array('I')
+    values.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return {
+        (values[i], values[i + 1]): (values[i + 2], values[i + 3], values[i + 4])
+        for i in range(0, len(values), FIELDS)
+    }
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def capture(divisions=None):
+    """Pack the live timetable of `divisions` (default: all) with one query."""
+    divisions = list(divisions or [code for code, _ in DIVISION_CHOICES])
+    rows = defaultdict(list)
+    lectures = (
+        Lecture.objects.filter(division__in=divisions)
+        .values_list('division', 'day', 'time_slot_id', 'faculty_id', 'subject_id', 'room_id')
+        .iterator(chunk_size=2000)
+    )
+    for division, day, slot_id, faculty_id, subject_id, room_id in lectures:
+        if day in DAY_INDEX:
+            rows[division].append((DAY_INDEX[day], slot_id, faculty_id, subject_id, room_id or 0))
+    return {division: (pack(rows[division]), len(rows[division])) for division in divisions}
+
+
+def latest(divisions):
+    """`{division: latest TimetableSnapshot}` for the divisions that have one (two queries)."""
+    ids = (
+        TimetableSnapshot.objects.filter(division__in=divisions)
+        .values('division').annotate(latest=Max('id')).values_list('latest', flat=True)
+    )
+    return {snapshot.division: snapshot for snapshot in TimetableSnapshot.objects.filter(pk__in=list(ids))}
+
+
+def publish(divisions=None, label='', user=None):
+    """Snapshot every division whose timetable changed since its last snapshot.
+
+    Returns `{division: (snapshot, created)}`; an unchanged division maps to
+    its existing latest snapshot with `created` False.
+    """
+    captured = capture(divisions)
+    previous = latest(list(captured))
+    result = {}
+    for division, (data, count) in captured.items():
+        digest = content_hash(data)
+        if division in previous and previous[division].content_hash == digest:
+            result[division] = (previous[division], False)
+        else:
+            result[division] = (TimetableSnapshot(
+                division=division, label=label, content_hash=digest, data=data, lecture_count=count, created_by=user,
+            ), True)
+    TimetableSnapshot.objects.bulk_create([snapshot for snapshot, created in result.values() if created])
+    return result
+
+
+# ===============================
+# ⭐ Diff
+# ===============================
+class CellChange:
+    """One (day, slot) cell whose lecture was added, removed or changed."""
+
+    def __init__(self, day_index, slot_id, before, after):
+        self.day_index = day_index
+        self.slot_id = slot_id
+        self.before = before
+        self.after = after
+
+    @property
+    def kind(self):
+        if self.before is None:
+            return 'added'
+        if self.after is None:
+            return 'removed'
+        return 'changed'
+
+
+class TimetableDiff:
+
+    def __init__(self, division, changes):
+        self.division = division
+        self.changes = changes
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def __len__(self):
+        return len(self.changes)
+
+    def counts(self):
+        counts = {'added': 0, 'removed': 0, 'changed': 0}
+        for change in self.changes:
+            counts[change.kind] += 1
+        return counts
+
+    def rows(self):
+        """The changes with names instead of ids (one query per referenced table)."""
+        ids = defaultdict(set)
+        for change in self.changes:
+            ids['slot'].add(change.slot_id)
+            for cell in (change.before, change.after):
+                if cell:
+                    ids['faculty'].add(cell[0])
+                    ids['subject'].add(cell[1])
+                    ids['room'].add(cell[2])
+        names = {
+            'slot': dict(TimeSlot.objects.filter(pk__in=ids['slot']).values_list('pk', 'display_name')),
+            'faculty': dict(Faculty.objects.filter(pk__in=ids['faculty']).values_list('pk', 'name')),
+            'subject': dict(Subject.objects.filter(pk__in=ids['subject']).values_list('pk', 'subject_name')),
+            'room': dict(Room.objects.filter(pk__in=ids['room'] - {0}).values_list('pk', 'name')),
+        }
+
+        def describe(cell):
+            if cell is None:
+                return None
+            faculty_id, subject_id, room_id = cell
+            return {
+                'faculty': names['faculty'].get(faculty_id, f"#{faculty_id}"),
+                'subject': names['subject'].get(subject_id, f"#{subject_id}"),
+                'room': names['room'].get(room_id, f"#{room_id}") if room_id else None,
+            }
+
+        return [
+            {
+                'change': change.kind,
+                'day': DAYS[change.day_index] if change.day_index < len(DAYS) else change.day_index,
+                'slot': names['slot'].get(change.slot_id, f"#{change.slot_id}"),
+                'before': describe(change.before),
+                'after': describe(change.after),
+            }
+            for change in self.changes
+        ]
+
+
+def diff_data(division, old, new):
+    """Diff two packed timetables of `division`."""
+    if old == new:
+        return TimetableDiff(division, [])
+    before, after = unpack(old), unpack(new)
+    changes = [
+        CellChange(cell[0], cell[1], before.get(cell), after.get(cell))
+        for cell in sorted(before.keys() | after.keys())
+        if before.get(cell) != after.get(cell)
+    ]
+    return TimetableDiff(division, changes)
+
+
+def diff(old, new=None):
+    """Diff snapshot `old` against snapshot `new`, or against the live timetable."""
+    if new is not None and new.division != old.division:
+        raise ValueError('Both snapshots must be of the same division')
+    if new is not None and new.content_hash == old.content_hash:
+        return TimetableDiff(old.division, [])
+    data = bytes(new.data) if new is not None else capture([old.division])[old.division][0]
+    return diff_data(old.division, bytes(old.data), data)
+
+
+# ===============================
+# ⭐ Rollback
+# ===============================
+def rollback(snapshot):
+    """Make the live timetable of the snapshot's division match it again.
+
+    Only the cells that differ are touched: their current lectures are
+    deleted and the snapshot's recreated, in one validated transaction (see
+    workload.bulk_ops). Returns the number of lectures written or deleted.
+    """
+    changes = diff(snapshot).changes
+    if not changes:
+        return 0
+
+    restore = [change for change in changes if change.before is not None]
+    missing = []
+    for model, position in ((Faculty, 0), (Subject, 1), (Room, 2)):
+        referenced = {change.before[position] for change in restore} - {0}
+        found = set(model.objects.filter(pk__in=referenced).values_list('pk', flat=True))
+        missing += [f"{model._meta.verbose_name} #{pk} no longer exists" for pk in sorted(referenced - found)]
+    slots = TimeSlot.objects.in_bulk({change.slot_id for change in restore})
+    missing += [
+        f"time slot #{pk} no longer exists" for pk in sorted({change.slot_id for change in restore} - set(slots))
+    ]
+    if missing:
+        raise BulkOperationError(missing)
+
+    changeset = ChangeSet()
+    cells = {(DAYS[change.day_index], change.slot_id) for change in changes}
+    current = Lecture.objects.filter(division=snapshot.division, day__in={day for day, _ in cells})
+    for lecture in current:
+        if (lecture.day, lecture.time_slot_id) in cells:
+            changeset.delete(lecture)
+    for change in restore:
+        faculty_id, subject_id, room_id = change.before
+        changeset.create(Lecture(
+            faculty_id=faculty_id,
+            subject_id=subject_id,
+            room_id=room_id or None,
+            division=snapshot.division,
+            day=DAYS[change.day_index],
+            time_slot=slots[change.slot_id],
+        ))
+    return changeset.apply()
@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from .models import Faculty, Lecture, DAY_CHOICES
+from .occupancy import get_index
+
+
+# ===============================
+# ⭐ Substitution recommender
+#
+#    For an absent faculty and a date range, every lecture of theirs that
+#    falls in the range gets a ranked list of replacements. Who is free
+#    comes from the shared occupancy index (a per-week bitmask per faculty),
+#    so each lecture costs a few integer operations; headroom and teaching
+#    history are read with one query each. Candidates whose max_hours
+#    would be exceeded are left out. Ranking, best first:
+#      1. has taught the subject before
+#      2. most remaining headroom (max_hours - assigned hours)
+#      3. same department as the absent faculty
+# ===============================
+DEFAULT_LIMIT = 5
+MAX_RANGE_DAYS = 366
+WEEKDAYS = {position: day for position, (day, _) in enumerate(DAY_CHOICES)}
+
+
+class Candidate:
+    def __init__(self, faculty_id, name, department, headroom, taught_subject, same_department):
+        self.faculty_id = faculty_id
+        self.name = name
+        self.department = department
+        self.headroom = headroom
+        self.taught_subject = taught_subject
+        self.same_department = same_department
+
+    def sort_key(self):
+        return (not self.taught_subject, -self.headroom, not self.same_department, self.name)
+
+    def as_dict(self):
+        return {
+            'faculty_id': self.faculty_id,
+            'name': self.name,
+            'department': self.department,
+            'headroom': self.headroom,
+            'taught_subject': self.taught_subject,
+            'same_department': self.same_department,
+        }
+
+
+class Substitution:
+    """One lecture of the absent faculty, the dates it falls on and its candidates."""
+
+    def __init__(self, lecture, dates, candidates):
+        self.lecture = lecture
+        self.dates = dates
+        self.candidates = candidates
+
+    def as_dict(self):
+        lecture = self.lecture
+        return {
+            'lecture': {
+                'id': lecture.pk,
+                'division': lecture.division,
+                'day': lecture.day,
+                'slot': lecture.time_slot.slot_key,
+                'time': lecture.time_slot.display_name,
+                'subject': lecture.subject.subject_name,
+            },
+            'dates': [day.isoformat() for day in self.dates],
+            'candidates': [candidate.as_dict() for candidate in self.candidates],
+        }
+
+
+def dates_by_day(start, end):
+    """Map each teaching day name to the dates in [start, end] that fall on it."""
+    if end < start:
+        raise ValueError('The end date is before the start date')
+    if (end - start).days > MAX_RANGE_DAYS:
+        raise ValueError(f'The date range cannot be longer than {MAX_RANGE_DAYS} days')
+    dates = {}
+    current = start
+    while current <= end:
+        day = WEEKDAYS.get(current.weekday())
+        if day:
+            dates.setdefault(day, []).append(current)
+        current += timedelta(days=1)
+    return dates
+
+
+def recommend(faculty, start, end, limit=DEFAULT_LIMIT, index=None):
+    """Return a `Substitution` for every lecture of `faculty` between `start` and `end`."""
+    dates = dates_by_day(start, end)
+    lectures = list(
+        Lecture.objects.filter(faculty=faculty, day__in=list(dates))
+        .select_related('subject', 'time_slot')
+        .order_by('pk')
+    )
+    if not lectures:
+        return []
+
+    index = index or get_index()
+    faculties = {
+        row['id']: row
+        for row in Faculty.objects.with_workload().exclude(pk=faculty.pk)
+        .values('id', 'name', 'department', 'max_hours', 'total_hours')
+    }
+    taught = set(
+        Lecture.objects.filter(subject_id__in={lecture.subject_id for lecture in lectures})
+        .exclude(faculty=faculty)
+        .values_list('faculty_id', 'subject_id')
+        .distinct()
+    )
+
+    day_order = {day: position for position, day in enumerate(index.days)}
+    lectures.sort(key=lambda lecture: (day_order.get(lecture.day, len(day_order)), lecture.time_slot.sort_order))
+
+    substitutions = []
+    for lecture in lectures:
+        hours = lecture.time_slot.duration_hours
+        free = index.free_faculty(lecture.day, lecture.time_slot_id) if index.knows(lecture.day, lecture.time_slot_id) else []
+        candidates = []
+        for faculty_id in free:
+            row = faculties.get(faculty_id)
+            if row is None:
+                continue
+            headroom = row['max_hours'] - row['total_hours']
+            if headroom < hours:
+                continue
+            candidates.append(Candidate(
+                faculty_id, row['name'], row['department'], headroom,
+                (faculty_id, lecture.subject_id) in taught,
+                row['department'] == faculty.department,
+            ))
+        candidates.sort(key=Candidate.sort_key)
+        substitutions.append(Substitution(lecture, dates[lecture.day], candidates[:limit]))
+    return substitutions
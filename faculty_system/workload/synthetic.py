@@ -0,0 +1,115 @@
+import random
+
+from django.db import transaction
+from django.utils.text import slugify
+
+from .models import Faculty, Subject, Lecture, TimeSlot, DIVISION_CHOICES
+from .occupancy import OccupancyIndex
+from .signals import faculties_changed_in_bulk, lectures_changed_in_bulk, subjects_changed_in_bulk, timeslots_changed_in_bulk
+from .slots import parse_time_range
+from .timetable import get_timeslots
+
+
+# ===============================
+# ⭐ Synthetic data for benchmarks
+#
+#    Creates N faculties, M subjects and a clash-free timetable for the
+#    chosen divisions, optionally on a custom TimeSlot set. Placement uses
+#    the occupancy index, so overlapping slots (e.g. a 2-4 practical next to
+#    2-3 and 3-4) are respected the same way the allocator respects them.
+# ===============================
+DEPARTMENTS = ['Computer', 'IT', 'Electronics', 'Mechanical', 'Civil', 'Electrical']
+
+
+def _clock(minutes):
+    hour, minute = divmod(minutes, 60)
+    meridiem = 'am' if hour < 12 else 'pm'
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {meridiem}"
+
+
+def timeslot_objects(specs):
+    """Build unsaved `TimeSlot`s from specs such as '9-10' or '2:00 pm to 4:00 pm'."""
+    slots = []
+    for order, spec in enumerate(specs, start=1):
+        interval = parse_time_range(spec)
+        if interval is None:
+            raise ValueError(f"Cannot read time slot '{spec}'")
+        start, end = interval
+        slots.append(TimeSlot(
+            slot_key=spec if len(spec) <= 20 else slugify(spec)[:20],
+            display_name=f"{_clock(start)} to {_clock(end)}",
+            duration_hours=max(1, round((end - start) / 60)),
+            sort_order=order,
+            start_minute=start,
+            end_minute=end,
+        ))
+    return slots
+
+
+def flush():
+    """Delete every lecture, faculty and subject (time slots are kept)."""
+    with transaction.atomic():
+        Lecture.objects.all().delete()
+        Faculty.objects.all().delete()
+        Subject.objects.all().delete()
+
+
+def generate(faculties=50, subjects=30, divisions=None, timeslots=None, fill=0.8, seed=0):
+    """Create the synthetic dataset and return the number of rows created per model.
+
+    `timeslots` replaces the slot catalogue (only possible while no lecture
+    uses it); `fill` is the share of (division, day, slot) cells to occupy.
+    """
+    rng = random.Random(seed)
+    divisions = list(divisions or [code for code, _ in DIVISION_CHOICES])
+
+    with transaction.atomic():
+        if timeslots:
+            if Lecture.objects.exists():
+                raise ValueError('Custom time slots need an empty lecture table (use flush first)')
+            TimeSlot.objects.all().delete()
+            TimeSlot.objects.bulk_create(timeslot_objects(timeslots))
+            timeslots_changed_in_bulk()
+        slots = get_timeslots()
+
+        start = Faculty.objects.count()
+        new_faculties = Faculty.objects.bulk_create([
+            Faculty(
+                name=f"Faculty {start + i:05d}",
+                department=DEPARTMENTS[i % len(DEPARTMENTS)],
+                max_hours=rng.randint(12, 24),
+            )
+            for i in range(faculties)
+        ], batch_size=1000)
+        new_subjects = Subject.objects.bulk_create([
+            Subject(subject_name=f"Subject {i:04d}", semester=rng.randint(1, 8), credit_hours=rng.randint(2, 4))
+            for i in range(subjects)
+        ], batch_size=1000)
+
+        index = OccupancyIndex.from_db()
+        faculty_ids = [faculty.pk for faculty in new_faculties]
+        subject_ids = [subject.pk for subject in new_subjects]
+        cells = [(division, day, slot) for division in divisions for day in index.days for slot in slots]
+        rng.shuffle(cells)
+
+        lectures = []
+        for division, day, slot in cells:
+            if not faculty_ids or not subject_ids or rng.random() > fill:
+                continue
+            if not index.is_free('division', division, day, slot.id):
+                continue
+            for faculty_id in rng.sample(faculty_ids, min(10, len(faculty_ids))):
+                if index.is_free('faculty', faculty_id, day, slot.id):
+                    index.add(('synthetic', len(lectures)), faculty_id, division, day, slot.id)
+                    lectures.append(Lecture(
+                        faculty_id=faculty_id, subject_id=rng.choice(subject_ids),
+                        division=division, day=day, time_slot=slot,
+                    ))
+                    break
+
+        Lecture.objects.bulk_create(lectures, batch_size=1000)
+        faculties_changed_in_bulk(faculty_ids)
+        subjects_changed_in_bulk()
+        lectures_changed_in_bulk(faculty_ids)
+
+    return {'faculties': len(new_faculties), 'subjects': len(new_subjects), 'lectures': len(lectures), 'timeslots': len(slots)}
@@ -1,3 +1,1395 @@
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from asgiref.sync import sync_to_async
+from collections import Counter
+from datetime import date
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import Permission, User
+from django.contrib.sessions.models import Session
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.http import Http404
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from . import cache, events, pdf_cache, views
+from .admin import estimated_count, prefix_search
+from .allocation import allocate, apply_allocation
+from .bulk_ops import BulkOperationError, copy_division, move, swap
+from .cache import get_cache
+from .clashes import IntervalIndex, find_clashes
+from .exports import calendar_token, rotate_calendar_key
+from .importer import import_file
+from .instrumentation import QueryRecorder, get_buffer
+from .materialized import rebuild_workload
+from .models import (
+    Faculty,
+    FacultyWorkload,
+    Lecture,
+    Room,
+    STATUS_NORMAL,
+    STATUS_OVERLOADED,
+    Subject,
+    TimeSlot,
+    TimetableSnapshot,
+    UserSession,
+)
+from .occupancy import OccupancyIndex, get_index, invalidate_index
+from .signals import lectures_changed_in_bulk
+from .snapshots import DAY_INDEX, diff, pack, publish, rollback, unpack
+from .substitution import recommend
+from .synthetic import generate
+from .timetable import build_division_grid, get_overlap_matrix, get_timeslots
+
+
+# ===============================
+# ⭐ Shared fixtures
+#    The default slots are seeded by migration 0005. Cache versions and the
+#    occupancy index are updated on commit, which never happens inside a
+#    TestCase, so every test starts from an empty cache and index.
+# ===============================
+class WorkloadTestCase(TestCase):
+
+    def setUp(self):
+        get_cache().clear()
+        invalidate_index()
+        self.slots = {slot.slot_key: slot for slot in TimeSlot.objects.all()}
+
+    def faculty(self, name, max_hours=20, department='CS'):
+        return Faculty.objects.create(name=name, department=department, max_hours=max_hours)
+
+    def subject(self, name, credit_hours=3, semester=1):
+        return Subject.objects.create(subject_name=name, semester=semester, credit_hours=credit_hours)
+
+    def lecture(self, faculty, subject, day, slot_key, division='A', room=None):
+        return Lecture.objects.create(
+            faculty=faculty, subject=subject, division=division, day=day, time_slot=self.slots[slot_key], room=room,
+        )
+
+    def practical_slot(self):
+        """The 2-4 practical, which overlaps the 2-3 and 3-4 slots."""
+        slot = TimeSlot.objects.create(slot_key='2-4', display_name='2:00 pm to 4:00 pm', sort_order=6, duration_hours=2)
+        self.slots[slot.slot_key] = slot
+        return slot
+
+
+# ===============================
+# ⭐ Timetable grid
+# ===============================
+class TimetableGridTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.asha, self.bala = self.faculty('Asha'), self.faculty('Bala')
+        self.maths = self.subject('Maths')
+        for day in ('Monday', 'Tuesday', 'Wednesday'):
+            for slot_key in ('9-10', '10-11', '2-3'):
+                self.lecture(self.asha, self.maths, day, slot_key)
+                self.lecture(self.bala, self.maths, day, slot_key, division='B')
+
+    def test_grid_build_does_not_grow_with_the_week(self):
+        with self.assertNumQueries(2):
+            grid = build_division_grid('A')
+            rows = [[cell and cell.faculty.name for cell in row['cells']] for row in grid.rows if row['type'] == 'lecture']
+        self.assertEqual(len(grid.lectures), 9)
+        self.assertEqual(rows[0], ['Asha', 'Asha', 'Asha', None, None, None])
+
+        timeslots = get_timeslots()
+        with self.assertNumQueries(1):
+            build_division_grid('B', timeslots)
+
+    def test_break_rows_follow_their_slots(self):
+        grid = build_division_grid('A')
+        keys = [row['key'] for row in grid.rows]
+        self.assertEqual(keys[keys.index('10-11') + 1], 'short_break')
+        self.assertEqual(keys[keys.index('12:15-1:15') + 1], 'lunch_break')
+        self.assertEqual(grid.get('10-11', 'Tuesday').faculty, self.asha)
+        self.assertIsNone(grid.get('10-11', 'Saturday'))
+
+
+# ===============================
+# ⭐ Allocation
+# ===============================
+class AllocationTests(WorkloadTestCase):
+
+    def test_places_every_credit_hour_without_clashes(self):
+        faculties = [self.faculty('Asha'), self.faculty('Bala')]
+        subjects = [self.subject('Maths', 4), self.subject('Physics', 3), self.subject('Chemistry', 3)]
+        result = allocate(divisions=['A', 'B'], faculties=faculties)
+
+        self.assertTrue(result.complete)
+        hours = Counter((lecture.division, lecture.subject_id) for lecture in result.lectures)
+        for division in ('A', 'B'):
+            for subject in subjects:
+                self.assertEqual(hours[(division, subject.pk)], subject.credit_hours)
+        for field in ('faculty_id', 'division'):
+            cells = [(getattr(lecture, field), lecture.day, lecture.time_slot_id) for lecture in result.lectures]
+            self.assertEqual(len(cells), len(set(cells)))
+
+    def test_dry_run_writes_nothing_until_applied(self):
+        self.subject('Maths', 2)
+        result = allocate(divisions=['A'], faculties=[self.faculty('Asha')])
+        self.assertEqual(Lecture.objects.count(), 0)
+
+        apply_allocation(result)
+        self.assertEqual(Lecture.objects.count(), 2)
+
+    def test_respects_max_hours_and_reports_the_rest(self):
+        self.subject('Maths', 5)
+        result = allocate(divisions=['A'], faculties=[self.faculty('Asha', max_hours=3)])
+        self.assertEqual(len(result.lectures), 3)
+        self.assertEqual(len(result.unplaced), 2)
+
+    def test_keeps_existing_lectures_and_their_faculty(self):
+        asha, bala = self.faculty('Asha'), self.faculty('Bala')
+        maths = self.subject('Maths', 3)
+        self.lecture(bala, maths, 'Monday', '9-10')
+        result = allocate(divisions=['A'], faculties=[asha, bala])
+
+        self.assertEqual(len(result.lectures), 2)
+        self.assertEqual({lecture.faculty_id for lecture in result.lectures}, {bala.pk})
+
+    def test_admin_action_needs_add_permissions_and_confirmation(self):
+        faculty = self.faculty('Asha')
+        self.subject('Maths', 2)
+        user = User.objects.create_user('staff', password='secret', is_staff=True)
+        user.user_permissions.add(Permission.objects.get(codename='view_faculty'))
+        post = {'action': 'allocate_lectures', '_selected_action': [faculty.pk]}
+
+        self.client.force_login(user)
+        self.client.post('/admin/workload/faculty/', post)
+        self.assertEqual(Lecture.objects.count(), 0)
+
+        user.user_permissions.add(*Permission.objects.filter(codename__in=['add_faculty', 'add_lecture']))
+        self.client.force_login(User.objects.get(pk=user.pk))
+        response = self.client.post('/admin/workload/faculty/', post)
+        # two hours for each of the four divisions
+        self.assertContains(response, 'Planned lectures (8)')
+        self.assertEqual(Lecture.objects.count(), 0)
+
+        self.client.post('/admin/workload/faculty/', {**post, 'apply': '1'})
+        self.assertEqual(Lecture.objects.count(), 8)
+
+
+# ===============================
+# ⭐ Occupancy index
+# ===============================
+class OccupancyIndexTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.asha, self.bala = self.faculty('Asha'), self.faculty('Bala')
+        self.maths = self.subject('Maths')
+
+    def test_practical_covers_both_hours(self):
+        self.practical_slot()
+        self.lecture(self.asha, self.maths, 'Monday', '2-4')
+        index = OccupancyIndex.from_db()
+
+        for slot_key in ('2-3', '3-4', '2-4'):
+            self.assertFalse(index.is_free('faculty', self.asha.pk, 'Monday', self.slots[slot_key].id))
+        self.assertTrue(index.is_free('faculty', self.asha.pk, 'Tuesday', self.slots['2-3'].id))
+        self.assertEqual(
+            index.clashes(self.bala.pk, 'A', 'Monday', self.slots['3-4'].id), ['division'],
+        )
+
+    def test_exclude_and_remove(self):
+        lecture = self.lecture(self.asha, self.maths, 'Monday', '9-10')
+        index = get_index()
+        slot_id = self.slots['9-10'].id
+
+        self.assertFalse(index.is_free('division', 'A', 'Monday', slot_id))
+        self.assertTrue(index.is_free('division', 'A', 'Monday', slot_id, exclude=lecture.pk))
+        self.assertNotIn(self.asha.pk, index.free_faculty('Monday', slot_id))
+
+        index.remove(lecture.pk)
+        self.assertIn(self.asha.pk, index.free_faculty('Monday', slot_id))
+        self.assertEqual(len(index.free_cells('faculty', self.asha.pk, day='Monday')), len(self.slots))
+
+    def test_shared_index_follows_changes_from_other_workers(self):
+        index = get_index()
+        with self.assertNumQueries(0):
+            self.assertIs(get_index(), index)
+
+        # committed by another process: only the version bump reaches this one
+        Lecture.objects.bulk_create([
+            Lecture(faculty=self.bala, subject=self.maths, division='B', day='Friday', time_slot=self.slots['9-10']),
+        ])
+        cache.bump('lecture')
+        self.assertFalse(get_index().is_free('faculty', self.bala.pk, 'Friday', self.slots['9-10'].id))
+
+        chitra = self.faculty('Chitra')
+        cache.bump('faculty')
+        self.assertIn(chitra.pk, get_index().free_faculty('Friday', self.slots['9-10'].id))
+
+
+# ===============================
+# ⭐ Clash constraints
+# ===============================
+class LectureConstraintTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.asha, self.bala = self.faculty('Asha'), self.faculty('Bala')
+        self.maths = self.subject('Maths')
+        self.lecture(self.asha, self.maths, 'Monday', '9-10', division='A')
+
+    def test_full_clean_reports_faculty_and_division_clashes(self):
+        for faculty, division, message in ((self.asha, 'B', 'Faculty already'), (self.bala, 'A', 'Division already')):
+            lecture = Lecture(
+                faculty=faculty, subject=self.maths, division=division, day='Monday', time_slot=self.slots['9-10'],
+            )
+            with self.assertRaisesMessage(ValidationError, message):
+                lecture.full_clean()
+
+        Lecture(
+            faculty=self.bala, subject=self.maths, division='B', day='Monday', time_slot=self.slots['9-10'],
+        ).full_clean()
+
+    def test_bulk_paths_cannot_bypass_them(self):
+        for faculty, division in ((self.asha, 'B'), (self.bala, 'A')):
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                Lecture.objects.bulk_create([Lecture(
+                    faculty=faculty, subject=self.maths, division=division, day='Monday', time_slot=self.slots['9-10'],
+                )])
+        self.assertEqual(Lecture.objects.count(), 1)
+
+
+# ===============================
+# ⭐ Single session per user
+# ===============================
+class SessionRevocationTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('asha', password='secret')
+
+    def login(self):
+        client = Client()
+        response = client.post('/login/', {'username': 'asha', 'password': 'secret'})
+        self.assertEqual(response.status_code, 302)
+        return client
+
+    def test_second_login_revokes_the_first_session(self):
+        first = self.login()
+        first_key = first.session.session_key
+        second = self.login()
+
+        self.assertFalse(Session.objects.filter(session_key=first_key).exists())
+        self.assertEqual(
+            list(UserSession.objects.values_list('session_key', flat=True)), [second.session.session_key],
+        )
+        self.assertEqual(first.get('/').status_code, 302)
+        self.assertEqual(second.get('/').status_code, 200)
+
+    def test_logout_forgets_the_mapping(self):
+        client = self.login()
+        client.get('/logout/')
+        self.assertFalse(UserSession.objects.exists())
+
+    def test_admin_login_is_revoked_by_a_faculty_login(self):
+        self.user.is_staff = True
+        self.user.save()
+        admin = Client()
+        admin.post('/admin/login/', {'username': 'asha', 'password': 'secret', 'next': '/admin/'})
+        self.assertEqual(admin.get('/admin/').status_code, 200)
+
+        self.login()
+        self.assertEqual(admin.get('/admin/').status_code, 302)
+
+    def test_rows_of_expired_sessions_are_dropped_on_login(self):
+        UserSession.objects.create(user=self.user, session_key='gone')
+        client = self.login()
+        self.assertEqual(
+            list(UserSession.objects.values_list('session_key', flat=True)), [client.session.session_key],
+        )
+
+
+# ===============================
+# ⭐ Versioned cache
+# ===============================
+class VersionedCacheTests(WorkloadTestCase):
+
+    def test_entries_are_rebuilt_after_a_bump(self):
+        builds = []
+
+        def builder():
+            builds.append(1)
+            return len(builds)
+
+        self.assertEqual(cache.get_or_build('thing', ('lecture',), builder, 'A'), 1)
+        self.assertEqual(cache.get_or_build('thing', ('lecture',), builder, 'A'), 1)
+        self.assertEqual(cache.get_or_build('thing', ('faculty',), builder, 'A'), 2)
+
+        cache.bump('lecture')
+        self.assertEqual(cache.get_or_build('thing', ('lecture',), builder, 'A'), 3)
+        self.assertEqual(cache.get_or_build('thing', ('faculty',), builder, 'A'), 2)
+
+    def test_dashboard_is_served_from_cache_until_a_lecture_commits(self):
+        asha, maths = self.faculty('Asha'), self.subject('Maths')
+        self.client.force_login(User.objects.create_user('asha', password='secret'))
+        self.client.get('/')
+
+        # only the session and the user are loaded
+        with self.assertNumQueries(2):
+            response = self.client.get('/')
+        self.assertEqual(response.context['lectures_count'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lecture(asha, maths, 'Monday', '9-10')
+        self.assertEqual(self.client.get('/').context['lectures_count'], 1)
+
+
+# ===============================
+# ⭐ Materialized workload
+# ===============================
+class FacultyWorkloadTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.asha, self.bala = self.faculty('Asha', max_hours=2), self.faculty('Bala')
+        self.maths = self.subject('Maths')
+
+    def workload(self, faculty):
+        row = FacultyWorkload.objects.get(faculty=faculty)
+        return row.total_hours, row.hours_by_day, row.hours_by_division, row.is_overloaded
+
+    def assertMatchesRebuild(self):
+        live = {row.faculty_id: self.workload(row.faculty_id) for row in FacultyWorkload.objects.all()}
+        rebuild_workload()
+        rebuilt = {row.faculty_id: self.workload(row.faculty_id) for row in FacultyWorkload.objects.all()}
+        self.assertEqual(live, rebuilt)
+
+    def test_reassigning_a_lecture_moves_its_hours(self):
+        lecture = self.lecture(self.asha, self.maths, 'Monday', '9-10')
+        self.assertEqual(self.workload(self.asha), (1, {'Monday': 1}, {'A': 1}, False))
+
+        lecture.faculty = self.bala
+        lecture.division = 'B'
+        lecture.save()
+        self.assertEqual(self.workload(self.asha), (0, {}, {}, False))
+        self.assertEqual(self.workload(self.bala), (1, {'Monday': 1}, {'B': 1}, False))
+        self.assertMatchesRebuild()
+
+    def test_practical_slot_counts_its_duration(self):
+        self.practical_slot()
+        lecture = self.lecture(self.asha, self.maths, 'Monday', '9-10')
+        lecture.time_slot = self.slots['2-4']
+        lecture.save()
+        self.assertEqual(self.workload(self.asha), (2, {'Monday': 2}, {'A': 2}, False))
+
+        slot = self.slots['2-4']
+        slot.duration_hours = 3
+        slot.save()
+        self.assertEqual(self.workload(self.asha), (3, {'Monday': 3}, {'A': 3}, True))
+        self.assertMatchesRebuild()
+
+    def test_delete_and_max_hours_change(self):
+        lectures = [self.lecture(self.asha, self.maths, day, '9-10') for day in ('Monday', 'Tuesday', 'Friday')]
+        self.assertTrue(self.workload(self.asha)[3])
+
+        lectures[0].delete()
+        self.assertEqual(self.workload(self.asha), (2, {'Tuesday': 1, 'Friday': 1}, {'A': 2}, False))
+
+        self.asha.max_hours = 1
+        self.asha.save()
+        self.assertTrue(self.workload(self.asha)[3])
+        self.assertMatchesRebuild()
+
+    def test_bulk_paths_rebuild_the_affected_faculties(self):
+        Lecture.objects.bulk_create([
+            Lecture(faculty=self.bala, subject=self.maths, division='A', day=day, time_slot=self.slots['10-11'])
+            for day in ('Monday', 'Tuesday')
+        ])
+        lectures_changed_in_bulk([self.bala.pk])
+        self.assertEqual(self.workload(self.bala), (2, {'Monday': 1, 'Tuesday': 1}, {'A': 2}, False))
+
+        Lecture.objects.filter(faculty=self.bala).update(faculty=self.asha)
+        lectures_changed_in_bulk([self.asha.pk, self.bala.pk])
+        self.assertEqual(self.workload(self.bala)[0], 0)
+        self.assertEqual(self.workload(self.asha), (2, {'Monday': 1, 'Tuesday': 1}, {'A': 2}, False))
+        self.assertMatchesRebuild()
+
+
+# ===============================
+# ⭐ Load and overload status in SQL
+# ===============================
+class WorkloadStatusTests(WorkloadTestCase):
+
+    def status(self, faculty):
+        row = Faculty.objects.with_workload().get(pk=faculty.pk)
+        return row.total_hours, row.load_pct, row.status
+
+    def test_boundaries(self):
+        maths = self.subject('Maths')
+        at_limit, over, idle, unpaid = (
+            self.faculty('Asha', max_hours=2), self.faculty('Bala', max_hours=1),
+            self.faculty('Chitra', max_hours=0), self.faculty('Dev', max_hours=0),
+        )
+        for faculty, division in ((at_limit, 'A'), (over, 'B'), (unpaid, 'C')):
+            self.lecture(faculty, maths, 'Monday', '9-10', division=division)
+        self.lecture(at_limit, maths, 'Tuesday', '9-10')
+        self.lecture(over, maths, 'Tuesday', '9-10', division='B')
+
+        self.assertEqual(self.status(at_limit), (2, 100, STATUS_NORMAL))
+        self.assertEqual(self.status(over), (2, 200, STATUS_OVERLOADED))
+        # max_hours=0 has no percentage, but any hour is still an overload
+        self.assertEqual(self.status(idle), (0, 0, STATUS_NORMAL))
+        self.assertEqual(self.status(unpaid), (1, 0, STATUS_OVERLOADED))
+
+        self.assertEqual(list(Faculty.objects.overloaded().order_by('name')), [over, unpaid])
+        self.assertEqual(list(Faculty.objects.most_overloaded()), [over, unpaid])
+        self.assertEqual(Faculty.objects.by_load()[0], over)
+
+
+# ===============================
+# ⭐ Cached timetable PDFs
+# ===============================
+class TimetablePdfTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings_override = override_settings(WORKLOAD_PDF_CACHE_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.asha, self.maths = self.faculty('Asha'), self.subject('Maths')
+        self.first = self.lecture(self.asha, self.maths, 'Monday', '9-10')
+        self.user = User.objects.create_user('asha', password='secret')
+        self.client.force_login(self.user)
+
+    def download(self, **headers):
+        return self.client.get('/download-pdf/', {'division': 'A'}, headers=headers)
+
+    def test_repeat_downloads_are_conditional(self):
+        response = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(response.content.startswith(b'%PDF'))
+        etag = response['ETag']
+
+        self.assertEqual(self.download(if_none_match=etag).status_code, 304)
+        again = self.download()
+        self.assertEqual((again['ETag'], again.content), (etag, response.content))
+
+    def test_timetable_edit_changes_the_etag(self):
+        etag = self.download()['ETag']
+        self.first.time_slot = self.slots['10-11']
+        self.first.save()
+
+        response = self.download(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_unknown_division_is_not_found(self):
+        # the division names the cached file, so it must never reach the cache
+        for division in ('Z', '../../tmp/x', ''):
+            self.assertEqual(self.client.get('/download-pdf/', {'division': division}).status_code, 404)
+        self.assertEqual(list(Path(self.directory).iterdir()), [])
+
+    async def test_async_view_checks_the_division_too(self):
+        request = RequestFactory().get('/download-pdf/', {'division': '../x'})
+
+        async def auser():
+            return self.user
+
+        request.user, request.auser = self.user, auser
+        with self.assertRaises(Http404):
+            await views.download_timetable_pdf_async(request)
+
+    async def test_async_view_reads_the_cache_off_the_event_loop(self):
+        cached = await sync_to_async(self.download)()
+        self.assertEqual(cached.status_code, 200)
+        loop_thread, threads = threading.get_ident(), []
+
+        def on_thread(function):
+            def wrapper(*args):
+                threads.append(threading.get_ident())
+                return function(*args)
+            return wrapper
+
+        async def auser():
+            return self.user
+
+        request = RequestFactory().get('/download-pdf/', {'division': 'A'})
+        request.user, request.auser = self.user, auser
+        with mock.patch.object(pdf_cache, 'lookup', on_thread(pdf_cache.lookup)), \
+                mock.patch.object(pdf_cache, 'last_modified', on_thread(pdf_cache.last_modified)), \
+                mock.patch.object(views, '_read_with_mtime', on_thread(views._read_with_mtime)):
+            response = await views.download_timetable_pdf_async(request)
+
+        self.assertEqual((response['ETag'], response.content), (cached['ETag'], cached.content))
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(loop_thread, threads)
+
+
+# ===============================
+# ⭐ Worker startup imports
+#    A fresh interpreter runs django.setup() and imports the root URLconf,
+#    which is what a WSGI/ASGI worker does before its first request, then
+#    reports what ended up in sys.modules. The settings are loaded with an
+#    in-memory database so WorkloadConfig.ready() cannot touch the real
+#    sessions. Wall-clock timing depends on the machine, so it only runs
+#    when WORKLOAD_IMPORT_BUDGET_MS is set.
+# ===============================
+HEAVY_MODULES = ('reportlab', 'matplotlib', 'openpyxl')
+IMPORT_BUDGET_MS = os.environ.get('WORKLOAD_IMPORT_BUDGET_MS')
+
+BOOT_CODE = '''
+import json, sys, time
+started = time.perf_counter()
+from django.conf import settings
+import faculty_system.settings as base
+values = {name: getattr(base, name) for name in dir(base) if name.isupper()}
+values['DATABASES'] = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}}
+settings.configure(**values)
+import django
+django.setup()
+import importlib
+importlib.import_module(settings.ROOT_URLCONF)
+print(json.dumps({'ms': (time.perf_counter() - started) * 1000, 'modules': sorted(sys.modules)}))
+'''
+
+
+class ImportBudgetTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        result = subprocess.run(
+            [sys.executable, '-c', BOOT_CODE],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise AssertionError(f"Worker boot failed:\n{result.stderr[-2000:]}")
+        boot = json.loads(result.stdout.splitlines()[-1])
+        cls.modules = set(boot['modules'])
+        cls.boot_ms = boot['ms']
+
+    def test_heavy_modules_are_not_loaded(self):
+        self.assertIn('workload.views', self.modules)
+        heavy = sorted(module for module in self.modules if module.split('.')[0] in HEAVY_MODULES)
+        self.assertEqual(heavy, [], 'PDF/charting/spreadsheet libraries must only load on first use')
+
+    @unittest.skipUnless(IMPORT_BUDGET_MS, 'set WORKLOAD_IMPORT_BUDGET_MS to time worker boot')
+    def test_boot_within_budget(self):
+        self.assertLessEqual(self.boot_ms, float(IMPORT_BUDGET_MS))
+
+
+# ===============================
+# ⭐ Import
+# ===============================
+def csv_file(text):
+    return io.BytesIO(text.encode())
+
+
+class ImportTests(WorkloadTestCase):
+
+    def test_bad_numbers_are_row_errors(self):
+        data = 'name,department,max_hours\nAsha,CS,12\nBala,CS,inf\nChitra,CS,nan\nDev,CS,1e30\nEsha,CS,2.5\nFarid,CS,-1\n'
+        report = import_file('faculties', csv_file(data), 'faculties.csv')
+
+        self.assertEqual(report.rows, 6)
+        self.assertEqual(report.created, 1)
+        self.assertEqual([line for line, _ in report.errors], [3, 4, 5, 6, 7])
+        self.assertEqual(list(Faculty.objects.values_list('name', 'max_hours')), [('Asha', 12)])
+
+    def test_lectures_are_checked_against_stored_and_earlier_rows(self):
+        asha, bala = self.faculty('Asha'), self.faculty('Bala')
+        maths = self.subject('Maths')
+        self.lecture(asha, maths, 'Monday', '9-10', division='A')
+        data = (
+            'faculty,subject,division,day,time_slot\n'
+            'asha,maths,B,monday,9-10\n'      # Asha already teaches A then
+            'Bala,Maths,B,Monday,9-10\n'
+            'Asha,Maths,B,Monday,9-10\n'      # division B was just booked by the row above
+            'Nobody,Maths,C,Monday,9-10\n'
+            'Bala,Maths,C,Tuesday,10-11\n'
+        )
+        report = import_file('lectures', csv_file(data), 'lectures.csv')
+
+        self.assertEqual([line for line, _ in report.errors], [2, 4, 5])
+        self.assertIn("unknown faculty 'Nobody'", report.errors[2][1])
+        self.assertEqual(report.created, 2)
+        self.assertEqual(Lecture.objects.filter(faculty=bala).count(), 2)
+
+    def test_strict_import_writes_nothing_on_errors(self):
+        data = 'subject_name,semester,credit_hours\nMaths,1,4\nPhysics,one,3\n'
+        report = import_file('subjects', csv_file(data), 'subjects.csv', strict=True)
+
+        self.assertFalse(report.ok)
+        self.assertEqual(report.created, 0)
+        self.assertFalse(Subject.objects.exists())
+
+    def test_xlsx(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['Subject Name', 'Semester', 'Credit Hours'])
+        sheet.append(['Maths', 1, 4])
+        sheet.append(['Physics', 2, 3])
+        handle = io.BytesIO()
+        workbook.save(handle)
+        handle.seek(0)
+
+        report = import_file('subjects', handle, 'subjects.xlsx')
+        self.assertTrue(report.ok)
+        self.assertEqual(sorted(Subject.objects.values_list('subject_name', 'credit_hours')), [('Maths', 4), ('Physics', 3)])
+
+
+# ===============================
+# ⭐ Streaming exports
+# ===============================
+@override_settings(WORKLOAD_TERM_START='2026-06-01', WORKLOAD_TERM_END='2026-10-31')
+class ExportTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.asha, self.bala = self.faculty('Asha', max_hours=1), self.faculty('Bala', department='Maths')
+        self.maths = self.subject('Maths, Applied')
+        self.lecture(self.asha, self.maths, 'Wednesday', '2-3', division='B')
+        self.lecture(self.asha, self.maths, 'Monday', '10-11', division='A')
+        self.lecture(self.bala, self.maths, 'Monday', '9-10', division='A')
+        self.client.force_login(User.objects.create_user('staff', password='secret'))
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_timetable_csv_streams_rows_in_grid_order(self):
+        response = self.client.get('/export/timetable.csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(self.read(response).splitlines()))
+
+        self.assertEqual(rows[0][:3], ['Division', 'Day', 'Time Slot'])
+        self.assertEqual([(row[0], row[1], row[5]) for row in rows[1:]], [
+            ('A', 'Monday', 'Bala'), ('A', 'Monday', 'Asha'), ('B', 'Wednesday', 'Asha'),
+        ])
+        self.assertEqual(rows[1][3], 'Maths, Applied')
+
+        rows = list(csv.reader(self.read(self.client.get('/export/timetable.csv', {'division': 'B'})).splitlines()))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(self.client.get('/export/timetable.csv', {'division': 'Z'}).status_code, 404)
+
+    def test_workload_csv(self):
+        rows = list(csv.reader(self.read(self.client.get('/export/workload.csv')).splitlines()))
+        self.assertEqual(rows[1:], [
+            ['Asha', 'CS', '1', '2', '200', 'Overloaded'],
+            ['Bala', 'Maths', '20', '1', '5', 'Normal'],
+        ])
+
+    def test_faculty_calendar_has_weekly_events(self):
+        response = self.client.get(f'/export/faculty/{self.asha.pk}.ics')
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = self.read(response)
+        lines = body.split('\r\n')
+
+        self.assertEqual((lines[0], lines[-2]), ('BEGIN:VCALENDAR', 'END:VCALENDAR'))
+        self.assertEqual(lines.count('BEGIN:VEVENT'), 2)
+        self.assertIn('DTSTART;TZID=Asia/Kolkata:20260601T100000', lines)
+        self.assertIn('DTEND;TZID=Asia/Kolkata:20260603T150000', lines)
+        self.assertIn('RRULE:FREQ=WEEKLY;BYDAY=MO;UNTIL=20261031T235959Z', lines)
+        self.assertIn('RRULE:FREQ=WEEKLY;BYDAY=WE;UNTIL=20261031T235959Z', lines)
+        self.assertIn('SUMMARY:Maths\\, Applied (Division A)', lines)
+
+        # every TZID an event uses is defined in the calendar
+        zone = lines[lines.index('BEGIN:VTIMEZONE'):lines.index('END:VTIMEZONE') + 1]
+        self.assertLess(lines.index('END:VTIMEZONE'), lines.index('BEGIN:VEVENT'))
+        self.assertEqual(zone[1], 'TZID:Asia/Kolkata')
+        self.assertIn('TZOFFSETTO:+0530', zone)
+        self.assertEqual(zone.count('BEGIN:STANDARD'), 1)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in lines))
+
+    def test_calendar_feed_needs_a_valid_token(self):
+        self.client.logout()
+        response = self.client.get(f'/calendar/{calendar_token(self.bala)}.ics')
+        self.assertEqual(self.read(response).count('BEGIN:VEVENT'), 1)
+        self.assertEqual(self.client.get(f'/calendar/{self.bala.pk}.ics').status_code, 404)
+
+    def test_rotating_the_key_revokes_old_feed_urls(self):
+        self.client.logout()
+        old = calendar_token(self.bala)
+        self.assertNotEqual(self.asha.calendar_key, self.bala.calendar_key)
+
+        new = rotate_calendar_key(self.bala)
+        self.assertEqual(self.client.get(f'/calendar/{old}.ics').status_code, 404)
+        self.assertEqual(self.client.get(f'/calendar/{new}.ics').status_code, 200)
+
+    def test_admin_shows_and_rotates_the_feed_url(self):
+        self.client.force_login(User.objects.create_superuser('admin', password='secret'))
+        change_url = f'/admin/workload/faculty/{self.bala.pk}/change/'
+        self.assertContains(self.client.get(change_url), f'http://testserver/calendar/{calendar_token(self.bala)}.ics')
+
+        old = calendar_token(self.bala)
+        response = self.client.post(f'/admin/workload/faculty/{self.bala.pk}/rotate-calendar/')
+        self.assertRedirects(response, change_url)
+        self.bala.refresh_from_db()
+        self.assertNotEqual(calendar_token(self.bala), old)
+        self.assertContains(self.client.get(change_url), calendar_token(self.bala))
+        self.assertEqual(self.client.get(f'/admin/workload/faculty/{self.bala.pk}/rotate-calendar/').status_code, 403)
+
+    @override_settings(TIME_ZONE='Europe/London')
+    def test_vtimezone_follows_daylight_saving_changes(self):
+        lines = self.read(self.client.get(f'/export/faculty/{self.asha.pk}.ics')).split('\r\n')
+        zone = lines[lines.index('BEGIN:VTIMEZONE'):lines.index('END:VTIMEZONE') + 1]
+
+        self.assertEqual([line for line in zone if line.startswith('BEGIN:')][1:], ['BEGIN:DAYLIGHT', 'BEGIN:STANDARD'])
+        # British Summer Time ends on the last Sunday of October, at 2:00 local time
+        self.assertIn('DTSTART:20261025T020000', zone)
+        self.assertEqual(zone[-5:-2], ['TZOFFSETFROM:+0100', 'TZOFFSETTO:+0000', 'TZNAME:GMT'])
+
+
+# ===============================
+# ⭐ JSON API
+# ===============================
+class ApiTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.asha, self.maths = self.faculty('Asha'), self.subject('Maths')
+        self.lectures = [
+            self.lecture(self.asha, self.maths, day, '9-10')
+            for day in ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday')
+        ]
+        self.client.force_login(User.objects.create_user('staff', password='secret'))
+
+    def test_needs_a_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/api/divisions/A/timetable/').status_code, 401)
+
+    def test_cursor_pages_do_not_shift_when_rows_change(self):
+        first = self.client.get('/api/divisions/A/timetable/', {'limit': 2}).json()
+        self.assertEqual([row['id'] for row in first['results']], [lecture.pk for lecture in self.lectures[:2]])
+
+        # an offset page would now skip a row
+        self.lectures[0].delete()
+        second = self.client.get(first['next']).json()
+        third = self.client.get(second['next']).json()
+        self.assertEqual(
+            [row['id'] for row in second['results'] + third['results']],
+            [lecture.pk for lecture in self.lectures[2:]],
+        )
+        self.assertIsNone(third['next'])
+        self.assertEqual(self.client.get('/api/divisions/A/timetable/', {'after': 'x'}).status_code, 400)
+
+    def test_conditional_get_until_a_lecture_is_written(self):
+        response = self.client.get('/api/divisions/A/timetable/')
+        etag = response['ETag']
+        with self.assertNumQueries(2):
+            # session and user only: the 304 is decided from the cache versions
+            cached = self.client.get('/api/divisions/A/timetable/', headers={'if_none_match': etag})
+        self.assertEqual(cached.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lecture(self.asha, self.maths, 'Saturday', '9-10')
+        response = self.client.get('/api/divisions/A/timetable/', headers={'if_none_match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()['results']), 6)
+
+
+# ===============================
+# ⭐ Live dashboard events
+# ===============================
+class LiveEventTests(WorkloadTestCase):
+
+    async def test_broker_hands_events_to_the_subscriber_loop(self):
+        broker = events.InProcessBroker(maxsize=2)
+        with broker.subscribe() as subscription:
+            self.assertTrue(broker.listening())
+            # sync views publish from worker threads
+            await asyncio.to_thread(broker.publish, {'type': 'lecture', 'divisions': ['A']})
+            event = await subscription.get(timeout=1)
+            self.assertEqual(event, {'type': 'lecture', 'divisions': ['A'], 'id': 1})
+            self.assertIsNone(await subscription.get(timeout=0.01))
+
+            # a client that falls behind is told to reload
+            for _ in range(3):
+                broker.publish({'type': 'workload'})
+            self.assertEqual(await subscription.get(timeout=1), {'type': 'resync'})
+            self.assertTrue(subscription.overflowed)
+        self.assertFalse(broker.listening())
+
+    def test_format_and_filter(self):
+        event = {'type': 'lecture', 'id': 7, 'divisions': ['A', 'B']}
+        message = events.format_sse(event)
+        self.assertTrue(message.startswith('event: lecture\nid: 7\ndata: '))
+        self.assertTrue(message.endswith('\n\n'))
+        self.assertEqual(json.loads(message.splitlines()[2][len('data: '):]), event)
+
+        self.assertTrue(events.concerns(event, 'B'))
+        self.assertFalse(events.concerns(event, 'C'))
+        self.assertTrue(events.concerns({'type': 'resync'}, 'C'))
+
+    def test_lecture_changes_publish_after_commit(self):
+        asha, bala, maths = self.faculty('Asha'), self.faculty('Bala'), self.subject('Maths')
+        with mock.patch.object(events.get_broker(), 'listening', return_value=True), \
+                mock.patch.object(events, 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                lecture = self.lecture(asha, maths, 'Monday', '9-10')
+            self.assertEqual(publish.call_args_list[0].args[0]['action'], 'added')
+            self.assertEqual(publish.call_args_list[1].args[0]['total_hours'], 1)
+
+            publish.reset_mock()
+            lecture.faculty, lecture.division = bala, 'B'
+            with self.captureOnCommitCallbacks(execute=True):
+                lecture.save()
+            published = [call.args[0] for call in publish.call_args_list]
+            self.assertEqual(published[0]['divisions'], ['B', 'A'])
+            self.assertEqual(
+                {(event['faculty_id'], event['total_hours']) for event in published[1:]}, {(asha.pk, 0), (bala.pk, 1)},
+            )
+
+            publish.reset_mock()
+            with self.captureOnCommitCallbacks(execute=True):
+                lecture.delete()
+            self.assertEqual(publish.call_args_list[0].args[0]['action'], 'removed')
+
+    @override_settings(WORKLOAD_LIVE_UPDATES=True)
+    def test_stream_is_not_held_open_under_wsgi(self):
+        self.client.force_login(User.objects.create_user('asha', password='secret'))
+        self.assertEqual(self.client.get('/events/').status_code, 204)
+        self.assertTrue(self.client.get('/').context['live_updates'])
+
+        with self.settings(WORKLOAD_LIVE_UPDATES=False):
+            self.assertFalse(self.client.get('/').context['live_updates'])
+
+
+# ===============================
+# ⭐ Request instrumentation
+# ===============================
+class InstrumentationTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        get_buffer().clear()
+        self.addCleanup(get_buffer().clear)
+        self.user = User.objects.create_user('staff', password='secret', is_staff=True, is_superuser=True)
+        self.client.force_login(self.user)
+
+    def test_off_by_default(self):
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(get_buffer().snapshot(), [])
+
+    @override_settings(WORKLOAD_INSTRUMENTATION=True, WORKLOAD_SERVER_TIMING=True)
+    def test_records_queries_and_timings_per_request(self):
+        response = self.client.get('/', {'division': 'B'})
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+        record, = get_buffer().snapshot()
+        self.assertEqual((record.url_name, record.method, record.status), ('root', 'GET', 200))
+        self.assertGreater(record.queries, 0)
+        self.assertIsNotNone(record.view_ms)
+        self.assertGreaterEqual(record.total_ms, record.view_ms)
+
+        report = self.client.get('/admin/instrumentation/')
+        self.assertContains(report, 'root')
+
+    @override_settings(WORKLOAD_INSTRUMENTATION=True)
+    async def test_records_requests_served_over_asgi(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/export/workload.csv')
+        self.assertEqual(response.status_code, 200)
+
+        record, = get_buffer().snapshot()
+        self.assertEqual((record.url_name, record.status), ('export_workload_csv', 200))
+        self.assertGreater(record.queries, 0)
+
+    def test_repeated_statements_are_counted(self):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for faculty_id in (1, 2, 3):
+                Faculty.objects.filter(pk=faculty_id).exists()
+            Subject.objects.count()
+
+        self.assertEqual(recorder.queries, 4)
+        duplicates, top = recorder.duplicates()
+        self.assertEqual(duplicates, 2)
+        self.assertTrue(top.startswith('3x SELECT'))
+
+
+# ===============================
+# ⭐ Admin changelists
+# ===============================
+class AdminChangelistTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.asha, self.bala = self.faculty('Asha', max_hours=1), self.faculty('Bala')
+        self.maths, self.astro = self.subject('Maths'), self.subject('Astronomy')
+        self.lecture(self.asha, self.maths, 'Monday', '9-10')
+        self.lecture(self.asha, self.maths, 'Tuesday', '9-10')
+        self.lecture(self.bala, self.astro, 'Monday', '10-11')
+        self.client.force_login(User.objects.create_superuser('admin', password='secret'))
+
+    def changelist(self, model, **params):
+        return self.client.get(f'/admin/workload/{model}/', params)
+
+    def test_lecture_changelist_queries_do_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as few:
+            self.changelist('lecture')
+        for day in ('Wednesday', 'Thursday', 'Friday', 'Saturday'):
+            self.lecture(self.bala, self.maths, day, '2-3', division='B')
+        with CaptureQueriesContext(connection) as more:
+            response = self.changelist('lecture')
+
+        self.assertEqual(response.context['cl'].result_count, 7)
+        self.assertEqual(len(more), len(few))
+
+    def test_prefix_search_on_faculty_and_subject(self):
+        results = self.changelist('lecture', q='as').context['cl'].result_list
+        # Asha's lectures and the Astronomy one; 'as' inside a word does not match
+        self.assertEqual(len(results), 3)
+        self.assertEqual(len(self.changelist('lecture', q='ASTRO').context['cl'].result_list), 1)
+        self.assertEqual(len(self.changelist('lecture', q='sha').context['cl'].result_list), 0)
+
+    def test_faculty_changelist_shows_load_and_filters_overloads(self):
+        response = self.changelist('faculty', load='overloaded')
+        self.assertEqual(list(response.context['cl'].result_list), [self.asha])
+        self.assertContains(response, '200% (overloaded)')
+        self.assertEqual(len(self.changelist('faculty', load='normal').context['cl'].result_list), 1)
+
+    def test_prefix_search_ignores_case(self):
+        self.assertEqual(list(prefix_search(Faculty.objects.all(), ['name'], 'aSh')), [self.asha])
+        self.assertEqual(list(prefix_search(Subject.objects.all(), ['subject_name'], 'ath')), [])
+        response = self.changelist('faculty', q='BA')
+        self.assertEqual(list(response.context['cl'].result_list), [self.bala])
+
+    def test_counts_stay_exact_without_table_statistics(self):
+        self.assertIsNone(estimated_count(Lecture.objects.all()))
+        Lecture.objects.filter(faculty=self.asha).delete()
+        # the highest primary key would still say 3
+        with mock.patch('workload.admin.ESTIMATE_THRESHOLD', 0):
+            self.assertEqual(self.changelist('lecture').context['cl'].result_count, 1)
+
+
+# ===============================
+# ⭐ Substitution recommender
+# ===============================
+class SubstitutionTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.maths, self.physics = self.subject('Maths'), self.subject('Physics')
+        self.asha = self.faculty('Asha')
+        self.bala = self.faculty('Bala', department='Physics')
+        self.chitra = self.faculty('Chitra')
+        self.dev = self.faculty('Dev')
+        self.esha = self.faculty('Esha', max_hours=0)
+        self.farid = self.faculty('Farid', department='Physics')
+        self.gita = self.faculty('Gita', max_hours=3)
+
+        self.absent = self.lecture(self.asha, self.maths, 'Monday', '9-10', division='A')
+        self.lecture(self.asha, self.physics, 'Wednesday', '9-10', division='A')
+        self.lecture(self.bala, self.maths, 'Tuesday', '9-10', division='B')    # has taught Maths
+        self.lecture(self.dev, self.physics, 'Monday', '9-10', division='C')    # busy at that time
+        self.lecture(self.gita, self.physics, 'Friday', '9-10', division='C')
+
+    def test_ranks_by_subject_then_headroom_then_department(self):
+        substitution = recommend(self.asha, date(2026, 6, 1), date(2026, 6, 9))[0]
+
+        self.assertEqual(substitution.lecture, self.absent)
+        self.assertEqual(substitution.dates, [date(2026, 6, 1), date(2026, 6, 8)])
+        # Dev is busy, Esha has no headroom
+        self.assertEqual(
+            [candidate.name for candidate in substitution.candidates], ['Bala', 'Chitra', 'Farid', 'Gita'],
+        )
+        self.assertEqual(substitution.candidates[3].headroom, 2)
+        self.assertEqual(len(recommend(self.asha, date(2026, 6, 1), date(2026, 6, 9), limit=2)[0].candidates), 2)
+
+    def test_range_covers_every_lecture_in_day_order(self):
+        substitutions = recommend(self.asha, date(2026, 6, 1), date(2026, 6, 7))
+        self.assertEqual([substitution.lecture.day for substitution in substitutions], ['Monday', 'Wednesday'])
+        self.assertEqual(recommend(self.asha, date(2026, 6, 2), date(2026, 6, 2)), [])
+        with self.assertRaises(ValueError):
+            recommend(self.asha, date(2026, 6, 2), date(2026, 6, 1))
+
+    def test_api(self):
+        self.client.force_login(User.objects.create_user('staff', password='secret'))
+        url = f'/api/faculties/{self.asha.pk}/substitutes/'
+        results = self.client.get(url, {'start': '2026-06-01'}).json()['results']
+        self.assertEqual(results[0]['candidates'][0]['name'], 'Bala')
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+
+# ===============================
+# ⭐ Clash engine
+# ===============================
+class IntervalIndexTests(SimpleTestCase):
+
+    def setUp(self):
+        slots = [
+            TimeSlot(id=1, slot_key='2-3', display_name='2:00 pm to 3:00 pm'),
+            TimeSlot(id=2, slot_key='3-4', display_name='3:00 pm to 4:00 pm'),
+            TimeSlot(id=3, slot_key='2-4', display_name='2:00 pm to 4:00 pm'),
+            TimeSlot(id=4, slot_key='extra', display_name='Extra class'),
+        ]
+        self.index = IntervalIndex(slots)
+
+    def test_practical_overlaps_both_hours_but_hours_do_not_overlap_each_other(self):
+        self.index.add(10, faculty_id=1, division='A', day='Monday', slot_id=1)
+        self.index.add(11, faculty_id=1, division='A', day='Monday', slot_id=2)
+
+        self.assertEqual(sorted(self.index.overlapping('faculty', 1, 'Monday', 3)), [10, 11])
+        self.assertEqual(self.index.overlapping('faculty', 1, 'Monday', 2, exclude=11), [])
+        self.assertEqual(self.index.overlapping('faculty', 1, 'Tuesday', 3), [])
+        self.assertEqual(self.index.overlapping('faculty', 2, 'Monday', 3), [])
+
+    def test_unparsable_slot_only_clashes_with_itself(self):
+        self.index.add(10, faculty_id=1, division='A', day='Monday', slot_id=4)
+        self.assertEqual(self.index.overlapping('faculty', 1, 'Monday', 3), [])
+        self.assertEqual(self.index.overlapping('faculty', 1, 'Monday', 4), [10])
+
+    def test_conflicts_by_resource(self):
+        self.index.add(10, faculty_id=1, division='A', day='Monday', slot_id=3, room_id=7)
+        self.assertEqual(
+            self.index.conflicts(faculty_id=2, division='B', day='Monday', slot_id=1, room_id=7), {'room': [10]},
+        )
+        self.assertEqual(
+            self.index.conflicts(faculty_id=1, division='A', day='Monday', slot_id=2),
+            {'faculty': [10], 'division': [10]},
+        )
+
+    def test_sweep_reports_each_overlapping_pair_once(self):
+        self.index.add(10, faculty_id=1, division='A', day='Monday', slot_id=3)
+        self.index.add(11, faculty_id=1, division='B', day='Monday', slot_id=1)
+        self.index.add(12, faculty_id=1, division='C', day='Monday', slot_id=2)
+
+        clashes = [(clash.kind, clash.key, clash.first, clash.second) for clash in self.index.sweep()]
+        self.assertEqual(sorted(clashes), [('faculty', 1, 10, 11), ('faculty', 1, 10, 12)])
+
+
+class LectureClashTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.asha, self.bala = self.faculty('Asha'), self.faculty('Bala')
+        self.maths = self.subject('Maths')
+        self.lab = Room.objects.create(name='Lab 1', room_type='lab', capacity=30)
+        self.practical_slot()
+
+    def test_clean_rejects_overlapping_slots(self):
+        self.lecture(self.asha, self.maths, 'Monday', '2-3', division='A', room=self.lab)
+
+        for faculty, division, room in ((self.asha, 'B', None), (self.bala, 'A', None), (self.bala, 'B', self.lab)):
+            lecture = Lecture(
+                faculty=faculty, subject=self.maths, division=division, day='Monday',
+                time_slot=self.slots['2-4'], room=room,
+            )
+            with self.assertRaises(ValidationError):
+                lecture.full_clean()
+
+        Lecture(
+            faculty=self.bala, subject=self.maths, division='B', day='Monday', time_slot=self.slots['3-4'], room=self.lab,
+        ).full_clean()
+
+    def test_slot_missing_from_the_cached_matrix_is_still_checked(self):
+        self.lecture(self.asha, self.maths, 'Monday', '3-4')
+        get_overlap_matrix()
+        # a slot created by another worker: this process never sees the version bump
+        with mock.patch('workload.cache.bump'):
+            evening = TimeSlot.objects.create(slot_key='3:30-5', display_name='3:30 pm to 5:00 pm', sort_order=8)
+
+        lecture = Lecture(faculty=self.asha, subject=self.maths, division='B', day='Monday', time_slot=evening)
+        with self.assertRaises(ValidationError):
+            lecture.full_clean()
+
+    def test_slot_retimed_by_another_worker_is_checked_as_stored(self):
+        self.lecture(self.asha, self.maths, 'Monday', '9-10')
+        get_overlap_matrix()
+        with mock.patch('workload.cache.bump'):
+            later = self.slots['10-11']
+            later.display_name = '9:30 am to 10:30 am'
+            later.save()
+
+        lecture = Lecture(faculty=self.asha, subject=self.maths, division='B', day='Monday', time_slot=later)
+        with self.assertRaises(ValidationError):
+            lecture.full_clean()
+
+    def test_room_cannot_be_booked_twice_in_one_slot(self):
+        self.lecture(self.asha, self.maths, 'Monday', '9-10', division='A', room=self.lab)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.lecture(self.bala, self.maths, 'Monday', '9-10', division='B', room=self.lab)
+
+    def test_find_clashes_over_stored_lectures(self):
+        # bulk_create skips clean(), as an unchecked import would
+        Lecture.objects.bulk_create([
+            Lecture(faculty=self.asha, subject=self.maths, division='A', day='Friday', time_slot=self.slots['2-4']),
+            Lecture(faculty=self.asha, subject=self.maths, division='B', day='Friday', time_slot=self.slots['3-4']),
+            Lecture(faculty=self.bala, subject=self.maths, division='C', day='Friday', time_slot=self.slots['2-3']),
+        ])
+        clashes = find_clashes()
+        self.assertEqual([(clash.kind, clash.key, clash.day) for clash in clashes], [('faculty', self.asha.pk, 'Friday')])
+
+
+class SlotIntervalTests(WorkloadTestCase):
+
+    def test_minutes_are_stored_on_save(self):
+        slot = self.practical_slot()
+        self.assertEqual(slot.interval, (14 * 60, 16 * 60))
+
+        slot.display_name = '1:30 pm to 3:30 pm'
+        slot.save(update_fields=['display_name'])
+        self.assertEqual(TimeSlot.objects.get(pk=slot.pk).interval, (13 * 60 + 30, 15 * 60 + 30))
+
+        slot.display_name = 'after lunch'
+        with self.assertRaises(ValidationError):
+            slot.full_clean()
+
+    def test_overlap_matrix_is_cached_per_slot_table_version(self):
+        practical = self.practical_slot()
+        matrix = get_overlap_matrix()
+        self.assertEqual(matrix[practical.id], {practical.id, self.slots['2-3'].id, self.slots['3-4'].id})
+        self.assertEqual(matrix[self.slots['2-3'].id], {self.slots['2-3'].id, practical.id})
+        with self.assertNumQueries(0):
+            get_overlap_matrix()
+
+    def test_synthetic_slot_set_bumps_the_timeslot_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            TimeSlot.objects.all().delete()
+
+        # bulk_create sends no signals, so generate() has to bump the version itself
+        with mock.patch.object(cache, 'bump', wraps=cache.bump) as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                generate(faculties=1, subjects=1, timeslots=['9-10', '9-11'], fill=0)
+        bump.assert_any_call('timeslot')
+        nine, practical = TimeSlot.objects.order_by('sort_order')
+        self.assertEqual(get_overlap_matrix()[nine.id], {nine.id, practical.id})
+
+    def test_grid_marks_cells_covered_by_a_practical(self):
+        self.practical_slot()
+        lecture = self.lecture(self.faculty('Asha'), self.subject('Maths'), 'Monday', '2-4')
+        grid = build_division_grid('A')
+
+        self.assertEqual(grid.covered, {('2-3', 'Monday'): lecture, ('3-4', 'Monday'): lecture})
+        row = next(row for row in grid.rows if row.get('key') == '3-4')
+        self.assertEqual(row['entries'][0], (None, lecture))
+
+
+# ===============================
+# ⭐ Timetable audit
+# ===============================
+class AuditCommandTests(WorkloadTestCase):
+
+    def audit(self, *args):
+        out = io.StringIO()
+        call_command('audit_timetable', *args, stdout=out, stderr=io.StringIO())
+        return [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_clean_timetable(self):
+        self.lecture(self.faculty('Asha'), self.subject('Maths'), 'Monday', '9-10')
+        *issues, summary = self.audit('--fail-on-issues')
+        self.assertEqual(issues, [])
+        self.assertEqual((summary['lectures'], summary['issues']), (1, 0))
+
+    def test_reports_overlaps_overloads_and_stale_workload(self):
+        self.practical_slot()
+        asha, maths = self.faculty('Asha', max_hours=2), self.subject('Maths')
+        # bulk_create skips clean() and the workload signals, as a raw import would
+        practical, hour = Lecture.objects.bulk_create([
+            Lecture(faculty=asha, subject=maths, division='A', day='Monday', time_slot=self.slots['2-4']),
+            Lecture(faculty=asha, subject=maths, division='B', day='Monday', time_slot=self.slots['3-4']),
+        ])
+
+        *issues, summary = self.audit()
+        by_type = {issue['type']: issue for issue in issues}
+        self.assertEqual(summary['by_type'], {'faculty_overlap': 1, 'overloaded': 1, 'stale_workload': 1})
+        self.assertEqual(by_type['faculty_overlap']['lectures'], [practical.pk, hour.pk])
+        self.assertEqual(by_type['faculty_overlap']['slots'], ['2-4', '3-4'])
+        self.assertEqual((by_type['overloaded']['hours'], by_type['overloaded']['max_hours']), (3, 2))
+        self.assertEqual(by_type['stale_workload']['stored_hours'], 0)
+
+        with self.assertRaises(CommandError):
+            self.audit('--fail-on-issues')
+
+
+# ===============================
+# ⭐ Bulk operations
+# ===============================
+class BulkOperationTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.asha, self.bala = self.faculty('Asha'), self.faculty('Bala')
+        self.maths, self.physics = self.subject('Maths'), self.subject('Physics')
+
+    def cells(self, division=None):
+        lectures = Lecture.objects.all() if division is None else Lecture.objects.filter(division=division)
+        return sorted(lectures.values_list('subject__subject_name', 'division', 'day', 'time_slot__slot_key'))
+
+    def test_swap_within_a_division(self):
+        # saving these one by one would hit unique_division_day_time_slot halfway
+        first = self.lecture(self.asha, self.maths, 'Monday', '9-10')
+        second = self.lecture(self.bala, self.physics, 'Monday', '10-11')
+        swap(first, second)
+
+        self.assertEqual(self.cells(), [('Maths', 'A', 'Monday', '10-11'), ('Physics', 'A', 'Monday', '9-10')])
+        self.assertFalse(Lecture.objects.filter(day__startswith='~').exists())
+
+    def test_swap_that_would_clash_changes_nothing(self):
+        first = self.lecture(self.asha, self.maths, 'Monday', '9-10', division='A')
+        second = self.lecture(self.bala, self.physics, 'Tuesday', '10-11', division='B')
+        self.lecture(self.asha, self.physics, 'Tuesday', '10-11', division='C')
+        before = self.cells()
+
+        with self.assertRaises(BulkOperationError) as raised:
+            swap(first, second)
+        self.assertEqual(len(raised.exception.errors), 1)
+        self.assertIn('faculty', raised.exception.errors[0])
+        self.assertEqual(self.cells(), before)
+
+    def test_move_checks_the_moved_lectures_against_each_other(self):
+        lectures = [
+            self.lecture(self.asha, self.maths, 'Monday', '9-10'),
+            self.lecture(self.bala, self.physics, 'Monday', '10-11'),
+        ]
+        before = self.cells()
+        with self.assertRaises(BulkOperationError):
+            move(Lecture.objects.select_related('time_slot'), time_slot=self.slots['2-3'])
+        self.assertEqual(self.cells(), before)
+
+        move([lectures[0]], day='Wednesday')
+        self.assertEqual(Lecture.objects.get(pk=lectures[0].pk).day, 'Wednesday')
+
+    def test_copy_division(self):
+        self.lecture(self.asha, self.maths, 'Monday', '9-10', division='A')
+        self.lecture(self.bala, self.physics, 'Monday', '10-11', division='A')
+        self.lecture(self.bala, self.physics, 'Monday', '9-10', division='B')
+        chitra, dev = self.faculty('Chitra'), self.faculty('Dev')
+
+        # the originals stay, so a teacher kept on a copy would always clash
+        with self.assertRaises(BulkOperationError) as raised:
+            copy_division('A', 'C', {self.asha.pk: chitra})
+        self.assertEqual(raised.exception.errors, ["Choose who teaches the copies of Bala's lectures"])
+        self.assertEqual(self.cells('C'), [])
+
+        copy_division('A', 'B', {self.asha.pk: chitra, self.bala.pk: dev}, replace=True)
+        self.assertEqual(self.cells('B'), [('Maths', 'B', 'Monday', '9-10'), ('Physics', 'B', 'Monday', '10-11')])
+        self.assertEqual(
+            sorted(Lecture.objects.filter(division='B').values_list('faculty__name', 'time_slot__slot_key')),
+            [('Chitra', '9-10'), ('Dev', '10-11')],
+        )
+
+    def test_copy_action_asks_for_a_teacher_per_source_faculty(self):
+        lectures = [
+            self.lecture(self.asha, self.maths, 'Monday', '9-10'),
+            self.lecture(self.bala, self.physics, 'Monday', '10-11'),
+        ]
+        chitra = self.faculty('Chitra')
+        self.client.force_login(User.objects.create_superuser('admin', password='secret'))
+        data = {'action': 'copy_lectures', '_selected_action': [lecture.pk for lecture in lectures]}
+
+        form = self.client.post('/admin/workload/lecture/', data).context['form']
+        self.assertEqual(list(form.fields), ['division', 'replace', f'faculty_{self.asha.pk}', f'faculty_{self.bala.pk}'])
+
+        data.update({'apply': 'Apply', 'division': 'B', f'faculty_{self.asha.pk}': chitra.pk})
+        response = self.client.post('/admin/workload/lecture/', data)
+        self.assertIn(f'faculty_{self.bala.pk}', response.context['form'].errors)
+        self.assertEqual(self.cells('B'), [])
+
+        data[f'faculty_{self.bala.pk}'] = self.asha.pk
+        self.assertRedirects(self.client.post('/admin/workload/lecture/', data), '/admin/workload/lecture/')
+        self.assertEqual(
+            sorted(Lecture.objects.filter(division='B').values_list('faculty__name', 'time_slot__slot_key')),
+            [('Asha', '10-11'), ('Chitra', '9-10')],
+        )
+
+
+# ===============================
+# ⭐ Timetable snapshots
+# ===============================
+class SnapshotTests(WorkloadTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.asha, self.bala = self.faculty('Asha'), self.faculty('Bala')
+        self.maths = self.subject('Maths')
+        self.lab = Room.objects.create(name='Lab 1', room_type='lab', capacity=30)
+        self.first = self.lecture(self.asha, self.maths, 'Monday', '9-10', division='A', room=self.lab)
+        self.second = self.lecture(self.bala, self.maths, 'Friday', '2-3', division='A')
+        self.lecture(self.bala, self.maths, 'Monday', '9-10', division='B')
+
+    def live_cells(self, division):
+        return {
+            (DAY_INDEX[day], slot_id): (faculty_id, subject_id, room_id or 0)
+            for day, slot_id, faculty_id, subject_id, room_id in Lecture.objects.filter(division=division)
+            .values_list('day', 'time_slot_id', 'faculty_id', 'subject_id', 'room_id')
+        }
+
+    def test_pack_round_trip(self):
+        rows = [(4, 7, 3, 2, 0), (0, 1, 1, 2, 9)]
+        self.assertEqual(unpack(pack(rows)), {(0, 1): (1, 2, 9), (4, 7): (3, 2, 0)})
+        self.assertEqual(pack(rows), pack(reversed(rows)))
+
+    def test_snapshot_holds_the_live_rows(self):
+        snapshots = publish(label='week 1')
+        snapshot, created = snapshots['A']
+        self.assertTrue(created)
+        self.assertEqual(snapshot.lecture_count, 2)
+        self.assertEqual(unpack(snapshot.data), self.live_cells('A'))
+        self.assertEqual(unpack(snapshots['C'][0].data), {})
+
+    def test_publish_only_stores_changed_divisions(self):
+        publish()
+        self.assertEqual(TimetableSnapshot.objects.count(), 4)
+        self.assertFalse(any(created for _, created in publish().values()))
+
+        self.second.delete()
+        result = publish()
+        self.assertEqual([division for division, (_, created) in sorted(result.items()) if created], ['A'])
+        self.assertEqual(TimetableSnapshot.objects.count(), 5)
+
+    def test_diff(self):
+        old = publish()['A'][0]
+        self.second.delete()
+        Lecture.objects.filter(pk=self.first.pk).update(faculty=self.faculty('Chitra'), room=None)
+        self.lecture(self.asha, self.maths, 'Tuesday', '10-11', division='A')
+
+        live = diff(old)
+        self.assertEqual(live.counts(), {'added': 1, 'removed': 1, 'changed': 1})
+        self.assertEqual(diff(old, publish()['A'][0]).counts(), live.counts())
+        self.assertFalse(diff(old, old))
+
+        changed = next(row for row in live.rows() if row['change'] == 'changed')
+        self.assertEqual(changed['before'], {'faculty': 'Asha', 'subject': 'Maths', 'room': 'Lab 1'})
+        self.assertEqual(changed['after'], {'faculty': 'Chitra', 'subject': 'Maths', 'room': None})
+
+    def test_rollback_restores_deleted_and_moved_lectures(self):
+        snapshot = publish()['A'][0]
+        self.first.delete()
+        move([Lecture.objects.select_related('time_slot').get(pk=self.second.pk)], day='Saturday')
+        self.lecture(self.asha, self.maths, 'Tuesday', '10-11', division='A')
+
+        self.assertEqual(rollback(snapshot), 4)
+        self.assertEqual(self.live_cells('A'), unpack(snapshot.data))
+        self.assertFalse(diff(snapshot))
+        self.assertEqual(rollback(snapshot), 0)
+
+    def test_rollback_that_would_clash_changes_nothing(self):
+        snapshot = publish()['A'][0]
+        self.first.delete()
+        # Asha now teaches division C at the time the snapshot had her in A
+        self.lecture(self.asha, self.maths, 'Monday', '9-10', division='C')
+        before = self.live_cells('A')
+
+        with self.assertRaises(BulkOperationError):
+            rollback(snapshot)
+        self.assertEqual(self.live_cells('A'), before)
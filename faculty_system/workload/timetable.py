@@ -0,0 +1,183 @@
+import asyncio
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+
+from . import cache
+from .models import Lecture, TimeSlot, DEFAULT_TIME_SLOTS, DAY_CHOICES
+from .slots import overlap_map
+
+
+# ===============================
+# ⭐ Break rows shown between lecture slots
+#    (slot_key after which the break appears, row type, time label, title)
+# ===============================
+BREAK_ROWS = [
+    ('10-11', 'short_break', '11:00 am to 11:15 am', 'SHORT BREAK'),
+    ('12:15-1:15', 'lunch_break', '1:15 pm to 2:00 pm', 'LUNCH BREAK'),
+]
+
+DAYS = [day for day, _ in DAY_CHOICES]
+
+
+def get_timeslots():
+    """Return the ordered `TimeSlot` catalogue, seeding the defaults on first use."""
+    timeslots = list(TimeSlot.objects.order_by('sort_order'))
+    if not timeslots:
+        for slot_key, display_name, sort_order, duration in DEFAULT_TIME_SLOTS:
+            TimeSlot.objects.get_or_create(
+                slot_key=slot_key,
+                defaults={'display_name': display_name, 'sort_order': sort_order, 'duration_hours': duration}
+            )
+        timeslots = list(TimeSlot.objects.order_by('sort_order'))
+    return timeslots
+
+
+def get_overlap_matrix():
+    """`{slot_id: ids of every slot it overlaps}` for the whole catalogue.
+
+    Computed once per version of the TimeSlot table and served from the
+    cache, so the grid only pays a dictionary lookup.
+    """
+    return cache.get_or_build('slot_overlaps', ('timeslot',), lambda: overlap_map(get_timeslots()))
+
+
+class TimetableGrid:
+    """A weekly (slot x day) grid built from an already loaded list of lectures.
+
+    `cells` is indexed by `(slot_key, day)`; `rows` holds the lecture rows in
+    slot order with the break rows inserted, each lecture row carrying its
+    `cells` list in `days` order so templates and the PDF renderer can walk it
+    without further lookups.
+
+    An empty cell whose time is taken by a lecture in an overlapping slot
+    (the 2-3 row under a 2-4 practical) has that lecture in `covered`; each
+    lecture row also carries `entries`, its `(lecture, covering lecture)`
+    pairs, so templates can show such cells as taken.
+    """
+
+    def __init__(self, lectures, timeslots, days=None, overlaps=None):
+        self.days = list(days or DAYS)
+        self.timeslots = list(timeslots)
+        self.lectures = list(lectures)
+
+        # first lecture wins, matching the old `.first()` per-cell lookup
+        self.cells = {}
+        for lecture in self.lectures:
+            self.cells.setdefault((lecture.time_slot.slot_key, lecture.day), lecture)
+
+        if overlaps is None:
+            overlaps = overlap_map(self.timeslots)
+        slot_keys = {slot.id: slot.slot_key for slot in self.timeslots}
+        self.covered = {}
+        for slot in self.timeslots:
+            others = [slot_keys[other] for other in overlaps.get(slot.id, ()) if other != slot.id and other in slot_keys]
+            for day in self.days:
+                if (slot.slot_key, day) in self.cells:
+                    continue
+                for other_key in others:
+                    lecture = self.cells.get((other_key, day))
+                    if lecture is not None:
+                        self.covered[(slot.slot_key, day)] = lecture
+                        break
+
+        breaks_after = {slot_key: (row_type, label, title) for slot_key, row_type, label, title in BREAK_ROWS}
+
+        self.rows = []
+        for slot in self.timeslots:
+            self.rows.append({
+                'type': 'lecture',
+                'key': slot.slot_key,
+                'label': slot.display_name,
+                'slot': slot,
+                'cells': [self.cells.get((slot.slot_key, day)) for day in self.days],
+                'entries': [
+                    (self.cells.get((slot.slot_key, day)), self.covered.get((slot.slot_key, day)))
+                    for day in self.days
+                ],
+            })
+
+            if slot.slot_key in breaks_after:
+                row_type, label, title = breaks_after[slot.slot_key]
+                self.rows.append({
+                    'type': row_type,
+                    'key': row_type,
+                    'label': label,
+                    'title': title,
+                })
+
+    def get(self, slot_key, day):
+        return self.cells.get((slot_key, day))
+
+    def as_nested_dict(self):
+        """Return `{slot_key: {day: lecture}}`, the shape the dashboard template used."""
+        return {
+            slot.slot_key: {day: self.cells.get((slot.slot_key, day)) for day in self.days}
+            for slot in self.timeslots
+        }
+
+
+def division_lectures(division):
+    return (
+        Lecture.objects.filter(division=division)
+        .select_related('faculty', 'subject', 'time_slot')
+        .order_by('pk')
+    )
+
+
+def build_division_grid(division, timeslots=None):
+    """Build the weekly grid for `division` with a fixed number of queries.
+
+    One query loads the slot catalogue (skipped when `timeslots` is passed in)
+    and one `select_related` query loads the whole week, however many slots
+    and days there are.
+    """
+    if timeslots is None:
+        timeslots = get_timeslots()
+    return TimetableGrid(division_lectures(division), timeslots)
+
+
+async def aget_timeslots():
+    """Async `get_timeslots` (seeding, which writes, still runs in a thread)."""
+    timeslots = [slot async for slot in TimeSlot.objects.order_by('sort_order')]
+    return timeslots or await sync_to_async(get_timeslots)()
+
+
+async def abuild_division_grid(division):
+    """Async `build_division_grid`: the slot and lecture queries run concurrently."""
+    timeslots, lectures = await asyncio.gather(
+        aget_timeslots(),
+        _alist(division_lectures(division)),
+    )
+    return TimetableGrid(lectures, timeslots)
+
+
+async def _alist(queryset):
+    return [obj async for obj in queryset]
+
+
+def build_faculty_grid(faculty, timeslots=None):
+    """Build the personal weekly grid of one faculty (same fixed query count)."""
+    if timeslots is None:
+        timeslots = get_timeslots()
+    lectures = (
+        Lecture.objects.filter(faculty=faculty)
+        .select_related('faculty', 'subject', 'time_slot')
+        .order_by('pk')
+    )
+    return TimetableGrid(lectures, timeslots)
+
+
+def build_grids(lectures, key, timeslots=None):
+    """Group already loaded `lectures` by `key(lecture)` into one grid per key.
+
+    Lets a batch job load every lecture with one query and still produce a
+    grid per division, per faculty, and so on.
+    """
+    if timeslots is None:
+        timeslots = get_timeslots()
+    overlaps = overlap_map(timeslots)
+    groups = defaultdict(list)
+    for lecture in lectures:
+        groups[key(lecture)].append(lecture)
+    return {group: TimetableGrid(items, timeslots, overlaps=overlaps) for group, items in groups.items()}
@@ -1,5 +1,12 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, views
+
+# ⭐ Async variants for ASGI deployments (see views.dashboard_async)
+if getattr(settings, 'WORKLOAD_ASYNC_VIEWS', False):
+    home_view, pdf_view = views.home_async, views.download_timetable_pdf_async
+else:
+    home_view, pdf_view = views.home, views.download_timetable_pdf
 
 urlpatterns = [
     # ⭐ Login System
@@ -9,8 +16,24 @@ urlpatterns = [
 
     # ⭐ Dashboard
     # Use `home` wrapper to enforce redirect to login when unauthenticated
-    path('', views.home, name='dashboard'),
+    path('', home_view, name='dashboard'),
 
     # ⭐ PDF Download (Login Required)
-    path('download-pdf/', views.download_timetable_pdf, name='download_pdf'),
+    path('download-pdf/', pdf_view, name='download_pdf'),
+
+    # ⭐ Streaming exports (CSV / iCalendar)
+    path('export/timetable.csv', views.export_timetable_csv, name='export_timetable_csv'),
+    path('export/workload.csv', views.export_workload_csv, name='export_workload_csv'),
+    path('export/faculty/<int:faculty_id>.ics', views.export_faculty_calendar, name='export_faculty_calendar'),
+    path('calendar/<str:token>.ics', views.faculty_calendar_feed, name='faculty_calendar_feed'),
+
+    # ⭐ Live dashboard updates (server-sent events, ASGI only)
+    path('events/', views.timetable_events, name='timetable_events'),
+
+    # ⭐ Read-only JSON API
+    path('api/divisions/<str:division>/timetable/', api.division_timetable, name='api_division_timetable'),
+    path('api/faculties/<int:faculty_id>/timetable/', api.faculty_timetable, name='api_faculty_timetable'),
+    path('api/faculties/<int:faculty_id>/substitutes/', api.faculty_substitutes, name='api_faculty_substitutes'),
+    path('api/free-slots/', api.free_slots, name='api_free_slots'),
+    path('api/workload/', api.workload_summary, name='api_workload'),
 ]
\ No newline at end of file
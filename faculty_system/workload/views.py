@@ -1,6 +1,7 @@
 from django.shortcuts import render, redirect
-from .models import Faculty, Subject, Lecture, TimeSlot, DEFAULT_TIME_SLOTS, DAY_CHOICES
-from django.db.models import Sum
+from .models import Faculty, Subject, Lecture, UserSession, DIVISION_CHOICES
+from .timetable import build_division_grid
+from . import cache
 
 # ⭐ LOGIN SYSTEM IMPORTS
 from django.contrib.auth import authenticate, login, logout
@@ -10,16 +11,34 @@ from django.conf import settings
 from django.contrib.sessions.models import Session
 
 # ⭐ PDF GENERATION IMPORTS
+#    ReportLab is only loaded by `workload.pdf`, which is imported inside the
+#    PDF view so workers and manage.py commands do not pay for it at startup.
 from django.http import HttpResponse
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib import colors
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from . import pdf_cache
 from datetime import datetime
-import io
 import json
-import matplotlib.pyplot as plt
+
+# ⭐ STREAMING EXPORT IMPORTS
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from . import exports
+
+# ⭐ LIVE UPDATE (SSE) IMPORTS
+from . import events
+
+# ⭐ ASYNC VIEW IMPORTS
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from .timetable import _alist, abuild_division_grid
+
+
+DIVISIONS = [code for code, _ in DIVISION_CHOICES]
 
 
 # ===============================
@@ -28,31 +47,16 @@ import matplotlib.pyplot as plt
 def expire_other_sessions(user, current_session_key=None):
     """Expire/delete other sessions belonging to `user` except the current session.
 
-    Iterates over all `Session` objects, decodes them and removes any session whose
-    `_auth_user_id` matches `user.pk` and whose key is not `current_session_key`.
+    Uses the indexed `UserSession` user -> session key table, so the old
+    sessions go in one DELETE instead of decoding every stored session.
+    Rows are recorded for every login by `signals.user_logged_in_handler`.
     """
-    try:
-        all_sessions = Session.objects.all()
-    except Exception:
-        return
-
-    uid_str = str(user.pk)
+    others = UserSession.objects.filter(user=user)
+    if current_session_key:
+        others = others.exclude(session_key=current_session_key)
 
-    for s in all_sessions:
-        # skip the current session if provided
-        if current_session_key and s.session_key == current_session_key:
-            continue
-
-        try:
-            data = s.get_decoded()
-        except Exception:
-            continue
-
-        if data.get('_auth_user_id') == uid_str:
-            try:
-                s.delete()
-            except Exception:
-                pass
+    Session.objects.filter(session_key__in=others.values('session_key')).delete()
+    others.delete()
 
 # ===============================
 # ⭐ FACULTY LOGIN VIEW
@@ -148,115 +152,65 @@ def faculty_logout(request):
 # ===============================
 # ⭐ DASHBOARD (LOGIN REQUIRED)
 # ===============================
-@login_required(login_url='/login/')
-def dashboard(request):
+def build_dashboard_data(selected_division):
+    """Compute everything the dashboard shows for one division."""
 
     # ===============================
-    # ⭐ Selected Division (Default = A)
+    # ⭐ Faculty Workload (hours, % of own max_hours and status computed in SQL)
     # ===============================
-    selected_division = request.GET.get('division', 'A')
+    faculties = list(Faculty.objects.with_workload().order_by('-total_hours', 'name'))
 
     # ===============================
-    # ⭐ Division wise lectures
+    # ⭐ Weekly Grid Timetable (one query for the whole week)
     # ===============================
-    lectures = Lecture.objects.filter(division=selected_division)
+    grid = build_division_grid(selected_division)
 
-    # ===============================
-    # ⭐ Faculty Workload Calculation
-    # ===============================
-    faculties = Faculty.objects.annotate(
-        total_lectures=Sum('lecture__time_slot__duration_hours')
-    ).order_by('-total_lectures', 'name')
+    counts = (Faculty.objects.count(), Subject.objects.count(), Lecture.objects.count())
+    return dashboard_context(faculties, grid, counts)
 
-    # ===============================
-    # 🔥 WORKLOAD / OVERLOAD LOGIC (14 lecture hours = normal)
-    # ===============================
-    MAX_NORMAL_LECTURES = 14
-    for f in faculties:
-        total_hours = int(f.total_lectures or 0)
-        # percentage based on 14 lecture-hours as 100%
-        pct = int(round((total_hours / MAX_NORMAL_LECTURES) * 100)) if total_hours else 0
-
-        f.total_lectures = total_hours
-        f.load_pct = pct
-        if total_hours > MAX_NORMAL_LECTURES:
-            f.status = "Overloaded"
-        else:
-            f.status = "Normal"
+
+def dashboard_context(faculties, grid, counts):
+    """Assemble the dashboard context from already loaded data (sync and async views)."""
 
     # ===============================
-    # ⭐ Weekly Grid Timetable Setup (Image-style layout)
+    # ⭐ Chart.js Graph Data
     # ===============================
-    days = [day for day, _ in DAY_CHOICES]
-
-    timeslots = list(TimeSlot.objects.order_by('sort_order'))
-    if not timeslots:
-        for slot_key, display_name, sort_order, duration in DEFAULT_TIME_SLOTS:
-            TimeSlot.objects.get_or_create(
-                slot_key=slot_key,
-                defaults={'display_name': display_name, 'sort_order': sort_order, 'duration_hours': duration}
-            )
-        timeslots = list(TimeSlot.objects.order_by('sort_order'))
-
-    timetable_rows = []
-    for slot in timeslots:
-        timetable_rows.append({
-            'type': 'lecture',
-            'key': slot.slot_key,
-            'label': slot.display_name,
-        })
-
-        if slot.slot_key == '10-11':
-            timetable_rows.append({
-                'type': 'short_break',
-                'key': 'short_break',
-                'label': '11:00 am to 11:15 am',
-            })
-
-        if slot.slot_key == '12:15-1:15':
-            timetable_rows.append({
-                'type': 'lunch_break',
-                'key': 'lunch_break',
-                'label': '1:15 pm to 2:00 pm',
-            })
+    faculty_names_json = json.dumps([f.name for f in faculties])
+    lecture_counts_json = json.dumps([f.total_hours for f in faculties])
+
+    faculty_count, subjects_count, lectures_count = counts
+    return {
+        'faculty_count': faculty_count,
+        'subjects_count': subjects_count,
+        'lectures_count': lectures_count,
+        'lectures': grid.lectures,
+        'faculties': faculties,
+        'days': grid.days,
+        'timetable_rows': grid.rows,
+        'faculty_names_json': faculty_names_json,
+        'lecture_counts_json': lecture_counts_json,
+    }
 
-    timetable = {}
-    for row in timetable_rows:
-        if row['type'] != 'lecture':
-            continue
 
-        timetable[row['key']] = {}
-        for day in days:
-            lecture = Lecture.objects.filter(
-                day=day,
-                time_slot__slot_key=row['key'],
-                division=selected_division
-            ).select_related('faculty', 'subject', 'time_slot').first()
-            timetable[row['key']][day] = lecture
+@login_required(login_url='/login/')
+def dashboard(request):
 
     # ===============================
-    # ⭐ Chart.js Graph Data
+    # ⭐ Selected Division (Default = A)
     # ===============================
-    faculty_names_json = json.dumps([f.name for f in faculties])
-    lecture_counts_json = json.dumps([int(f.total_lectures or 0) for f in faculties])
+    selected_division = request.GET.get('division', 'A')
 
     # ===============================
-    # ⭐ Context Data
+    # ⭐ Context Data (cached per division until any table changes)
     # ===============================
-    context = {
-        'faculty_count': Faculty.objects.count(),
-        'subjects_count': Subject.objects.count(),
-        'lectures_count': Lecture.objects.count(),
-        'lectures': lectures,
-        'faculties': faculties,
-        'days': days,
-        'timetable_rows': timetable_rows,
-        'timetable': timetable,
-        'faculty_names_json': faculty_names_json,
-        'lecture_counts_json': lecture_counts_json,
-        'selected_division': selected_division
-    }
+    if selected_division in DIVISIONS:
+        data = cache.get_or_build(
+            'dashboard', cache.TABLES, lambda: build_dashboard_data(selected_division), selected_division,
+        )
+    else:
+        data = build_dashboard_data(selected_division)
 
+    context = {**data, 'selected_division': selected_division, 'live_updates': live_updates_enabled()}
     return render(request, 'dashboard.html', context)
 
 
@@ -280,174 +234,241 @@ def download_timetable_pdf(request):
     """
     Generate and download ONLY the weekly timetable grid as PDF.
     Shows exactly what appears on the dashboard.
+
+    Rendered files are cached on disk under a hash of the grid, which is
+    also the ETag, so repeat downloads are a file read and conditional GETs
+    get a 304.
     """
+    from . import pdf
+
+    # Get division filter (default to 'A'); it also names the cached files
+    selected_division = request.GET.get('division', 'A')
+    if selected_division not in DIVISIONS:
+        raise Http404('Unknown division')
+
     try:
-        # Get division filter (default to 'A')
-        selected_division = request.GET.get('division', 'A')
+        # Same grid as the dashboard (day columns, time rows, merged break rows)
+        grid = build_division_grid(selected_division)
+        spec = pdf.grid_spec(grid, f"Weekly Timetable — Division {selected_division}")
+
+        scope = pdf_cache.division_scope(selected_division)
+        digest = pdf_cache.spec_digest(spec)
+        etag = f'"{digest}"'
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=pdf_cache.last_modified(scope, digest),
+        )
+        if not_modified is not None:
+            return not_modified
+
+        # Build PDF (landscape for better grid visibility) unless it is cached
+        path, _ = pdf_cache.get_or_render(scope, spec, pdf.render_bytes)
 
-        # Create HTTP response with PDF content
-        response = HttpResponse(content_type='application/pdf')
+        response = HttpResponse(path.read_bytes(), content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="timetable_{selected_division}_{datetime.now().strftime("%Y%m%d")}.pdf"'
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(path.stat().st_mtime)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
 
-        # Create PDF document (use landscape for better grid visibility)
-        doc = SimpleDocTemplate(
-            response,
-            pagesize=landscape(letter),
-            rightMargin=0.4*inch,
-            leftMargin=0.4*inch,
-            topMargin=0.4*inch,
-            bottomMargin=0.4*inch,
-        )
+    except Exception as e:
+        return HttpResponse(f"Error generating PDF: {str(e)}", status=500)
 
-        # Build PDF content
-        story = []
-        styles = getSampleStyleSheet()
-
-        # Simple title style
-        title_style = ParagraphStyle(
-            'Title',
-            parent=styles['Normal'],
-            fontSize=16,
-            textColor=colors.HexColor('#1e3a8a'),
-            spaceAfter=12,
-            alignment=1,
-            fontName='Helvetica-Bold',
-        )
 
-        # Add title only
-        story.append(Paragraph(f"Weekly Timetable — Division {selected_division}", title_style))
-
-        # Styles aligned with dashboard timetable content hierarchy
-        header_cell_style = ParagraphStyle(
-            'HeaderCell',
-            parent=styles['Normal'],
-            fontSize=10,
-            leading=12,
-            alignment=1,
-            fontName='Helvetica-Bold',
-            textColor=colors.HexColor('#111827'),
-        )
-        time_cell_style = ParagraphStyle(
-            'TimeCell',
-            parent=styles['Normal'],
-            fontSize=9.5,
-            leading=11,
-            alignment=0,
-            fontName='Helvetica-Bold',
-            textColor=colors.HexColor('#111827'),
-        )
-        lecture_cell_style = ParagraphStyle(
-            'LectureCell',
-            parent=styles['Normal'],
-            fontSize=9,
-            leading=11,
-            alignment=1,
-            fontName='Helvetica',
-            textColor=colors.HexColor('#111827'),
-            wordWrap='CJK',
-        )
-        break_cell_style = ParagraphStyle(
-            'BreakCell',
-            parent=styles['Normal'],
-            fontSize=11,
-            leading=13,
-            alignment=1,
-            fontName='Helvetica-Bold',
-            textColor=colors.HexColor('#111827'),
+# ===============================
+# ⭐ STREAMING EXPORTS (LOGIN REQUIRED)
+#    CSV timetables / workloads and per-faculty .ics calendars, written out
+#    row by row from `.iterator()` querysets.
+# ===============================
+def _stream(lines, content_type, filename):
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@login_required(login_url='/login/')
+def export_timetable_csv(request):
+    """Whole institution by default; `?division=A` or `?faculty=<id>` narrows it."""
+    lectures = Lecture.objects.all()
+    name = 'all'
+    if request.GET.get('division'):
+        if request.GET['division'] not in DIVISIONS:
+            raise Http404('Unknown division')
+        lectures = lectures.filter(division=request.GET['division'])
+        name = f"division_{request.GET['division']}"
+    if request.GET.get('faculty'):
+        faculty = get_object_or_404(Faculty, pk=request.GET['faculty'])
+        lectures = lectures.filter(faculty=faculty)
+        name = f"faculty_{faculty.pk}"
+
+    return _stream(
+        exports.timetable_csv(lectures), 'text/csv',
+        f'timetable_{name}_{datetime.now().strftime("%Y%m%d")}.csv',
+    )
+
+
+@login_required(login_url='/login/')
+def export_workload_csv(request):
+    return _stream(
+        exports.workload_csv(), 'text/csv',
+        f'workload_{datetime.now().strftime("%Y%m%d")}.csv',
+    )
+
+
+@login_required(login_url='/login/')
+def export_faculty_calendar(request, faculty_id):
+    faculty = get_object_or_404(Faculty, pk=faculty_id)
+    return _stream(
+        exports.faculty_calendar(faculty, host=request.get_host()),
+        'text/calendar; charset=utf-8', f'timetable_faculty_{faculty.pk}.ics',
+    )
+
+
+def faculty_calendar_feed(request, token):
+    """Subscription URL for calendar apps, authorised by a signed token instead of a session."""
+    faculty = exports.faculty_from_token(token)
+    if faculty is None:
+        raise Http404('Unknown calendar')
+    return _stream(
+        exports.faculty_calendar(faculty, host=request.get_host()),
+        'text/calendar; charset=utf-8', f'timetable_faculty_{faculty.pk}.ics',
+    )
+
+
+# ===============================
+# ⭐ LIVE DASHBOARD UPDATES (SERVER-SENT EVENTS, ASGI)
+#    Open dashboards subscribe here and receive small lecture/workload
+#    events instead of reloading the whole page. Needs an ASGI server
+#    (uvicorn/daphne) and WORKLOAD_LIVE_UPDATES = True: under WSGI an
+#    endless stream would hold a worker thread per open dashboard, so the
+#    dashboard does not subscribe and this view answers 204 (No Content),
+#    which tells EventSource not to reconnect.
+# ===============================
+SSE_HEARTBEAT = 15
+
+
+def live_updates_enabled():
+    return getattr(settings, 'WORKLOAD_LIVE_UPDATES', False)
+
+
+async def timetable_events(request):
+    if not live_updates_enabled() or not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse('Authentication required', status=401)
+    division = request.GET.get('division')
+
+    async def stream():
+        yield 'retry: 5000\n\n'
+        with events.get_broker().subscribe() as subscription:
+            while True:
+                event = await subscription.get(timeout=SSE_HEARTBEAT)
+                if event is None:
+                    yield ': ping\n\n'
+                elif events.concerns(event, division):
+                    yield events.format_sse(event)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# ===============================
+# ⭐ ASYNC VIEWS (ASGI DEPLOYMENTS)
+#    Same pages as `home`, `dashboard` and `download_timetable_pdf`, but the
+#    independent queries are awaited together and PDF rendering runs in a
+#    bounded process pool, so no request thread is held while ReportLab
+#    works. Enabled in workload.urls with WORKLOAD_ASYNC_VIEWS = True.
+# ===============================
+_render_executor = None
+_render_executor_lock = threading.Lock()
+
+
+def render_executor():
+    """Process pool for CPU-bound PDF rendering (WORKLOAD_PDF_RENDER_WORKERS processes)."""
+    global _render_executor
+    if _render_executor is None:
+        with _render_executor_lock:
+            if _render_executor is None:
+                workers = getattr(settings, 'WORKLOAD_PDF_RENDER_WORKERS', None) or min(4, os.cpu_count() or 1)
+                _render_executor = ProcessPoolExecutor(max_workers=workers)
+    return _render_executor
+
+
+async def abuild_dashboard_data(selected_division):
+    """Async `build_dashboard_data`: the workload, counts and grid queries run concurrently."""
+    faculties, faculty_count, subjects_count, lectures_count, grid = await asyncio.gather(
+        _alist(Faculty.objects.with_workload().order_by('-total_hours', 'name')),
+        Faculty.objects.acount(),
+        Subject.objects.acount(),
+        Lecture.objects.acount(),
+        abuild_division_grid(selected_division),
+    )
+    return dashboard_context(faculties, grid, (faculty_count, subjects_count, lectures_count))
+
+
+@login_required(login_url='/login/')
+async def dashboard_async(request):
+    selected_division = request.GET.get('division', 'A')
+
+    if selected_division in DIVISIONS:
+        data = await cache.aget_or_build(
+            'dashboard', cache.TABLES, lambda: abuild_dashboard_data(selected_division), selected_division,
         )
+    else:
+        data = await abuild_dashboard_data(selected_division)
+
+    context = {**data, 'selected_division': selected_division, 'live_updates': live_updates_enabled()}
+    # templates read request.user and the session lazily, which is sync only
+    return await sync_to_async(render)(request, 'dashboard.html', context)
+
+
+async def home_async(request):
+    user = await request.auser()
+    if user.is_authenticated:
+        return await dashboard_async(request)
+    return redirect(f"{settings.LOGIN_URL}?next=/")
+
+
+def _read_with_mtime(path):
+    return path.read_bytes(), path.stat().st_mtime
 
-        # Build same structure as dashboard (day columns, time rows, merged break rows)
-        days = [day for day, _ in DAY_CHOICES]
-        timeslots = list(TimeSlot.objects.order_by('sort_order'))
-        if not timeslots:
-            for slot_key, display_name, sort_order, duration in DEFAULT_TIME_SLOTS:
-                TimeSlot.objects.get_or_create(
-                    slot_key=slot_key,
-                    defaults={'display_name': display_name, 'sort_order': sort_order, 'duration_hours': duration}
-                )
-            timeslots = list(TimeSlot.objects.order_by('sort_order'))
-
-        timetable_rows = []
-        for slot in timeslots:
-            timetable_rows.append({
-                'type': 'lecture',
-                'key': slot.slot_key,
-                'label': slot.display_name,
-            })
-            if slot.slot_key == '10-11':
-                timetable_rows.append({
-                    'type': 'short_break',
-                    'label': 'SHORT BREAK',
-                })
-            if slot.slot_key == '12:15-1:15':
-                timetable_rows.append({
-                    'type': 'lunch_break',
-                    'label': 'LUNCH BREAK',
-                })
-
-        division_lectures = Lecture.objects.filter(division=selected_division).select_related('faculty', 'subject', 'time_slot')
-        lecture_map = {(lec.time_slot.slot_key, lec.day): lec for lec in division_lectures}
-
-        grid_data = [[Paragraph('DAY / TIME', header_cell_style)] + [Paragraph(day.upper(), header_cell_style) for day in days]]
-        break_row_indices = []
-
-        for row in timetable_rows:
-            if row['type'] == 'lecture':
-                table_row = [Paragraph(row['label'], time_cell_style)]
-                for day in days:
-                    lec = lecture_map.get((row['key'], day))
-                    if lec:
-                        subject_name = lec.subject.subject_name if lec.subject else '-'
-                        faculty_name = lec.faculty.name if lec.faculty else '-'
-                        cell_text = f"<b>{subject_name}</b><br/><font size='8' color='#6b7280'>{faculty_name}</font>"
-                    else:
-                        cell_text = "-"
-                    table_row.append(Paragraph(cell_text, lecture_cell_style))
-                grid_data.append(table_row)
-            else:
-                row_index = len(grid_data)
-                break_row_indices.append(row_index)
-                grid_data.append([
-                    Paragraph('11:00 am to 11:15 am' if row['type'] == 'short_break' else '1:15 pm to 2:00 pm', time_cell_style),
-                    Paragraph(row['label'], break_cell_style),
-                ] + [''] * (len(days) - 1))
-
-        # Set column widths to keep all text inside cells like dashboard
-        first_col_width = 1.45 * inch
-        day_col_width = ((landscape(letter)[0] - (0.4 * inch * 2)) - first_col_width) / len(days)
-        grid_col_widths = [first_col_width] + [day_col_width] * len(days)
-
-        grid_table = Table(grid_data, colWidths=grid_col_widths)
-
-        table_style = [
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#cfd6df')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 0.8, colors.HexColor('#1f2937')),
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]
-
-        for row_index in break_row_indices:
-            table_style.extend([
-                ('SPAN', (1, row_index), (-1, row_index)),
-                ('ALIGN', (1, row_index), (-1, row_index), 'CENTER'),
-            ])
-
-        grid_table.setStyle(TableStyle(table_style))
-        grid_table.repeatRows = 1
-        
-        story.append(grid_table)
-
-        # Build PDF
-        doc.build(story)
 
+@login_required(login_url='/login/')
+async def download_timetable_pdf_async(request):
+    from . import pdf
+
+    selected_division = request.GET.get('division', 'A')
+    if selected_division not in DIVISIONS:
+        raise Http404('Unknown division')
+
+    try:
+        grid = await abuild_division_grid(selected_division)
+        spec = pdf.grid_spec(grid, f"Weekly Timetable — Division {selected_division}")
+
+        scope = pdf_cache.division_scope(selected_division)
+        digest = pdf_cache.spec_digest(spec)
+        etag = f'"{digest}"'
+        # the cache is files on disk: every stat/read runs in a worker thread, off the event loop
+        last_modified = await sync_to_async(pdf_cache.last_modified, thread_sensitive=False)(scope, digest)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        path = await sync_to_async(pdf_cache.lookup, thread_sensitive=False)(scope, digest)
+        if path is None:
+            loop = asyncio.get_running_loop()
+            content = await loop.run_in_executor(render_executor(), pdf.render_bytes, spec)
+            path = await sync_to_async(pdf_cache.store, thread_sensitive=False)(scope, digest, content)
+        content, mtime = await sync_to_async(_read_with_mtime, thread_sensitive=False)(path)
+
+        response = HttpResponse(content, content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="timetable_{selected_division}_{datetime.now().strftime("%Y%m%d")}.pdf"'
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(mtime)
+        response['Cache-Control'] = 'private, no-cache'
         return response
 
     except Exception as e:
-        return HttpResponse(f"Error generating PDF: {str(e)}", status=500)
\ No newline at end of file
+        return HttpResponse(f"Error generating PDF: {str(e)}", status=500)